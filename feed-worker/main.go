@@ -1,6 +1,7 @@
 package main
 
 import (
+	"bytes"
 	"context"
 	"encoding/json"
 	"log"
@@ -54,37 +55,61 @@ func get_user_followers(userID string) ([]*pb.FollowStruct, error) {
 	return resp.GetFollowers(), nil
 }
 
-func handle_message(msg amqp.Delivery) {
-	var tweet Tweet
-
-	if err := json.Unmarshal(msg.Body, &tweet); err != nil {
-		log.Printf("error: %s", err)
-		msg.Nack(false, true)
+// decode_tweets accepts one tweet or, from bulk imports, a JSON array of them.
+func decode_tweets(body []byte) ([]Tweet, error) {
+	if trimmed := bytes.TrimSpace(body); len(trimmed) > 0 && trimmed[0] == '[' {
+		var tweets []Tweet
+		err := json.Unmarshal(trimmed, &tweets)
+		return tweets, err
 	}
 
-	userID := tweet.UserID
+	var tweet Tweet
+	err := json.Unmarshal(body, &tweet)
+	return []Tweet{tweet}, err
+}
 
-	followers, err := get_user_followers(userID)
+func handle_message(msg amqp.Delivery) {
+	tweets, err := decode_tweets(msg.Body)
 	if err != nil {
 		log.Printf("error: %s", err)
+		msg.Nack(false, true)
+		return
 	}
 
-	for _, follower := range followers {
-		// Push tweet to the follower's feed
-		feedKey := "feed:" + follower.FollowerId
-		if err := rdb.LPush(ctx, feedKey, tweet.TweetID).Err(); err != nil {
-			log.Printf("Failed to push tweet to Redis for user %s: %v", follower.FollowerId, err)
-			// Nack the message to requeue it for later processing
-			msg.Nack(false, true)
-			return
+	// Group by author so a batch costs one follower lookup per author and
+	// one LPUSH per follower per author.
+	var authors []string
+	tweetIDs := map[string][]interface{}{}
+	for _, tweet := range tweets {
+		if _, ok := tweetIDs[tweet.UserID]; !ok {
+			authors = append(authors, tweet.UserID)
 		}
+		tweetIDs[tweet.UserID] = append(tweetIDs[tweet.UserID], tweet.TweetID)
+	}
 
-		// Optional: Trim the feed to keep it at a reasonable size
-		if err := rdb.LTrim(ctx, feedKey, 0, 999).Err(); err != nil {
-			log.Printf("Failed to trim feed for user %s: %v", follower.FollowerId, err)
+	for _, userID := range authors {
+		followers, err := get_user_followers(userID)
+		if err != nil {
+			log.Printf("error: %s", err)
 		}
 
-		log.Printf("Tweet %s pushed to feed for user %s", tweet.TweetID, follower.FollowerId)
+		for _, follower := range followers {
+			// Push the tweets to the follower's feed
+			feedKey := "feed:" + follower.FollowerId
+			if err := rdb.LPush(ctx, feedKey, tweetIDs[userID]...).Err(); err != nil {
+				log.Printf("Failed to push tweets to Redis for user %s: %v", follower.FollowerId, err)
+				// Nack the message to requeue it for later processing
+				msg.Nack(false, true)
+				return
+			}
+
+			// Optional: Trim the feed to keep it at a reasonable size
+			if err := rdb.LTrim(ctx, feedKey, 0, 999).Err(); err != nil {
+				log.Printf("Failed to trim feed for user %s: %v", follower.FollowerId, err)
+			}
+
+			log.Printf("%d tweet(s) from %s pushed to feed for user %s", len(tweetIDs[userID]), userID, follower.FollowerId)
+		}
 	}
 
 	// Acknowledge the message after processing for all followers
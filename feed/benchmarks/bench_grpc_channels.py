@@ -0,0 +1,135 @@
+"""
+GetTweets latency: channel per call vs the shared ChannelManager.
+
+Starts a tweet gRPC server in a child process that answers GetTweets with
+--tweets canned tweets, then calls it from --callers threads. "per-call"
+opens and closes a channel around every RPC, like the old client module;
+"shared" goes through src.grpc.client.GetTweets on a long-lived channel.
+Pass --target to run against a real tweets service instead.
+
+Usage (from the feed/ directory):
+    python -m benchmarks.bench_grpc_channels --calls 2000 --callers 4
+"""
+
+import argparse
+import logging
+import multiprocessing
+import statistics
+import time
+from concurrent import futures
+from uuid import uuid4
+
+import grpc
+
+from src.grpc import client
+from src.grpc.channels import ChannelManager
+from src.grpc.ids import pack_ids
+from src.grpc.server.tweet_service_pb2 import GetTweetsReq, GetTweetsRes, TweetStruct
+from src.grpc.server.tweet_service_pb2_grpc import (
+    TweetServicer,
+    TweetStub,
+    add_TweetServicer_to_server,
+)
+
+
+def run_server(port: int, num_tweets: int, ready):
+    user_id = uuid4().bytes
+    tweets = [
+        TweetStruct(
+            id_bytes=uuid4().bytes,
+            user_id_bytes=user_id,
+            content="x" * 140,
+            created_at=int(time.time()),
+        )
+        for _ in range(num_tweets)
+    ]
+
+    class CannedTweetServicer(TweetServicer):
+        def GetTweets(self, request, context):
+            return GetTweetsRes(tweets=tweets)
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+    add_TweetServicer_to_server(CannedTweetServicer(), server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    ready.set()
+    server.wait_for_termination()
+
+
+def per_call(target: str, tweet_ids: list[str]):
+    # The client module before shared channels.
+    with grpc.insecure_channel(target) as channel:
+        stub = TweetStub(channel)
+        stub.GetTweets(GetTweetsReq(packed_tweet_ids=pack_ids(tweet_ids), packed=True))
+
+
+def shared(target: str, tweet_ids: list[str]):
+    client.GetTweets(tweet_ids)
+
+
+def measure(call, target: str, tweet_ids: list[str], calls: int, callers: int):
+    def timed(_):
+        start = time.perf_counter()
+        call(target, tweet_ids)
+        return time.perf_counter() - start
+
+    with futures.ThreadPoolExecutor(max_workers=callers) as pool:
+        list(pool.map(timed, range(callers)))  # warm up
+        start = time.perf_counter()
+        latencies = list(pool.map(timed, range(calls)))
+        elapsed = time.perf_counter() - start
+    return calls / elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--callers", type=int, default=1, help="concurrent threads")
+    parser.add_argument("--tweets", type=int, default=20, help="tweets per response")
+    parser.add_argument("--pool-size", type=int, default=1)
+    parser.add_argument("--port", type=int, default=50152)
+    parser.add_argument("--target", help="existing tweets service to call instead")
+    args = parser.parse_args()
+
+    server = None
+    target = args.target
+    if target is None:
+        target = f"127.0.0.1:{args.port}"
+        ctx = multiprocessing.get_context("spawn")
+        ready = ctx.Event()
+        server = ctx.Process(
+            target=run_server, args=(args.port, args.tweets, ready), daemon=True
+        )
+        server.start()
+        ready.wait()
+
+    logging.getLogger(client.__name__).setLevel(logging.WARNING)
+    client.TWEET_GRPC_TARGET = target
+    client.channels = ChannelManager(pool_size=args.pool_size)
+    tweet_ids = [str(uuid4()) for _ in range(args.tweets)]
+
+    print(
+        f"{args.calls} GetTweets calls for {args.tweets} ids, "
+        f"{args.callers} caller(s), pool size {args.pool_size}"
+    )
+    try:
+        for name, call in (("per-call", per_call), ("shared", shared)):
+            rps, latencies = measure(
+                call, target, tweet_ids, args.calls, args.callers
+            )
+            quantiles = statistics.quantiles(latencies, n=100)
+            print(
+                f"  {name:<8}  {rps:8.0f} calls/s  "
+                f"mean {statistics.mean(latencies) * 1000:6.2f} ms  "
+                f"p50 {quantiles[49] * 1000:6.2f} ms  "
+                f"p99 {quantiles[98] * 1000:6.2f} ms"
+            )
+    finally:
+        client.channels.close()
+        if server is not None:
+            server.terminate()
+            server.join()
+
+
+if __name__ == "__main__":
+    main()
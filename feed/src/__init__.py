@@ -3,6 +3,7 @@ from fastapi import FastAPI
 
 from src.dependencies.config import Config
 
+from src.grpc.channels import channels
 from src.routes import router as FeedRouter
 
 # OpenTelemetry Components
@@ -27,6 +28,9 @@ class App:
     def startup_event(self):
         print("Feed service initialized")
 
+    def shutdown_event(self):
+        channels.close()
+
     def create_api(self):
         resource = Resource(attributes={"service.name": "feed-service"})
 
@@ -39,7 +43,9 @@ class App:
 
         trace.set_tracer_provider(provider)
 
-        app = FastAPI(on_startup=[self.startup_event])
+        app = FastAPI(
+            on_startup=[self.startup_event], on_shutdown=[self.shutdown_event]
+        )
 
         FastAPIInstrumentor.instrument_app(app)
         RequestsInstrumentor().instrument()
@@ -0,0 +1,95 @@
+"""
+Shared, long-lived gRPC client channels.
+
+A channel is an HTTP/2 connection that multiplexes any number of concurrent
+RPCs, so the client modules reuse one per target instead of dialing (and
+tearing down) a connection for every call.
+"""
+
+import itertools
+import os
+import threading
+from typing import Callable
+
+import grpc
+from src.dependencies.config import config
+
+# Channels (and so connections) opened per target. One connection serves
+# ~100 concurrent streams; more spread load over server-side pollers.
+GRPC_CHANNEL_POOL_SIZE = int(config.get("GRPC_CHANNEL_POOL_SIZE", "1"))
+# Ping idle connections this often, and drop them if a ping goes unanswered
+# for GRPC_KEEPALIVE_TIMEOUT_MS, so a dead peer is noticed before a call.
+GRPC_KEEPALIVE_TIME_MS = int(config.get("GRPC_KEEPALIVE_TIME_MS", "30000"))
+GRPC_KEEPALIVE_TIMEOUT_MS = int(config.get("GRPC_KEEPALIVE_TIMEOUT_MS", "10000"))
+
+KEEPALIVE_OPTIONS = [
+    ("grpc.keepalive_time_ms", GRPC_KEEPALIVE_TIME_MS),
+    ("grpc.keepalive_timeout_ms", GRPC_KEEPALIVE_TIMEOUT_MS),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+
+class ChannelManager:
+    """
+    Lazily created channels, `pool_size` per target, handed out round-robin.
+
+    Channels are opened on first use, so a process that forks workers before
+    serving never shares a connection with them; a forked child that finds
+    the parent's channels drops them (without closing the parent's
+    connections) and opens its own. close() closes every channel; a later
+    get() opens new ones.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = GRPC_CHANNEL_POOL_SIZE,
+        options: list = KEEPALIVE_OPTIONS,
+        channel_factory: Callable[..., grpc.Channel] = grpc.insecure_channel,
+    ) -> None:
+        self.pool_size = max(1, pool_size)
+        self.options = list(options)
+        if self.pool_size > 1:
+            # Without this, channels to one target share a single connection.
+            self.options.append(("grpc.use_local_subchannel_pool", 1))
+        self.channel_factory = channel_factory
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._pools: dict[str, list[grpc.Channel]] = {}
+        self._next = itertools.count()
+
+    def get(self, target: str) -> grpc.Channel:
+        if self._pid != os.getpid():
+            self._lock = threading.Lock()
+            self._reset()
+
+        pool = self._pools.get(target)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(target)
+                if pool is None:
+                    pool = [
+                        self.channel_factory(target, options=self.options)
+                        for _ in range(self.pool_size)
+                    ]
+                    self._pools[target] = pool
+        if len(pool) == 1:
+            return pool[0]
+        return pool[next(self._next) % len(pool)]
+
+    def close(self):
+        with self._lock:
+            pools = self._pools
+            self._reset()
+        for pool in pools.values():
+            for channel in pool:
+                channel.close()
+
+    def stats(self) -> dict:
+        return {target: len(pool) for target, pool in self._pools.items()}
+
+
+channels = ChannelManager()
@@ -7,6 +7,8 @@ from .user_service_pb2 import (
     UserStruct,
     GetUserRes,
     GetUserReq,
+    GetUsersReq,
+    GetUsersRes,
     IncrementTweetsRes,
 )
 
@@ -14,18 +16,22 @@ from src.grpc.server.tweet_service_pb2_grpc import TweetStub
 from src.grpc.server.tweet_service_pb2 import GetTweetsReq, GetTweetsRes
 
 from src.dependencies.config import config
+from src.grpc.channels import channels
+from src.grpc.ids import decode_id, try_pack_ids
 
 logger = logging.getLogger(__name__)
 
 USER_GRPC_TARGET = config.get("USER_SERVICE_GRPC_TARGET", "user-service:50051")
 TWEET_GRPC_TARGET = config.get("TWEET_SERVICE_GRPC_TARGET", "tweet-service:50051")
+# Request 16-byte binary ids instead of UUID strings. Turn off while talking
+# to servers that predate the packed fields.
+GRPC_PACKED_IDS = config.get("GRPC_PACKED_IDS", "true").lower() == "true"
 
 
 def GetUser(user_id: str):
     try:
-        with grpc.insecure_channel(USER_GRPC_TARGET) as channel:
-            stub = UserStub(channel)
-            response: GetUserRes = stub.GetUser(GetUserReq(user_id=user_id))
+        stub = UserStub(channels.get(USER_GRPC_TARGET))
+        response: GetUserRes = stub.GetUser(GetUserReq(user_id=user_id))
 
         logger.info(f"GetUser response for {user_id}: {response.valid}")
         return response.user
@@ -34,6 +40,37 @@ def GetUser(user_id: str):
         return None
 
 
+def GetUsers(user_ids: list[str]) -> list:
+    """
+    Fetch several users in a single round trip.
+    Returns one UserStruct per id in request order, or None for unknown ids.
+    """
+    if not user_ids:
+        return []
+
+    try:
+        stub = UserStub(channels.get(USER_GRPC_TARGET))
+        packed_ids = try_pack_ids(user_ids) if GRPC_PACKED_IDS else None
+        if packed_ids is not None:
+            request = GetUsersReq(packed_user_ids=packed_ids, packed=True)
+        else:
+            request = GetUsersReq(user_ids=user_ids)
+        response: GetUsersRes = stub.GetUsers(request)
+
+        users = []
+        for res in response.users:
+            if not res.valid:
+                users.append(None)
+                continue
+            if res.user.id_bytes:
+                res.user.id = decode_id(res.user.id_bytes)
+            users.append(res.user)
+        return users
+    except grpc.RpcError as e:
+        logger.error(f"gRPC error in GetUsers: {e.code()}: {e.details()}")
+        return [None] * len(user_ids)
+
+
 def GetTweets(tweet_ids: list[str]) -> list:
     """
     Fetch tweets by IDs from tweet service via gRPC.
@@ -43,14 +80,18 @@ def GetTweets(tweet_ids: list[str]) -> list:
         return []
 
     try:
-        with grpc.insecure_channel(TWEET_GRPC_TARGET) as channel:
-            stub = TweetStub(channel)
-            response: GetTweetsRes = stub.GetTweets(GetTweetsReq(tweet_ids=tweet_ids))
+        stub = TweetStub(channels.get(TWEET_GRPC_TARGET))
+        packed_ids = try_pack_ids(tweet_ids) if GRPC_PACKED_IDS else None
+        if packed_ids is not None:
+            request = GetTweetsReq(packed_tweet_ids=packed_ids, packed=True)
+        else:
+            request = GetTweetsReq(tweet_ids=tweet_ids)
+        response: GetTweetsRes = stub.GetTweets(request)
 
         tweets = [
             {
-                "id": tweet.id,
-                "user_id": tweet.user_id,
+                "id": decode_id(tweet.id_bytes, tweet.id),
+                "user_id": decode_id(tweet.user_id_bytes, tweet.user_id),
                 "content": tweet.content,
                 "num_likes": tweet.num_likes,
                 "num_replys": tweet.num_replys,
@@ -24,33 +24,57 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12user_service.proto\x12\x0cuser_service\"Y\n\x0c\x46ollowStruct\x12\n\n\x02id\x18\x01 \x01(\t\x12\x13\n\x0b\x66ollower_id\x18\x02 \x01(\t\x12\x14\n\x0c\x66ollowing_id\x18\x03 \x01(\t\x12\x12\n\ncreated_at\x18\x04 \x01(\x03\"v\n\nUserStruct\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\x12\x10\n\x08username\x18\x03 \x01(\t\x12\x11\n\tnumTweets\x18\x04 \x01(\x05\x12\x14\n\x0cnumFollowers\x18\x05 \x01(\x05\x12\x12\n\ncreated_at\x18\x06 \x01(\x03\"\x1d\n\nGetUserReq\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"C\n\nGetUserRes\x12\r\n\x05valid\x18\x01 \x01(\x08\x12&\n\x04user\x18\x02 \x01(\x0b\x32\x18.user_service.UserStruct\"%\n\x12IncrementTweetsReq\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"%\n\x12IncrementTweetsRes\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\"\n\x0fGetFollowersReq\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"@\n\x0fGetFollowersRes\x12-\n\tfollowers\x18\x01 \x03(\x0b\x32\x1a.user_service.FollowStruct\"\"\n\x0fGetFollowingReq\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"?\n\x0fGetFollowingRes\x12,\n\x08\x66ollwing\x18\x01 \x03(\x0b\x32\x1a.user_service.FollowStruct2\xb9\x02\n\x04User\x12=\n\x07GetUser\x12\x18.user_service.GetUserReq\x1a\x18.user_service.GetUserRes\x12V\n\x10IncrementsTweets\x12 .user_service.IncrementTweetsReq\x1a .user_service.IncrementTweetsRes\x12L\n\x0cGetFollowers\x12\x1d.user_service.GetFollowersReq\x1a\x1d.user_service.GetFollowersRes\x12L\n\x0cGetFollowing\x12\x1d.user_service.GetFollowingReq\x1a\x1d.user_service.GetFollowingResb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12user_service.proto\x12\x0cuser_service\"Y\n\x0c\x46ollowStruct\x12\n\n\x02id\x18\x01 \x01(\t\x12\x13\n\x0b\x66ollower_id\x18\x02 \x01(\t\x12\x14\n\x0c\x66ollowing_id\x18\x03 \x01(\t\x12\x12\n\ncreated_at\x18\x04 \x01(\x03\"\x88\x01\n\nUserStruct\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\x12\x10\n\x08username\x18\x03 \x01(\t\x12\x11\n\tnumTweets\x18\x04 \x01(\x05\x12\x14\n\x0cnumFollowers\x18\x05 \x01(\x05\x12\x12\n\ncreated_at\x18\x06 \x01(\x03\x12\x10\n\x08id_bytes\x18\x07 \x01(\x0c\"-\n\nGetUserReq\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0e\n\x06packed\x18\x02 \x01(\x08\"C\n\nGetUserRes\x12\r\n\x05valid\x18\x01 \x01(\x08\x12&\n\x04user\x18\x02 \x01(\x0b\x32\x18.user_service.UserStruct\"H\n\x0bGetUsersReq\x12\x10\n\x08user_ids\x18\x01 \x03(\t\x12\x17\n\x0fpacked_user_ids\x18\x02 \x01(\x0c\x12\x0e\n\x06packed\x18\x03 \x01(\x08\"6\n\x0bGetUsersRes\x12\'\n\x05users\x18\x01 \x03(\x0b\x32\x18.user_service.GetUserRes\"%\n\x12IncrementTweetsReq\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"%\n\x12IncrementTweetsRes\x12\x0f\n\x07success\x18\x01 \x01(\x08\"%\n\x12\x44\x65\x63rementTweetsReq\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"%\n\x12\x44\x65\x63rementTweetsRes\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\xa3\x01\n\x15\x41pplyCounterDeltasReq\x12\x46\n\nnum_tweets\x18\x01 \x03(\x0b\x32\x32.user_service.ApplyCounterDeltasReq.NumTweetsEntry\x12\x10\n\x08\x62\x61tch_id\x18\x02 \x01(\t\x1a\x30\n\x0eNumTweetsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x12:\x02\x38\x01\"-\n\x15\x41pplyCounterDeltasRes\x12\x14\n\x0crejected_ids\x18\x01 \x03(\t\"2\n\x0fGetFollowersReq\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0e\n\x06packed\x18\x02 \x01(\x08\"]\n\x0fGetFollowersRes\x12-\n\tfollowers\x18\x01 \x03(\x0b\x32\x1a.user_service.FollowStruct\x12\x1b\n\x13packed_follower_ids\x18\x02 \x01(\x0c\"2\n\x0fGetFollowingReq\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0e\n\x06packed\x18\x02 \x01(\x08\"]\n\x0fGetFollowingRes\x12,\n\x08\x66ollwing\x18\x01 \x03(\x0b\x32\x1a.user_service.FollowStruct\x12\x1c\n\x14packed_following_ids\x18\x02 \x01(\x0c\"Y\n\x10StreamFollowsReq\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x12\n\nchunk_size\x18\x02 \x01(\x05\x12\x10\n\x08\x61\x66ter_id\x18\x03 \x01(\t\x12\x0e\n\x06packed\x18\x04 \x01(\x08\"6\n\x0e\x46ollowIdsChunk\x12\x10\n\x08user_ids\x18\x01 \x03(\t\x12\x12\n\npacked_ids\x18\x02 \x01(\x0c\"S\n\x0f\x43heckFollowsReq\x12\x11\n\tviewer_id\x18\x01 \x01(\t\x12\x12\n\ntarget_ids\x18\x02 \x03(\t\x12\x19\n\x11packed_target_ids\x18\x03 \x01(\x0c\"0\n\x0f\x43heckFollowsRes\x12\x0e\n\x06\x62itmap\x18\x01 \x01(\x0c\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\x32\xa6\x06\n\x04User\x12=\n\x07GetUser\x12\x18.user_service.GetUserReq\x1a\x18.user_service.GetUserRes\x12@\n\x08GetUsers\x12\x19.user_service.GetUsersReq\x1a\x19.user_service.GetUsersRes\x12V\n\x10IncrementsTweets\x12 .user_service.IncrementTweetsReq\x1a .user_service.IncrementTweetsRes\x12U\n\x0f\x44\x65\x63rementTweets\x12 .user_service.DecrementTweetsReq\x1a .user_service.DecrementTweetsRes\x12^\n\x12\x41pplyCounterDeltas\x12#.user_service.ApplyCounterDeltasReq\x1a#.user_service.ApplyCounterDeltasRes\x12L\n\x0cGetFollowers\x12\x1d.user_service.GetFollowersReq\x1a\x1d.user_service.GetFollowersRes\x12L\n\x0cGetFollowing\x12\x1d.user_service.GetFollowingReq\x1a\x1d.user_service.GetFollowingRes\x12L\n\x0c\x43heckFollows\x12\x1d.user_service.CheckFollowsReq\x1a\x1d.user_service.CheckFollowsRes\x12Q\n\x0fStreamFollowers\x12\x1e.user_service.StreamFollowsReq\x1a\x1c.user_service.FollowIdsChunk0\x01\x12Q\n\x0fStreamFollowing\x12\x1e.user_service.StreamFollowsReq\x1a\x1c.user_service.FollowIdsChunk0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'user_service_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_APPLYCOUNTERDELTASREQ_NUMTWEETSENTRY']._loaded_options = None
+  _globals['_APPLYCOUNTERDELTASREQ_NUMTWEETSENTRY']._serialized_options = b'8\001'
   _globals['_FOLLOWSTRUCT']._serialized_start=36
   _globals['_FOLLOWSTRUCT']._serialized_end=125
-  _globals['_USERSTRUCT']._serialized_start=127
-  _globals['_USERSTRUCT']._serialized_end=245
-  _globals['_GETUSERREQ']._serialized_start=247
-  _globals['_GETUSERREQ']._serialized_end=276
-  _globals['_GETUSERRES']._serialized_start=278
-  _globals['_GETUSERRES']._serialized_end=345
-  _globals['_INCREMENTTWEETSREQ']._serialized_start=347
-  _globals['_INCREMENTTWEETSREQ']._serialized_end=384
-  _globals['_INCREMENTTWEETSRES']._serialized_start=386
-  _globals['_INCREMENTTWEETSRES']._serialized_end=423
-  _globals['_GETFOLLOWERSREQ']._serialized_start=425
-  _globals['_GETFOLLOWERSREQ']._serialized_end=459
-  _globals['_GETFOLLOWERSRES']._serialized_start=461
-  _globals['_GETFOLLOWERSRES']._serialized_end=525
-  _globals['_GETFOLLOWINGREQ']._serialized_start=527
-  _globals['_GETFOLLOWINGREQ']._serialized_end=561
-  _globals['_GETFOLLOWINGRES']._serialized_start=563
-  _globals['_GETFOLLOWINGRES']._serialized_end=626
-  _globals['_USER']._serialized_start=629
-  _globals['_USER']._serialized_end=942
+  _globals['_USERSTRUCT']._serialized_start=128
+  _globals['_USERSTRUCT']._serialized_end=264
+  _globals['_GETUSERREQ']._serialized_start=266
+  _globals['_GETUSERREQ']._serialized_end=311
+  _globals['_GETUSERRES']._serialized_start=313
+  _globals['_GETUSERRES']._serialized_end=380
+  _globals['_GETUSERSREQ']._serialized_start=382
+  _globals['_GETUSERSREQ']._serialized_end=454
+  _globals['_GETUSERSRES']._serialized_start=456
+  _globals['_GETUSERSRES']._serialized_end=510
+  _globals['_INCREMENTTWEETSREQ']._serialized_start=512
+  _globals['_INCREMENTTWEETSREQ']._serialized_end=549
+  _globals['_INCREMENTTWEETSRES']._serialized_start=551
+  _globals['_INCREMENTTWEETSRES']._serialized_end=588
+  _globals['_DECREMENTTWEETSREQ']._serialized_start=590
+  _globals['_DECREMENTTWEETSREQ']._serialized_end=627
+  _globals['_DECREMENTTWEETSRES']._serialized_start=629
+  _globals['_DECREMENTTWEETSRES']._serialized_end=666
+  _globals['_APPLYCOUNTERDELTASREQ']._serialized_start=669
+  _globals['_APPLYCOUNTERDELTASREQ']._serialized_end=832
+  _globals['_APPLYCOUNTERDELTASREQ_NUMTWEETSENTRY']._serialized_start=784
+  _globals['_APPLYCOUNTERDELTASREQ_NUMTWEETSENTRY']._serialized_end=832
+  _globals['_APPLYCOUNTERDELTASRES']._serialized_start=834
+  _globals['_APPLYCOUNTERDELTASRES']._serialized_end=879
+  _globals['_GETFOLLOWERSREQ']._serialized_start=881
+  _globals['_GETFOLLOWERSREQ']._serialized_end=931
+  _globals['_GETFOLLOWERSRES']._serialized_start=933
+  _globals['_GETFOLLOWERSRES']._serialized_end=1026
+  _globals['_GETFOLLOWINGREQ']._serialized_start=1028
+  _globals['_GETFOLLOWINGREQ']._serialized_end=1078
+  _globals['_GETFOLLOWINGRES']._serialized_start=1080
+  _globals['_GETFOLLOWINGRES']._serialized_end=1173
+  _globals['_STREAMFOLLOWSREQ']._serialized_start=1175
+  _globals['_STREAMFOLLOWSREQ']._serialized_end=1264
+  _globals['_FOLLOWIDSCHUNK']._serialized_start=1266
+  _globals['_FOLLOWIDSCHUNK']._serialized_end=1320
+  _globals['_CHECKFOLLOWSREQ']._serialized_start=1322
+  _globals['_CHECKFOLLOWSREQ']._serialized_end=1405
+  _globals['_CHECKFOLLOWSRES']._serialized_start=1407
+  _globals['_CHECKFOLLOWSRES']._serialized_end=1455
+  _globals['_USER']._serialized_start=1458
+  _globals['_USER']._serialized_end=2264
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,51 @@
+"""
+Compact id encoding for the gRPC protocols.
+
+Ids travel as 36-character UUID strings by default. Callers that set
+`packed = true` on a request exchange 16-byte big-endian UUIDs instead,
+either one per `*_bytes` field or concatenated into a single `packed_*`
+field for id lists.
+"""
+
+from typing import Iterable
+from uuid import UUID
+
+ID_SIZE = 16
+
+
+def id_to_bytes(value) -> bytes:
+    if isinstance(value, UUID):
+        return value.bytes
+    return UUID(str(value)).bytes
+
+
+def id_from_bytes(data: bytes) -> UUID:
+    return UUID(bytes=data)
+
+
+def pack_ids(ids: Iterable) -> bytes:
+    """Concatenate ids (UUIDs or UUID strings) into one bytes value."""
+    return b"".join(id_to_bytes(value) for value in ids)
+
+
+def try_pack_ids(ids: Iterable) -> bytes | None:
+    """Like pack_ids, but returns None if any id is not a valid UUID."""
+    try:
+        return pack_ids(ids)
+    except ValueError:
+        return None
+
+
+def unpack_ids(data: bytes) -> list[UUID]:
+    """Split a packed bytes value back into UUIDs."""
+    if len(data) % ID_SIZE:
+        raise ValueError(f"packed ids must be a multiple of {ID_SIZE} bytes")
+    return [
+        UUID(bytes=data[offset : offset + ID_SIZE])
+        for offset in range(0, len(data), ID_SIZE)
+    ]
+
+
+def decode_id(data: bytes, fallback: str = "") -> str:
+    """Return the string form of a bytes id, or `fallback` when it is unset."""
+    return str(UUID(bytes=data)) if data else fallback
@@ -0,0 +1,120 @@
+from concurrent import futures
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import grpc
+import pytest
+from src.grpc.channels import ChannelManager
+from src.grpc.server.tweet_service_pb2 import GetTweetsRes, TweetStruct
+from src.grpc.server.tweet_service_pb2_grpc import (
+    TweetServicer,
+    add_TweetServicer_to_server,
+)
+
+
+def fake_factory():
+    return MagicMock(side_effect=lambda target, options: MagicMock(name=target))
+
+
+class TestChannelManager:
+    """Tests for the shared client channel pool."""
+
+    def test_channel_reused_per_target(self):
+        """Test that channels are opened once per target and then reused."""
+        factory = fake_factory()
+        manager = ChannelManager(pool_size=1, channel_factory=factory)
+
+        first = manager.get("users:50051")
+        assert manager.get("users:50051") is first
+        assert manager.get("tweets:50051") is not first
+        assert factory.call_count == 2
+
+    def test_keepalive_options(self):
+        """Test that channels are created with keepalive enabled."""
+        factory = fake_factory()
+        ChannelManager(pool_size=1, channel_factory=factory).get("users:50051")
+
+        options = dict(factory.call_args.kwargs["options"])
+        assert options["grpc.keepalive_time_ms"] > 0
+        assert options["grpc.keepalive_permit_without_calls"] == 1
+
+    def test_pool_round_robin(self):
+        """Test that a pool hands out each of its channels in turn."""
+        factory = fake_factory()
+        manager = ChannelManager(pool_size=3, channel_factory=factory)
+
+        picked = [manager.get("users:50051") for _ in range(6)]
+
+        assert len({id(channel) for channel in picked}) == 3
+        assert picked[:3] == picked[3:]
+        options = dict(factory.call_args.kwargs["options"])
+        assert options["grpc.use_local_subchannel_pool"] == 1
+
+    def test_close_closes_and_reopens(self):
+        """Test that close() closes every channel and get() opens new ones."""
+        manager = ChannelManager(pool_size=2, channel_factory=fake_factory())
+        opened = [manager.get("users:50051") for _ in range(2)]
+
+        manager.close()
+
+        for channel in opened:
+            channel.close.assert_called_once()
+        assert manager.stats() == {}
+        assert manager.get("users:50051") not in opened
+
+    def test_forked_child_opens_own_channels(self):
+        """Test that a child process drops, but does not close, inherited channels."""
+        manager = ChannelManager(pool_size=1, channel_factory=fake_factory())
+        inherited = manager.get("users:50051")
+
+        manager._pid = -1  # as seen from a forked child
+
+        assert manager.get("users:50051") is not inherited
+        inherited.close.assert_not_called()
+
+
+class PeerRecordingServicer(TweetServicer):
+    def __init__(self) -> None:
+        self.peers = []
+
+    def GetTweets(self, request, context):
+        self.peers.append(context.peer())
+        return GetTweetsRes(
+            tweets=[
+                TweetStruct(id_bytes=request.packed_tweet_ids[:16], content="hi")
+            ]
+        )
+
+
+@pytest.fixture
+def tweet_server():
+    servicer = PeerRecordingServicer()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    add_TweetServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    yield f"127.0.0.1:{port}", servicer
+    server.stop(None)
+
+
+class TestClientChannelReuse:
+    """Tests that the client functions share a connection across calls."""
+
+    def test_get_tweets_reuses_connection(self, tweet_server):
+        """Test that consecutive GetTweets calls arrive on one connection."""
+        from src.grpc import client
+
+        target, servicer = tweet_server
+        manager = ChannelManager(pool_size=1)
+        tweet_id = str(uuid4())
+
+        with patch.object(client, "channels", manager), patch.object(
+            client, "TWEET_GRPC_TARGET", target
+        ):
+            first = client.GetTweets([tweet_id])
+            second = client.GetTweets([tweet_id])
+        manager.close()
+
+        assert first[0]["id"] == second[0]["id"] == tweet_id
+        assert len(servicer.peers) == 2
+        assert servicer.peers[0] == servicer.peers[1]
@@ -0,0 +1,29 @@
+#!/usr/bin/env bash
+# Regenerate the Python gRPC stubs checked into each service from proto/*.proto.
+#
+# Requires grpcio-tools==1.71.0 (matching the grpcio pin in every service),
+# mypy-protobuf for the .pyi stubs, and black.
+set -euo pipefail
+
+ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+PYTHON="${PYTHON:-python}"
+OUT="$(mktemp -d)"
+trap 'rm -rf "$OUT"' EXIT
+
+cd "$ROOT/proto"
+"$PYTHON" -m grpc_tools.protoc -I. \
+    --python_out="$OUT" --grpc_python_out="$OUT" --mypy_out="$OUT" \
+    user_service.proto tweet_service.proto
+"$PYTHON" -m black -q "$OUT"/*_grpc.py
+
+# copy <proto> <dest dir> <import line for the generated _grpc module>
+copy() {
+    cp "$OUT/$1_pb2.py" "$OUT/$1_pb2.pyi" "$2/"
+    sed "s|^import $1_pb2 as|$3 as|" "$OUT/$1_pb2_grpc.py" > "$2/$1_pb2_grpc.py"
+}
+
+copy user_service "$ROOT/users/src/grpc" "import src.grpc.user_service_pb2"
+for service in tweets feed search; do
+    copy user_service "$ROOT/$service/src/grpc/client" "from . import user_service_pb2"
+    copy tweet_service "$ROOT/$service/src/grpc/server" "from . import tweet_service_pb2"
+done
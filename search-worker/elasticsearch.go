@@ -3,6 +3,8 @@ package main
 import (
 	"bytes"
 	"encoding/json"
+	"errors"
+	"fmt"
 	"log"
 
 	"github.com/elastic/go-elasticsearch/v9"
@@ -42,6 +44,42 @@ func (c *ESClient) Create(t Tweet) error {
 	return nil
 }
 
+// CreateMany indexes tweets with a single _bulk request. Documents are keyed
+// by tweet id, so a redelivered batch overwrites instead of duplicating.
+func (c *ESClient) CreateMany(tweets []Tweet) error {
+	var body bytes.Buffer
+	enc := json.NewEncoder(&body)
+	for _, t := range tweets {
+		action := map[string]map[string]string{"index": {"_index": "tweets", "_id": t.ID}}
+		if err := enc.Encode(action); err != nil {
+			return err
+		}
+		if err := enc.Encode(t); err != nil {
+			return err
+		}
+	}
+
+	res, err := c.es.Bulk(&body, c.es.Bulk.WithIndex("tweets"))
+	if err != nil {
+		return err
+	}
+	defer res.Body.Close()
+	if res.IsError() {
+		return fmt.Errorf("bulk index failed: %s", res.String())
+	}
+
+	var result struct {
+		Errors bool `json:"errors"`
+	}
+	if err := json.NewDecoder(res.Body).Decode(&result); err != nil {
+		return err
+	}
+	if result.Errors {
+		return errors.New("bulk index rejected some tweets")
+	}
+	return nil
+}
+
 func (c *ESClient) Update(t Tweet) error {
 	var err error
 
@@ -30,7 +30,17 @@ func handle_delete(tweet Tweet) error {
 	return es_client.Delete(tweet.ID)
 }
 
+func handle_create_batch(tweets []Tweet) error {
+	return es_client.CreateMany(tweets)
+}
+
 func handle_message(msg amqp.Delivery, ch *amqp.Channel) {
+	// Bulk imports publish a JSON array of tweets per message.
+	if msg.RoutingKey == "tweet.create.batch" {
+		handle_batch_message(msg, ch)
+		return
+	}
+
 	var tweet Tweet
 	if err := json.Unmarshal(msg.Body, &tweet); err != nil {
 		log.Printf("error: %s", err)
@@ -58,6 +68,22 @@ func handle_message(msg amqp.Delivery, ch *amqp.Channel) {
 	}
 }
 
+func handle_batch_message(msg amqp.Delivery, ch *amqp.Channel) {
+	var tweets []Tweet
+	if err := json.Unmarshal(msg.Body, &tweets); err != nil {
+		log.Printf("error: %s", err)
+		ch.Nack(msg.DeliveryTag, false, false)
+		return
+	}
+
+	if err := handle_create_batch(tweets); err != nil {
+		log.Printf("Error handling batch of %d tweets: %s", len(tweets), err)
+		ch.Nack(msg.DeliveryTag, false, true)
+	} else {
+		ch.Ack(msg.DeliveryTag, false)
+	}
+}
+
 func run_worker() {
 	var err error
 	es_client, err = NewClient()
@@ -3,6 +3,7 @@ from fastapi import FastAPI
 
 from src.dependencies.config import Config
 
+from src.grpc.channels import channels
 from src.routes import router as SearchRouter
 
 # OpenTelemetry Components
@@ -26,6 +27,9 @@ class App:
     def startup_event(self):
         print("Search service initialized")
 
+    def shutdown_event(self):
+        channels.close()
+
     def create_api(self):
         resource = Resource(attributes={"service.name": "search-service"})
 
@@ -38,7 +42,9 @@ class App:
 
         trace.set_tracer_provider(provider)
 
-        app = FastAPI(on_startup=[self.startup_event])
+        app = FastAPI(
+            on_startup=[self.startup_event], on_shutdown=[self.shutdown_event]
+        )
 
         FastAPIInstrumentor.instrument_app(app)
         RequestsInstrumentor().instrument()
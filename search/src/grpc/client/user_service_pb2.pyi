@@ -14,6 +14,11 @@ DESCRIPTOR: google.protobuf.descriptor.FileDescriptor
 
 @typing.final
 class FollowStruct(google.protobuf.message.Message):
+    """Ids are 36-character UUID strings by default. Requests that set
+    `packed = true` get 16-byte big-endian UUIDs in the *_bytes / packed_*
+    fields instead, and the matching string fields are left empty.
+    """
+
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
     ID_FIELD_NUMBER: builtins.int
@@ -46,12 +51,14 @@ class UserStruct(google.protobuf.message.Message):
     NUMTWEETS_FIELD_NUMBER: builtins.int
     NUMFOLLOWERS_FIELD_NUMBER: builtins.int
     CREATED_AT_FIELD_NUMBER: builtins.int
+    ID_BYTES_FIELD_NUMBER: builtins.int
     id: builtins.str
     email: builtins.str
     username: builtins.str
     numTweets: builtins.int
     numFollowers: builtins.int
     created_at: builtins.int
+    id_bytes: builtins.bytes
     def __init__(
         self,
         *,
@@ -61,8 +68,9 @@ class UserStruct(google.protobuf.message.Message):
         numTweets: builtins.int = ...,
         numFollowers: builtins.int = ...,
         created_at: builtins.int = ...,
+        id_bytes: builtins.bytes = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing.Literal["created_at", b"created_at", "email", b"email", "id", b"id", "numFollowers", b"numFollowers", "numTweets", b"numTweets", "username", b"username"]) -> None: ...
+    def ClearField(self, field_name: typing.Literal["created_at", b"created_at", "email", b"email", "id", b"id", "id_bytes", b"id_bytes", "numFollowers", b"numFollowers", "numTweets", b"numTweets", "username", b"username"]) -> None: ...
 
 global___UserStruct = UserStruct
 
@@ -71,13 +79,16 @@ class GetUserReq(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
     USER_ID_FIELD_NUMBER: builtins.int
+    PACKED_FIELD_NUMBER: builtins.int
     user_id: builtins.str
+    packed: builtins.bool
     def __init__(
         self,
         *,
         user_id: builtins.str = ...,
+        packed: builtins.bool = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing.Literal["user_id", b"user_id"]) -> None: ...
+    def ClearField(self, field_name: typing.Literal["packed", b"packed", "user_id", b"user_id"]) -> None: ...
 
 global___GetUserReq = GetUserReq
 
@@ -101,6 +112,47 @@ class GetUserRes(google.protobuf.message.Message):
 
 global___GetUserRes = GetUserRes
 
+@typing.final
+class GetUsersReq(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    USER_IDS_FIELD_NUMBER: builtins.int
+    PACKED_USER_IDS_FIELD_NUMBER: builtins.int
+    PACKED_FIELD_NUMBER: builtins.int
+    packed_user_ids: builtins.bytes
+    """Concatenated 16-byte ids, used instead of user_ids when set."""
+    packed: builtins.bool
+    @property
+    def user_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]: ...
+    def __init__(
+        self,
+        *,
+        user_ids: collections.abc.Iterable[builtins.str] | None = ...,
+        packed_user_ids: builtins.bytes = ...,
+        packed: builtins.bool = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["packed", b"packed", "packed_user_ids", b"packed_user_ids", "user_ids", b"user_ids"]) -> None: ...
+
+global___GetUsersReq = GetUsersReq
+
+@typing.final
+class GetUsersRes(google.protobuf.message.Message):
+    """One entry per requested id, in request order. Unknown ids have valid=false."""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    USERS_FIELD_NUMBER: builtins.int
+    @property
+    def users(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___GetUserRes]: ...
+    def __init__(
+        self,
+        *,
+        users: collections.abc.Iterable[global___GetUserRes] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["users", b"users"]) -> None: ...
+
+global___GetUsersRes = GetUsersRes
+
 @typing.final
 class IncrementTweetsReq(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
@@ -132,7 +184,7 @@ class IncrementTweetsRes(google.protobuf.message.Message):
 global___IncrementTweetsRes = IncrementTweetsRes
 
 @typing.final
-class GetFollowersReq(google.protobuf.message.Message):
+class DecrementTweetsReq(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
     USER_ID_FIELD_NUMBER: builtins.int
@@ -144,21 +196,117 @@ class GetFollowersReq(google.protobuf.message.Message):
     ) -> None: ...
     def ClearField(self, field_name: typing.Literal["user_id", b"user_id"]) -> None: ...
 
+global___DecrementTweetsReq = DecrementTweetsReq
+
+@typing.final
+class DecrementTweetsRes(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    SUCCESS_FIELD_NUMBER: builtins.int
+    success: builtins.bool
+    def __init__(
+        self,
+        *,
+        success: builtins.bool = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["success", b"success"]) -> None: ...
+
+global___DecrementTweetsRes = DecrementTweetsRes
+
+@typing.final
+class ApplyCounterDeltasReq(google.protobuf.message.Message):
+    """Net num_tweets changes keyed by user id, coalesced by the caller.
+    Retries reuse batch_id so a replica that already applied it skips it.
+    """
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    @typing.final
+    class NumTweetsEntry(google.protobuf.message.Message):
+        DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+        KEY_FIELD_NUMBER: builtins.int
+        VALUE_FIELD_NUMBER: builtins.int
+        key: builtins.str
+        value: builtins.int
+        def __init__(
+            self,
+            *,
+            key: builtins.str = ...,
+            value: builtins.int = ...,
+        ) -> None: ...
+        def ClearField(self, field_name: typing.Literal["key", b"key", "value", b"value"]) -> None: ...
+
+    NUM_TWEETS_FIELD_NUMBER: builtins.int
+    BATCH_ID_FIELD_NUMBER: builtins.int
+    batch_id: builtins.str
+    @property
+    def num_tweets(self) -> google.protobuf.internal.containers.ScalarMap[builtins.str, builtins.int]: ...
+    def __init__(
+        self,
+        *,
+        num_tweets: collections.abc.Mapping[builtins.str, builtins.int] | None = ...,
+        batch_id: builtins.str = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["batch_id", b"batch_id", "num_tweets", b"num_tweets"]) -> None: ...
+
+global___ApplyCounterDeltasReq = ApplyCounterDeltasReq
+
+@typing.final
+class ApplyCounterDeltasRes(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    REJECTED_IDS_FIELD_NUMBER: builtins.int
+    @property
+    def rejected_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]:
+        """Keys that are not valid user ids; everything else was applied."""
+
+    def __init__(
+        self,
+        *,
+        rejected_ids: collections.abc.Iterable[builtins.str] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["rejected_ids", b"rejected_ids"]) -> None: ...
+
+global___ApplyCounterDeltasRes = ApplyCounterDeltasRes
+
+@typing.final
+class GetFollowersReq(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    USER_ID_FIELD_NUMBER: builtins.int
+    PACKED_FIELD_NUMBER: builtins.int
+    user_id: builtins.str
+    packed: builtins.bool
+    def __init__(
+        self,
+        *,
+        user_id: builtins.str = ...,
+        packed: builtins.bool = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["packed", b"packed", "user_id", b"user_id"]) -> None: ...
+
 global___GetFollowersReq = GetFollowersReq
 
 @typing.final
 class GetFollowersRes(google.protobuf.message.Message):
+    """Served from the follower cache: only follower_id and following_id are set."""
+
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
     FOLLOWERS_FIELD_NUMBER: builtins.int
+    PACKED_FOLLOWER_IDS_FIELD_NUMBER: builtins.int
+    packed_follower_ids: builtins.bytes
+    """Concatenated 16-byte follower ids, set instead of followers when packed."""
     @property
     def followers(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___FollowStruct]: ...
     def __init__(
         self,
         *,
         followers: collections.abc.Iterable[global___FollowStruct] | None = ...,
+        packed_follower_ids: builtins.bytes = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing.Literal["followers", b"followers"]) -> None: ...
+    def ClearField(self, field_name: typing.Literal["followers", b"followers", "packed_follower_ids", b"packed_follower_ids"]) -> None: ...
 
 global___GetFollowersRes = GetFollowersRes
 
@@ -167,28 +315,128 @@ class GetFollowingReq(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
     USER_ID_FIELD_NUMBER: builtins.int
+    PACKED_FIELD_NUMBER: builtins.int
     user_id: builtins.str
+    packed: builtins.bool
     def __init__(
         self,
         *,
         user_id: builtins.str = ...,
+        packed: builtins.bool = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing.Literal["user_id", b"user_id"]) -> None: ...
+    def ClearField(self, field_name: typing.Literal["packed", b"packed", "user_id", b"user_id"]) -> None: ...
 
 global___GetFollowingReq = GetFollowingReq
 
 @typing.final
 class GetFollowingRes(google.protobuf.message.Message):
+    """Served from the follower cache: only follower_id and following_id are set."""
+
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
     FOLLWING_FIELD_NUMBER: builtins.int
+    PACKED_FOLLOWING_IDS_FIELD_NUMBER: builtins.int
+    packed_following_ids: builtins.bytes
+    """Concatenated 16-byte followee ids, set instead of follwing when packed."""
     @property
     def follwing(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___FollowStruct]: ...
     def __init__(
         self,
         *,
         follwing: collections.abc.Iterable[global___FollowStruct] | None = ...,
+        packed_following_ids: builtins.bytes = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing.Literal["follwing", b"follwing"]) -> None: ...
+    def ClearField(self, field_name: typing.Literal["follwing", b"follwing", "packed_following_ids", b"packed_following_ids"]) -> None: ...
 
 global___GetFollowingRes = GetFollowingRes
+
+@typing.final
+class StreamFollowsReq(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    USER_ID_FIELD_NUMBER: builtins.int
+    CHUNK_SIZE_FIELD_NUMBER: builtins.int
+    AFTER_ID_FIELD_NUMBER: builtins.int
+    PACKED_FIELD_NUMBER: builtins.int
+    user_id: builtins.str
+    chunk_size: builtins.int
+    """Ids per chunk; 0 uses the server default."""
+    after_id: builtins.str
+    """Resume after this id (exclusive), e.g. the last id already received."""
+    packed: builtins.bool
+    def __init__(
+        self,
+        *,
+        user_id: builtins.str = ...,
+        chunk_size: builtins.int = ...,
+        after_id: builtins.str = ...,
+        packed: builtins.bool = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["after_id", b"after_id", "chunk_size", b"chunk_size", "packed", b"packed", "user_id", b"user_id"]) -> None: ...
+
+global___StreamFollowsReq = StreamFollowsReq
+
+@typing.final
+class FollowIdsChunk(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    USER_IDS_FIELD_NUMBER: builtins.int
+    PACKED_IDS_FIELD_NUMBER: builtins.int
+    packed_ids: builtins.bytes
+    """Concatenated 16-byte ids, set instead of user_ids when packed."""
+    @property
+    def user_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]: ...
+    def __init__(
+        self,
+        *,
+        user_ids: collections.abc.Iterable[builtins.str] | None = ...,
+        packed_ids: builtins.bytes = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["packed_ids", b"packed_ids", "user_ids", b"user_ids"]) -> None: ...
+
+global___FollowIdsChunk = FollowIdsChunk
+
+@typing.final
+class CheckFollowsReq(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    VIEWER_ID_FIELD_NUMBER: builtins.int
+    TARGET_IDS_FIELD_NUMBER: builtins.int
+    PACKED_TARGET_IDS_FIELD_NUMBER: builtins.int
+    viewer_id: builtins.str
+    packed_target_ids: builtins.bytes
+    """Concatenated 16-byte ids, used instead of target_ids when set."""
+    @property
+    def target_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]: ...
+    def __init__(
+        self,
+        *,
+        viewer_id: builtins.str = ...,
+        target_ids: collections.abc.Iterable[builtins.str] | None = ...,
+        packed_target_ids: builtins.bytes = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["packed_target_ids", b"packed_target_ids", "target_ids", b"target_ids", "viewer_id", b"viewer_id"]) -> None: ...
+
+global___CheckFollowsReq = CheckFollowsReq
+
+@typing.final
+class CheckFollowsRes(google.protobuf.message.Message):
+    """Bit i (LSB-first, bit i % 8 of byte i / 8) is set when the viewer follows
+    target i. Malformed target ids are reported as not followed.
+    """
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    BITMAP_FIELD_NUMBER: builtins.int
+    COUNT_FIELD_NUMBER: builtins.int
+    bitmap: builtins.bytes
+    count: builtins.int
+    def __init__(
+        self,
+        *,
+        bitmap: builtins.bytes = ...,
+        count: builtins.int = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["bitmap", b"bitmap", "count", b"count"]) -> None: ...
+
+global___CheckFollowsRes = CheckFollowsRes
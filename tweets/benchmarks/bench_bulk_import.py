@@ -0,0 +1,98 @@
+"""
+Bulk tweet ingestion: POST /tweet's write path once per tweet vs TweetImporter.
+
+Builds a temporary SQLite database and loads --tweets tweets from --authors
+authors both ways: the per-tweet path (one ORM insert, two outbox events and
+one commit per tweet, as createTweet does) and TweetImporter's chunked
+multi-row INSERT with batched outbox events. num_tweets deltas are only
+buffered, not sent. Reports tweets per second; Postgres with a local disk
+lands in the same order of magnitude for the importer, far lower for
+per-tweet commits.
+
+Usage (from the tweets/ directory):
+    python -m benchmarks.bench_bulk_import --tweets 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from uuid import UUID, uuid4
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.dependencies.db import Base
+from src.models import Tweet
+from src.outbox import enqueue_event
+from src.tweet_import import TWEET_IMPORT_CHUNK_SIZE, TweetImporter
+
+
+def raw_tweets(count: int, authors: list) -> list:
+    return [
+        {"user_id": str(authors[i % len(authors)]), "content": "x" * 140}
+        for i in range(count)
+    ]
+
+
+def per_tweet(session_factory, tweets):
+    with session_factory() as db:
+        for raw in tweets:
+            tweet = Tweet(UUID(raw["user_id"]), raw["content"])
+            db.add(tweet)
+            db.flush()
+            tweet_dict = tweet.to_dict()
+            enqueue_event(db, tweet_dict, "general_tweets")
+            enqueue_event(db, tweet_dict, "tweet_events", "tweet.create")
+            db.commit()
+
+
+def bulk(session_factory, tweets, chunk_size):
+    with session_factory() as db:
+        TweetImporter(db, chunk_size=chunk_size).import_tweets(tweets)
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tweets", type=int, default=100000)
+    parser.add_argument("--authors", type=int, default=1000)
+    parser.add_argument("--per-tweet", type=int, default=5000, help="tweets for the slow path")
+    parser.add_argument("--chunk-size", type=int, default=TWEET_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    authors = [uuid4() for _ in range(args.authors)]
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(engine, expire_on_commit=False)
+    try:
+        results = {
+            "per tweet": (
+                args.per_tweet,
+                timed(per_tweet, session_factory, raw_tweets(args.per_tweet, authors)),
+            ),
+            "bulk": (
+                args.tweets,
+                timed(bulk, session_factory, raw_tweets(args.tweets, authors), args.chunk_size),
+            ),
+        }
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+    for name, (count, elapsed) in results.items():
+        print(
+            f"  {name:<9}  {count:>7} tweets  {elapsed:7.2f} s  "
+            f"{count / elapsed:9.0f} tweets/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
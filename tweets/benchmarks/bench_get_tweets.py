@@ -0,0 +1,136 @@
+"""
+GetTweets database path: ORM instances vs a column-only Core select.
+
+Builds a temporary SQLite database of --tweets tweets, then for batches of
+50, 100 and 500 random ids times what a GetTweets cache miss costs: the old
+query loading ORM Tweet objects and copying them into TweetStructs, against
+load_tweets' plain-row select turned into the same TweetStructs. Each run
+uses a fresh session, as a handler does. Postgres also gets a single
+`= ANY(:ids)` array parameter instead of one bind per id; SQLite shows the
+Python-side saving only.
+
+Usage (from the tweets/ directory):
+    python -m benchmarks.bench_get_tweets --tweets 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from src.dependencies.db import Base
+from src.grpc.server import load_tweets, tweet_structs
+from src.grpc.server.tweet_service_pb2 import GetTweetsRes, TweetStruct
+from src.models import Tweet
+
+BATCH_SIZES = (50, 100, 500)
+
+
+def sqlite_safe_uuid():
+    # SQLite stores a UUID column with NUMERIC affinity, so the rare hex
+    # string that reads as a number (digits and one "e") comes back a float.
+    while True:
+        id = uuid4()
+        try:
+            float(id.hex)
+        except ValueError:
+            return id
+
+
+def build(engine, tweets: int) -> list:
+    Base.metadata.create_all(engine)
+    base = datetime(2024, 1, 1)
+    rows = [
+        {
+            "id": sqlite_safe_uuid(),
+            "user_id": sqlite_safe_uuid(),
+            "content": "x" * 140,
+            "num_likes": i % 50,
+            "num_replys": i % 7,
+            "num_reposts": i % 11,
+            "created_at": base + timedelta(seconds=i),
+        }
+        for i in range(tweets)
+    ]
+    with engine.begin() as conn:
+        for start in range(0, len(rows), 10000):
+            conn.execute(insert(Tweet), rows[start : start + 10000])
+    return [row["id"] for row in rows]
+
+
+def orm_get_tweets(db, tweet_ids):
+    # GetTweets before the column-only select.
+    tweets = db.query(Tweet).filter(Tweet.id.in_(tweet_ids)).all()
+    return GetTweetsRes(
+        tweets=[
+            TweetStruct(
+                id=str(tweet.id),
+                user_id=str(tweet.user_id),
+                content=tweet.content,
+                num_likes=tweet.num_likes,
+                num_replys=tweet.num_replys,
+                num_reposts=tweet.num_reposts,
+                created_at=int(tweet.created_at.timestamp()),
+            )
+            for tweet in tweets
+        ]
+    )
+
+
+def core_get_tweets(db, tweet_ids):
+    tweets = load_tweets(db, tweet_ids)
+    for tweet_id in tweet_ids:
+        tweets.setdefault(tweet_id, None)
+    return GetTweetsRes(tweets=tweet_structs(tweets, tweet_ids, False))
+
+
+def timed(session_factory, fn, batches) -> list[float]:
+    latencies = []
+    for tweet_ids in batches:
+        with session_factory() as db:
+            start = time.perf_counter()
+            response = fn(db, tweet_ids)
+            latencies.append(time.perf_counter() - start)
+        assert len(response.tweets) == len(tweet_ids)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tweets", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    session_factory = sessionmaker(engine)
+    try:
+        ids = build(engine, args.tweets)
+        rng = random.Random(0)
+
+        print(f"{args.tweets} tweets, {args.runs} runs per batch size")
+        for size in BATCH_SIZES:
+            batches = [rng.sample(ids, size) for _ in range(args.runs)]
+            for name, fn in (("orm", orm_get_tweets), ("core", core_get_tweets)):
+                timed(session_factory, fn, batches[:3])  # warm up
+                latencies = timed(session_factory, fn, batches)
+                print(
+                    f"  {size:>4} ids  {name:<5} "
+                    f"median {statistics.median(latencies) * 1000:8.2f} ms  "
+                    f"p95 {statistics.quantiles(latencies, n=20)[-1] * 1000:8.2f} ms"
+                )
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+RabbitMQ publish throughput: connection per message vs the shared publisher.
+
+Runs against benchmarks.fake_broker, an in-process stand-in whose round
+trips take --rtt ms and whose connection handshake takes --handshake ms,
+so results show protocol overhead rather than broker speed. "per-message"
+opens a connection, declares, publishes, waits for the confirm and closes
+for every message, like the old produce_message; "pooled" sends every
+message through one long-lived Publisher. --producers threads publish
+concurrently, like requests on the route thread pool.
+
+Usage (from the tweets/ directory):
+    python -m benchmarks.bench_mq_publish --producers 16 --messages 2000
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_broker import FakeBroker
+from src.dependencies.mq import Publisher
+
+PAYLOAD = {"id": "0" * 36, "user_id": "0" * 36, "content": "x" * 140}
+
+
+def per_message(broker: FakeBroker):
+    def send(_):
+        publisher = Publisher(broker.connect, pool_size=1)
+        publisher.publish(PAYLOAD, "general_tweets").result()
+        publisher.close()
+
+    return send
+
+
+def pooled(broker: FakeBroker):
+    publisher = Publisher(broker.connect)
+
+    def send(_):
+        publisher.publish(PAYLOAD, "general_tweets").result()
+
+    send.close = publisher.close
+    return send
+
+
+def run(make_sender, producers: int, messages: int, rtt: float, handshake: float):
+    broker = FakeBroker(rtt=rtt, handshake=handshake)
+    send = make_sender(broker)
+    with ThreadPoolExecutor(max_workers=producers) as pool:
+        list(pool.map(send, range(producers)))  # warm up
+        start = time.perf_counter()
+        list(pool.map(send, range(messages)))
+        elapsed = time.perf_counter() - start
+    if hasattr(send, "close"):
+        send.close()
+    return messages / elapsed, len(broker.connections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--producers", type=int, default=16)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--rtt", type=float, default=0.5, help="ms")
+    parser.add_argument("--handshake", type=float, default=3.0, help="ms")
+    args = parser.parse_args()
+
+    print(
+        f"{args.messages} messages, {args.producers} producers, "
+        f"{args.rtt:g} ms rtt, {args.handshake:g} ms handshake"
+    )
+    for name, make_sender in (("per-message", per_message), ("pooled", pooled)):
+        rate, connections = run(
+            make_sender,
+            args.producers,
+            args.messages,
+            args.rtt / 1000,
+            args.handshake / 1000,
+        )
+        print(f"  {name:<12} {rate:9.0f} msg/s  {connections} connections")
+
+
+if __name__ == "__main__":
+    main()
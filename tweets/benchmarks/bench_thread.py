@@ -0,0 +1,121 @@
+"""
+Thread first screen for a viral tweet: every reply vs load_thread.
+
+Builds a temporary SQLite database holding one tweet with --replies direct
+replies, the first few hundred of which have nested replies of their own,
+then times reading the whole reply list (the old GET /tweet/{id}) against
+load_thread's default first screen. Both go through the async session used
+by the routes; absolute numbers on Postgres will differ, the shape won't.
+
+Usage (from the tweets/ directory):
+    python -m benchmarks.bench_thread --replies 100000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.dependencies.db import Base
+from src.models import ReplyTweet, Tweet
+from src.threads import load_thread
+
+
+def build(url: str, replies: int, nested: int) -> object:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+
+    root_id = uuid4()
+    base = datetime(2024, 1, 1)
+
+    def reply_rows(parent_id, count, offset):
+        return [
+            {
+                "id": uuid4(),
+                "user_id": uuid4(),
+                "parent_id": parent_id,
+                "content": "x" * 140,
+                "num_likes": 0,
+                "num_replys": 0,
+                "num_reposts": 0,
+                "created_at": base + timedelta(seconds=offset + i),
+            }
+            for i in range(count)
+        ]
+
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Tweet),
+            [{"id": root_id, "user_id": uuid4(), "content": "viral", "created_at": base}],
+        )
+        top = reply_rows(root_id, replies, 0)
+        for start in range(0, len(top), 10000):
+            conn.execute(insert(ReplyTweet), top[start : start + 10000])
+        for i, parent in enumerate(top[:nested]):
+            conn.execute(insert(ReplyTweet), reply_rows(parent["id"], 10, replies + i * 10))
+    engine.dispose()
+    return root_id
+
+
+async def timed(session_factory, fn, runs: int) -> list[float]:
+    latencies = []
+    for _ in range(runs):
+        async with session_factory() as db:
+            start = time.perf_counter()
+            await fn(db)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def run(path: str, root_id, runs: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def all_replies(db):
+        # GET /tweet/{id} before threads.
+        result = await db.execute(select(ReplyTweet).filter_by(parent_id=root_id))
+        return [reply.to_dict() for reply in result.scalars().all()]
+
+    async def first_screen(db):
+        return await load_thread(db, root_id)
+
+    results = {}
+    for name, fn in (("all replies", all_replies), ("load_thread", first_screen)):
+        await timed(session_factory, fn, 1)  # warm up
+        results[name] = await timed(session_factory, fn, runs)
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--replies", type=int, default=100000)
+    parser.add_argument("--nested", type=int, default=200, help="replies with replies")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        root_id = build(f"sqlite:///{path}", args.replies, args.nested)
+        results = asyncio.run(run(path, root_id, args.runs))
+    finally:
+        os.remove(path)
+
+    print(f"tweet with {args.replies} replies, {args.runs} runs")
+    for name, latencies in results.items():
+        print(
+            f"  {name:<12}  median {statistics.median(latencies) * 1000:9.2f} ms  "
+            f"max {max(latencies) * 1000:9.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+In-process stand-in for RabbitMQ, shaped like pika's SelectConnection.
+
+Every broker round trip (channel open, declares, confirm select, publish
+confirms, close) completes after `rtt` seconds and opening a connection
+after `handshake` seconds, all on a small event loop that runs in the
+thread calling ioloop.start(), as pika's does. Publish confirms are
+coalesced into one `multiple` ack per round trip, as RabbitMQ does under
+load.
+"""
+
+import heapq
+import itertools
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+from pika.spec import Basic
+
+
+class FakeIOLoop:
+    def __init__(self) -> None:
+        self._callbacks = queue.SimpleQueue()
+        self._timers = []
+        self._seq = itertools.count()
+        self._stopped = False
+
+    def add_callback_threadsafe(self, callback):
+        self._callbacks.put(callback)
+
+    def call_later(self, delay, callback):
+        heapq.heappush(self._timers, (time.monotonic() + delay, next(self._seq), callback))
+
+    def stop(self):
+        self._stopped = True
+
+    def start(self):
+        while not self._stopped:
+            now = time.monotonic()
+            while self._timers and self._timers[0][0] <= now:
+                heapq.heappop(self._timers)[2]()
+                if self._stopped:
+                    return
+
+            timeout = self._timers[0][0] - now if self._timers else 0.05
+            try:
+                callback = self._callbacks.get(timeout=max(timeout, 0))
+            except queue.Empty:
+                continue
+            callback()
+
+
+class FakeBroker:
+    """Records what was declared and published; hands out fake connections."""
+
+    def __init__(self, rtt: float = 0.0005, handshake: float = None) -> None:
+        self.rtt = rtt
+        self.handshake = handshake if handshake is not None else 5 * rtt
+        self.queues = set()
+        self.exchanges = set()
+        self.messages = []
+        self.nack_queues = set()
+        self.connections = []
+        self._lock = threading.Lock()
+
+    def connect(self, on_open_callback, on_open_error_callback, on_close_callback):
+        connection = FakeConnection(
+            self, on_open_callback, on_open_error_callback, on_close_callback
+        )
+        with self._lock:
+            self.connections.append(connection)
+        return connection
+
+
+class FakeConnection:
+    def __init__(self, broker, on_open, on_open_error, on_close) -> None:
+        self.broker = broker
+        self.ioloop = FakeIOLoop()
+        self.is_closing = False
+        self.is_closed = False
+        self._on_close = on_close
+        self._channel_ids = itertools.count(1)
+        self.ioloop.call_later(broker.handshake, lambda: on_open(self))
+
+    def channel(self, on_open_callback):
+        channel = FakeChannel(self, next(self._channel_ids))
+        self.ioloop.call_later(self.broker.rtt, lambda: on_open_callback(channel))
+
+    def close(self, reason="closed by client"):
+        if self.is_closing or self.is_closed:
+            return
+        self.is_closing = True
+        self.ioloop.call_later(self.broker.rtt, lambda: self._closed(reason))
+
+    def drop(self, reason="connection reset"):
+        """Simulate a lost connection: nothing in flight gets confirmed."""
+        self.ioloop.add_callback_threadsafe(lambda: self._closed(reason))
+
+    def _closed(self, reason):
+        if self.is_closed:
+            return
+        self.is_closing = False
+        self.is_closed = True
+        self._on_close(self, reason)
+
+
+class FakeChannel:
+    def __init__(self, connection: FakeConnection, number: int) -> None:
+        self.connection = connection
+        self.broker = connection.broker
+        self.channel_number = number
+        self._on_ack_nack = None
+        self._next_tag = itertools.count(1)
+        self._unacked = []
+        self._ack_scheduled = False
+
+    def _later(self, callback):
+        self.connection.ioloop.call_later(self.broker.rtt, callback)
+
+    def _if_open(self, callback):
+        # Replies for a closed connection are never delivered.
+        return lambda: None if self.connection.is_closed else callback()
+
+    def add_on_close_callback(self, callback):
+        pass
+
+    def confirm_delivery(self, ack_nack_callback, callback):
+        self._on_ack_nack = ack_nack_callback
+        self._later(self._if_open(lambda: callback(SimpleNamespace())))
+
+    def exchange_declare(self, exchange, exchange_type, durable, callback):
+        self.broker.exchanges.add(exchange)
+        self._later(self._if_open(lambda: callback(SimpleNamespace())))
+
+    def queue_declare(self, queue, callback):
+        self.broker.queues.add(queue)
+        self._later(self._if_open(lambda: callback(SimpleNamespace())))
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        tag = next(self._next_tag)
+        with self.broker._lock:
+            self.broker.messages.append((exchange, routing_key, body))
+        self._unacked.append((tag, routing_key in self.broker.nack_queues))
+        if not self._ack_scheduled:
+            self._ack_scheduled = True
+            self._later(self._if_open(self._confirm))
+
+    def _confirm(self):
+        self._ack_scheduled = False
+        unacked, self._unacked = self._unacked, []
+        if not any(nack for _, nack in unacked):
+            frame = Basic.Ack(delivery_tag=unacked[-1][0], multiple=True)
+            self._on_ack_nack(SimpleNamespace(method=frame))
+            return
+        for tag, nack in unacked:
+            frame = (Basic.Nack if nack else Basic.Ack)(delivery_tag=tag, multiple=False)
+            self._on_ack_nack(SimpleNamespace(method=frame))
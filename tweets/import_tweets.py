@@ -0,0 +1,88 @@
+"""
+Bulk-import tweets into the tweets database.
+
+Reads NDJSON ({"user_id": ..., "content": ...} per line, with optional "id"
+and "created_at") or CSV (user_id,content[,created_at] per line) from a file
+or stdin and inserts the tweets in chunks. Feed and search events are left
+in the outbox for the running service to relay; the authors' num_tweets
+deltas are sent to the User Service before exiting, retrying for up to
+--flush-timeout seconds. If they still cannot be sent the command exits 1,
+and the "unsent_deltas" in its output must be applied to the users by hand
+(or their num_tweets reconciled).
+
+Usage (from the tweets/ directory):
+    python import_tweets.py tweets.ndjson
+    python import_tweets.py --format csv --chunk-size 2000 < tweets.csv
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from src.dependencies.db import SessionLocal
+from src.tweet_import import (
+    TWEET_IMPORT_CHUNK_SIZE,
+    TWEET_IMPORT_FLUSH_TIMEOUT,
+    TweetImporter,
+)
+
+
+def read_ndjson(lines):
+    for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def read_csv(lines):
+    for row in csv.reader(lines):
+        if row and row[0] != "user_id":
+            yield row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", help="input file (default: stdin)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    parser.add_argument("--chunk-size", type=int, default=TWEET_IMPORT_CHUNK_SIZE)
+    parser.add_argument(
+        "--flush-timeout", type=float, default=TWEET_IMPORT_FLUSH_TIMEOUT
+    )
+    args = parser.parse_args()
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if args.path and args.path.endswith(".csv") else "ndjson"
+
+    source = open(args.path, newline="") if args.path else sys.stdin
+    reader = read_csv if fmt == "csv" else read_ndjson
+
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        importer = TweetImporter(db, chunk_size=args.chunk_size)
+        importer.import_tweets(reader(source))
+        result = importer.finish(timeout=args.flush_timeout)
+    finally:
+        db.close()
+        if source is not sys.stdin:
+            source.close()
+
+    elapsed = time.perf_counter() - start
+    result["tweets_per_second"] = round(result["inserted"] / elapsed) if elapsed else 0
+    print(json.dumps(result))
+    if not result["counts_sent"]:
+        print(
+            "num_tweets deltas were not sent to the User Service; apply "
+            "unsent_deltas by hand or reconcile those users' num_tweets",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
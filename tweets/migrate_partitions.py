@@ -0,0 +1,37 @@
+"""
+Move tweets, replies, likes and reposts into monthly partitioned tables.
+
+For databases created before partitioning, where the service refuses to
+start until this has run. Stop the tweets service first. Each plain table
+is renamed to <table>_legacy and its rows are copied into a new
+partitioned table, all in one transaction. Likes and reposts take the
+created_at of their tweet; those of deleted tweets are left in the legacy
+table. Prints the rows copied and left per table.
+
+Usage (from the tweets/ directory):
+    python migrate_partitions.py
+    python migrate_partitions.py --drop-legacy
+"""
+
+import argparse
+import json
+
+from src.dependencies.db import engine
+from src.partitions import migrate_unpartitioned
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--drop-legacy",
+        action="store_true",
+        help="drop each legacy table once all of its rows are copied",
+    )
+    args = parser.parse_args()
+
+    result = migrate_unpartitioned(engine, drop_legacy=args.drop_legacy)
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,14 @@ from uvicorn import Config
 import logging
 from fastapi import FastAPI
 
+from src.grpc.channels import channels
 from src.grpc.server import serve
 
 from src.dependencies.config import Config
+from src.dependencies.counters import counter_buffer, counter_deltas
+from src.dependencies.mq import publisher
+from src.outbox import outbox_relay
+from src.partitions import partition_maintainer
 
 from src.routes import router as TweetRouter
 
@@ -36,8 +41,20 @@ class App:
 
     def startup_event(self):
         self.grpc_startup_event()
+        outbox_relay.start()
+        counter_deltas.start()
+        counter_buffer.start()
+        partition_maintainer.start()
         print(f"Server initialized")
 
+    def shutdown_event(self):
+        partition_maintainer.stop()
+        counter_buffer.stop()
+        counter_deltas.stop()
+        outbox_relay.stop()
+        publisher.close()
+        channels.close()
+
     def grpc_startup_event(self):
         # Start grpc
         grpc_thread = Thread(target=serve)
@@ -57,7 +74,9 @@ class App:
 
         trace.set_tracer_provider(provider)
 
-        app = FastAPI(on_startup=[self.startup_event])
+        app = FastAPI(
+            on_startup=[self.startup_event], on_shutdown=[self.shutdown_event]
+        )
 
         FastAPIInstrumentor.instrument_app(app)
         RequestsInstrumentor().instrument()
@@ -0,0 +1,415 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Iterable, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from src.dependencies.config import config
+from src.partitions import ONE_MS, id_time, id_time_bounds
+
+logger = logging.getLogger(__name__)
+
+# Seconds between write-behind flushes of num_likes/num_reposts.
+ENGAGEMENT_FLUSH_INTERVAL = float(config.get("ENGAGEMENT_FLUSH_INTERVAL", "0.25"))
+# Independently locked partitions of the pending deltas.
+ENGAGEMENT_COUNTER_SHARDS = int(config.get("ENGAGEMENT_COUNTER_SHARDS", "16"))
+
+COUNTER_COLUMNS = ("num_likes", "num_reposts")
+
+COUNTER_DELTA_FLUSH_INTERVAL = float(config.get("COUNTER_DELTA_FLUSH_INTERVAL", "0.5"))
+# Longest pause between retries of a batch the users service did not take.
+COUNTER_DELTA_MAX_BACKOFF = 30.0
+
+
+def _zero_deltas() -> dict[str, int]:
+    return dict.fromkeys(COUNTER_COLUMNS, 0)
+
+
+class _Shard:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.pending: dict[UUID, dict[str, int]] = defaultdict(_zero_deltas)
+        # Deltas taken by a flush that has not committed yet.
+        self.inflight: dict[UUID, dict[str, int]] = {}
+
+
+class CounterBuffer:
+    """
+    Write-behind buffer for the like and repost counters on the tweets table.
+
+    Likes and reposts only insert their own row; the counter change is
+    accumulated here and applied every `interval` seconds as one batched
+    `UPDATE tweets SET n = n + :delta`, so a viral tweet's likes no longer
+    queue behind a lock on its row. Pending deltas are split over `shards`
+    independently locked maps so concurrent requests rarely contend. Deltas
+    from a failed flush are put back and retried on the next one.
+
+    The tweet_like and tweet_repost rows remain the source of truth;
+    reconcile() recounts the stored counters from them.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        interval: float = ENGAGEMENT_FLUSH_INTERVAL,
+        shards: int = ENGAGEMENT_COUNTER_SHARDS,
+    ) -> None:
+        self.session_factory = session_factory
+        self.interval = interval
+
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._flush_listeners: list[Callable[[list[UUID]], None]] = []
+
+    def add_flush_listener(self, listener: Callable[[list[UUID]], None]):
+        """Call listener with the updated tweet ids after each committed flush."""
+        self._flush_listeners.append(listener)
+
+    def _shard(self, tweet_id: UUID) -> _Shard:
+        return self._shards[tweet_id.int % len(self._shards)]
+
+    def add(self, tweet_id, column: str, delta: int = 1):
+        if column not in COUNTER_COLUMNS:
+            raise ValueError(f"unknown counter column: {column}")
+
+        tweet_id = tweet_id if isinstance(tweet_id, UUID) else UUID(str(tweet_id))
+        shard = self._shard(tweet_id)
+        with shard.lock:
+            shard.pending[tweet_id][column] += delta
+
+    def pending(self, tweet_id, column: str) -> int:
+        """Return the unflushed delta for one counter."""
+        tweet_id = tweet_id if isinstance(tweet_id, UUID) else UUID(str(tweet_id))
+        shard = self._shard(tweet_id)
+        with shard.lock:
+            total = 0
+            for deltas in (shard.pending.get(tweet_id), shard.inflight.get(tweet_id)):
+                if deltas:
+                    total += deltas[column]
+            return total
+
+    def pending_deltas(self, tweet_id: UUID) -> Optional[dict[str, int]]:
+        """Return all unflushed deltas of one tweet, or None if it has none."""
+        shard = self._shard(tweet_id)
+        with shard.lock:
+            pending = shard.pending.get(tweet_id)
+            inflight = shard.inflight.get(tweet_id)
+            if pending is None and inflight is None:
+                return None
+            return {
+                column: (pending or {}).get(column, 0) + (inflight or {}).get(column, 0)
+                for column in COUNTER_COLUMNS
+            }
+
+    def counts(self, tweet) -> dict[str, int]:
+        """Return a tweet's counters with unflushed deltas merged in."""
+        if tweet.id is None:
+            return {column: getattr(tweet, column) for column in COUNTER_COLUMNS}
+        return {
+            column: (getattr(tweet, column) or 0) + self.pending(tweet.id, column)
+            for column in COUNTER_COLUMNS
+        }
+
+    def flush(self) -> int:
+        """Apply all pending deltas. Returns the number of rows updated."""
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        batch: dict[UUID, dict[str, int]] = {}
+        for shard in self._shards:
+            with shard.lock:
+                shard.inflight, shard.pending = shard.pending, defaultdict(_zero_deltas)
+                batch.update(shard.inflight)
+
+        # Rows of tweets whose id carries their created_at get its range, so
+        # each update touches one partition; older ids are updated unbounded.
+        stamped, unstamped = [], []
+        # Fixed row order keeps concurrent flushers from deadlocking.
+        for tweet_id, deltas in sorted(batch.items()):
+            if not any(deltas.values()):
+                continue
+            row = {"b_id": tweet_id, **{f"b_{c}": deltas[c] for c in COUNTER_COLUMNS}}
+            created_at = id_time(tweet_id)
+            if created_at is None:
+                unstamped.append(row)
+            else:
+                stamped.append(
+                    {**row, "b_from": created_at, "b_to": created_at + ONE_MS}
+                )
+        params = stamped + unstamped
+        if not params:
+            self._finish()
+            return 0
+
+        from src.models import Tweet
+
+        tweets = Tweet.__table__
+
+        def add_deltas(*where):
+            return (
+                update(tweets)
+                .where(tweets.c.id == bindparam("b_id"), *where)
+                .values(
+                    {
+                        column: tweets.c[column] + bindparam(f"b_{column}")
+                        for column in COUNTER_COLUMNS
+                    }
+                )
+            )
+
+        db = self._session()
+        try:
+            if stamped:
+                created_at = tweets.c.created_at
+                db.execute(
+                    add_deltas(
+                        created_at >= bindparam("b_from"),
+                        created_at < bindparam("b_to"),
+                    ),
+                    stamped,
+                )
+            if unstamped:
+                db.execute(add_deltas(), unstamped)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error flushing engagement counters, will retry: {e}")
+            self._finish(restore=True)
+            return 0
+        finally:
+            db.close()
+
+        # Before _finish, so readers see the in-flight deltas until caches
+        # holding the old stored values are gone.
+        tweet_ids = [row["b_id"] for row in params]
+        for listener in self._flush_listeners:
+            try:
+                listener(tweet_ids)
+            except Exception as e:
+                logger.error(f"Counter flush listener failed: {e}")
+
+        self._finish()
+        return len(params)
+
+    def reconcile(self, tweet_ids: Optional[Iterable] = None) -> int:
+        """
+        Recount num_likes and num_reposts from the like and repost rows,
+        for the given tweets or every tweet whose stored counts disagree.
+        Pending deltas are flushed first. Likes committed while the recount
+        runs may be counted twice until the next reconciliation.
+        Returns the number of rows updated.
+        """
+        from src.models import Tweet, TweetLike, TweetRepost
+
+        tweets = Tweet.__table__
+        # tweet_created_at narrows each count to the partition of the tweet.
+        likes = (
+            select(func.count())
+            .where(
+                TweetLike.tweet_id == tweets.c.id,
+                TweetLike.tweet_created_at == tweets.c.created_at,
+            )
+            .scalar_subquery()
+        )
+        reposts = (
+            select(func.count())
+            .where(
+                TweetRepost.tweet_id == tweets.c.id,
+                TweetRepost.tweet_created_at == tweets.c.created_at,
+            )
+            .scalar_subquery()
+        )
+        stmt = update(tweets).values(num_likes=likes, num_reposts=reposts)
+        if tweet_ids is not None:
+            ids = [t if isinstance(t, UUID) else UUID(str(t)) for t in tweet_ids]
+            stmt = stmt.where(
+                tweets.c.id.in_(ids), *id_time_bounds(tweets.c.created_at, ids)
+            )
+        else:
+            stmt = stmt.where(
+                or_(tweets.c.num_likes != likes, tweets.c.num_reposts != reposts)
+            )
+
+        with self._flush_lock:
+            self._flush()
+            db = self._session()
+            try:
+                updated = db.execute(stmt).rowcount
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        return updated
+
+    def clear(self):
+        for shard in self._shards:
+            with shard.lock:
+                shard.pending.clear()
+                shard.inflight = {}
+
+    def _finish(self, restore: bool = False):
+        for shard in self._shards:
+            with shard.lock:
+                if restore:
+                    for tweet_id, deltas in shard.inflight.items():
+                        for column, delta in deltas.items():
+                            shard.pending[tweet_id][column] += delta
+                shard.inflight = {}
+
+    def _session(self) -> Session:
+        if self.session_factory is None:
+            from src.dependencies.db import SessionLocal
+
+            return SessionLocal()
+        return self.session_factory()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread and apply whatever is still pending."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+counter_buffer = CounterBuffer()
+
+
+def _send(num_tweets: dict[str, int], batch_id: str) -> bool:
+    from src.grpc.client import ApplyCounterDeltas
+
+    return ApplyCounterDeltas(num_tweets, batch_id) is not None
+
+
+class CounterDeltaBuffer:
+    """
+    Coalesces num_tweets changes for the users service.
+
+    Routes call add() instead of making an RPC per post. A background thread
+    sends the net delta per author every `interval` seconds in a single
+    ApplyCounterDeltas call. A batch that fails keeps its batch id and is
+    resent (with backoff) before anything newer, so the server can drop
+    duplicates; deltas added meanwhile wait in the next batch.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[dict[str, int], str], bool] = _send,
+        interval: float = COUNTER_DELTA_FLUSH_INTERVAL,
+    ) -> None:
+        self.send = send
+        self.interval = interval
+
+        self._pending: dict[str, int] = defaultdict(int)
+        # (batch_id, deltas) of a batch that has not been acknowledged yet.
+        self._unsent: Optional[tuple[str, dict[str, int]]] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+
+    def add(self, user_id, delta: int = 1):
+        with self._lock:
+            self._pending[str(user_id)] += delta
+
+    def pending(self, user_id) -> int:
+        """Return the unsent delta for one user, including a failed batch."""
+        user_id = str(user_id)
+        with self._lock:
+            total = self._pending.get(user_id, 0)
+            if self._unsent is not None:
+                total += self._unsent[1].get(user_id, 0)
+            return total
+
+    def unsent(self) -> dict[str, int]:
+        """Return every unacknowledged delta per user, including a failed batch."""
+        with self._lock:
+            totals = defaultdict(int, self._pending)
+            if self._unsent is not None:
+                for user_id, delta in self._unsent[1].items():
+                    totals[user_id] += delta
+            return {user_id: delta for user_id, delta in totals.items() if delta}
+
+    def flush(self) -> bool:
+        """Send the failed batch, if any, then everything pending."""
+        with self._flush_lock:
+            if self._unsent is None:
+                with self._lock:
+                    deltas = {k: v for k, v in self._pending.items() if v}
+                    self._pending = defaultdict(int)
+                if not deltas:
+                    return True
+                self._unsent = (str(uuid4()), deltas)
+
+            batch_id, deltas = self._unsent
+            try:
+                sent = self.send(deltas, batch_id)
+            except Exception:
+                self._failures += 1
+                raise
+            if not sent:
+                self._failures += 1
+                return False
+
+            self._unsent = None
+            self._failures = 0
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._unsent = None
+            self._failures = 0
+
+    def _run(self):
+        while not self._stop.wait(self._delay()):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing counter deltas: {e}")
+
+    def _delay(self) -> float:
+        if not self._failures:
+            return self.interval
+        return min(self.interval * 2**self._failures, COUNTER_DELTA_MAX_BACKOFF)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread and try once more to send what is pending."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if not self.flush():
+            logger.error("Dropping unsent counter deltas on shutdown")
+        elif self._pending:
+            self.flush()
+
+
+counter_deltas = CounterDeltaBuffer()
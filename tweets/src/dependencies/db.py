@@ -1,7 +1,13 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
 from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, declarative_base, scoped_session, Session
 
 from src.dependencies.config import Config
@@ -19,6 +25,35 @@ url = URL.create(
 
 engine = create_engine(url)
 
+# Async engine for routes that run on the event loop. Sized independently of
+# the sync pool, which still serves gRPC handlers and the remaining routes.
+DB_ASYNC_DRIVER = config.get("DB_ASYNC_DRIVER", "asyncpg")
+DB_ASYNC_POOL_SIZE = int(config.get("DB_ASYNC_POOL_SIZE", "10"))
+DB_ASYNC_MAX_OVERFLOW = int(config.get("DB_ASYNC_MAX_OVERFLOW", "10"))
+
+
+def create_async_db_engine() -> AsyncEngine:
+    """
+    Create an engine on the async driver. Its pooled connections belong to
+    the event loop that opened them, so code running its own loop (the
+    grpc.aio server) needs an engine of its own.
+    """
+    return create_async_engine(
+        url.set(drivername=f"postgresql+{DB_ASYNC_DRIVER}"),
+        pool_size=DB_ASYNC_POOL_SIZE,
+        max_overflow=DB_ASYNC_MAX_OVERFLOW,
+        pool_pre_ping=True,
+    )
+
+
+async_engine = create_async_db_engine()
+
+# expire_on_commit=False so committed objects can still be serialized
+# without an implicit (and, under asyncio, illegal) lazy refresh.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 # Session factory for creating new sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -48,7 +83,32 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that provides an async database session.
+
+    Usage:
+        @router.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_db)):
+            return (await db.execute(select(Item))).scalars().all()
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     import src.models
+    from src.partitions import partition_maintainer, unpartitioned_tables
 
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, partitioned or not.
+    with engine.connect() as conn:
+        legacy = unpartitioned_tables(conn)
+    if legacy:
+        raise RuntimeError(
+            f"{', '.join(legacy)} predate monthly partitioning. With the tweets "
+            "service stopped, run `python migrate_partitions.py` from tweets/ "
+            "to move their rows into partitioned tables."
+        )
+    # Partitioned tables take no rows until their partitions exist.
+    partition_maintainer.maintain()
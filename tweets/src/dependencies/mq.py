@@ -1,38 +1,376 @@
-import pika
 import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from itertools import cycle
+from typing import Callable, Optional
+
+import pika
+from pika.spec import Basic
 
 from src.dependencies.config import config
 
+logger = logging.getLogger(__name__)
 
-def produce_message(
-    payload: object,
-    message_queue: str,
-    routing_key: str = "",
-):
-    RABBITMQ_USERNAME = str(config["RABBITMQ_USERNAME"])
-    RABBITMQ_PASSWORD = str(config["RABBITMQ_PASSWORD"])
-    RABBITMQ_HOST = str(config["RABBITMQ_HOST"])
+EXCHANGE = "tweet_exchange"
+
+# Confirm-mode channels opened on the publisher's connection.
+MQ_CHANNEL_POOL_SIZE = int(config.get("MQ_CHANNEL_POOL_SIZE", "4"))
+# Messages published per I/O loop turn before queued callbacks get a chance.
+MQ_PUBLISH_BATCH_SIZE = int(config.get("MQ_PUBLISH_BATCH_SIZE", "500"))
+# Seconds produce_message waits for the broker to confirm a message.
+MQ_CONFIRM_TIMEOUT = float(config.get("MQ_CONFIRM_TIMEOUT", "5"))
+# Upper bound of the exponential reconnect backoff, in seconds.
+MQ_RECONNECT_MAX_DELAY = float(config.get("MQ_RECONNECT_MAX_DELAY", "10"))
+
+# Times a message is republished after its connection dropped unconfirmed.
+MAX_ATTEMPTS = 3
+
+
+class PublishError(Exception):
+    """The broker rejected a message or it could not be delivered."""
+
+
+@dataclass
+class Message:
+    queue: str
+    routing_key: str
+    body: bytes
+    future: Future = field(default_factory=Future)
+    attempts: int = 0
+
+
+@dataclass
+class _Channel:
+    channel: object
+    next_tag: int = 1
+    # delivery tag -> message awaiting Basic.Ack/Nack
+    unconfirmed: dict = field(default_factory=dict)
 
-    if not routing_key:
-        routing_key = message_queue
 
+def connection_parameters() -> pika.ConnectionParameters:
     credentials = pika.PlainCredentials(
-        username=RABBITMQ_USERNAME, password=RABBITMQ_PASSWORD
+        username=str(config["RABBITMQ_USERNAME"]),
+        password=str(config["RABBITMQ_PASSWORD"]),
     )
-    connection = pika.BlockingConnection(
-        pika.ConnectionParameters(host=RABBITMQ_HOST, credentials=credentials)
+    return pika.ConnectionParameters(
+        host=str(config["RABBITMQ_HOST"]), credentials=credentials
     )
 
-    channel = connection.channel()
 
-    channel.exchange_declare(
-        exchange="tweet_exchange", exchange_type="topic", durable=True
-    )
+def select_connection(**callbacks) -> pika.SelectConnection:
+    return pika.SelectConnection(connection_parameters(), **callbacks)
+
+
+class Publisher:
+    """
+    Long-lived RabbitMQ publisher with publisher confirms.
+
+    One connection per process, owned by a background I/O thread running a
+    pika SelectConnection (pika connections are not thread-safe). publish()
+    queues a message and returns a Future resolved by the broker's ack.
+    Queued messages are drained in batches round-robin over a pool of
+    confirm-mode channels, so bursts share round trips and acks (which the
+    broker may send for many deliveries at once).
+
+    The exchange is declared when a connection opens and each queue the
+    first time it is used on that connection. If the connection drops,
+    unconfirmed messages are republished after reconnecting (at-least-once).
+    A forked child starts its own connection on first use.
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[..., object] = select_connection,
+        pool_size: int = MQ_CHANNEL_POOL_SIZE,
+        batch_size: int = MQ_PUBLISH_BATCH_SIZE,
+        max_reconnect_delay: float = MQ_RECONNECT_MAX_DELAY,
+    ) -> None:
+        self.connection_factory = connection_factory
+        self.pool_size = max(1, pool_size)
+        self.batch_size = max(1, batch_size)
+        self.max_reconnect_delay = max_reconnect_delay
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._outbox: deque[Message] = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._connection = None
+        self._wake_pending = False
+
+        # Owned by the I/O thread.
+        self._channels: list[_Channel] = []
+        self._next_channel = None
+        self._ready = False
+        self._declared: set[str] = set()
+        self._declaring: dict[str, list[Message]] = {}
+
+        self.published = 0
+        self.confirmed = 0
+        self.nacked = 0
+        self.reconnects = 0
+
+    def publish(self, payload: object, queue: str, routing_key: str = "") -> Future:
+        """Queue payload (JSON-encoded) for EXCHANGE; the Future resolves on ack."""
+        message = Message(
+            queue=queue,
+            routing_key=routing_key or queue,
+            body=json.dumps(payload).encode("utf-8"),
+        )
+        if self._pid != os.getpid():
+            # Forked: the parent's connection, thread and lock are unusable.
+            self._lock = threading.Lock()
+            self._reset()
+
+        with self._lock:
+            if self._stopping:
+                raise PublishError("publisher is closed")
+            self._outbox.append(message)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._wake()
+        return message.future
+
+    def close(self, timeout: float = 5.0):
+        """
+        Close the connection and fail messages that were never confirmed.
+        A later publish() opens a new connection.
+        """
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+            connection = self._connection
+
+        if connection is not None:
+            try:
+                connection.ioloop.add_callback_threadsafe(self._close_connection)
+            except Exception:
+                pass
+        if thread is not None:
+            thread.join(timeout)
+
+        error = PublishError("publisher closed before the message was confirmed")
+        for message in self._take_unfinished():
+            message.future.set_exception(error)
+
+        with self._lock:
+            self._reset()
 
-    channel.queue_declare(queue=message_queue)
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._outbox),
+            "published": self.published,
+            "confirmed": self.confirmed,
+            "nacked": self.nacked,
+            "reconnects": self.reconnects,
+        }
 
-    channel.basic_publish(
-        exchange="tweet_exchange", routing_key=routing_key, body=json.dumps(payload)
+    # I/O thread
+
+    def _run(self):
+        first_delay = min(0.1, self.max_reconnect_delay)
+        delay = first_delay
+        while not self._stopping:
+            opened_at = time.monotonic()
+            connection = self.connection_factory(
+                on_open_callback=self._on_connection_open,
+                on_open_error_callback=self._on_connection_closed,
+                on_close_callback=self._on_connection_closed,
+            )
+            with self._lock:
+                self._connection = connection
+            connection.ioloop.start()
+
+            if self._stopping:
+                break
+            self.reconnects += 1
+            # Back off only while connections keep failing quickly.
+            if time.monotonic() - opened_at > self.max_reconnect_delay:
+                delay = first_delay
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _wake(self):
+        with self._lock:
+            connection = self._connection
+            if connection is None or self._wake_pending:
+                return
+            self._wake_pending = True
+        try:
+            connection.ioloop.add_callback_threadsafe(self._drain)
+        except Exception:
+            # The loop is gone; the next connection drains the outbox on open.
+            with self._lock:
+                self._wake_pending = False
+
+    def _on_connection_open(self, connection):
+        for _ in range(self.pool_size):
+            connection.channel(on_open_callback=self._on_channel_open)
+
+    def _on_channel_open(self, channel):
+        channel.add_on_close_callback(self._on_channel_closed)
+        state = _Channel(channel)
+        channel.confirm_delivery(
+            ack_nack_callback=lambda frame: self._on_confirm(state, frame),
+            callback=lambda _frame: self._on_confirm_mode(state),
+        )
+
+    def _on_confirm_mode(self, state: _Channel):
+        self._channels.append(state)
+        if len(self._channels) == 1:
+            state.channel.exchange_declare(
+                exchange=EXCHANGE,
+                exchange_type="topic",
+                durable=True,
+                callback=lambda _frame: self._on_exchange_declared(),
+            )
+        elif self._ready:
+            self._next_channel = cycle(self._channels)
+
+    def _on_exchange_declared(self):
+        self._ready = True
+        self._next_channel = cycle(self._channels)
+        self._drain()
+
+    def _drain(self):
+        with self._lock:
+            self._wake_pending = False
+        if not self._ready:
+            return
+
+        for _ in range(self.batch_size):
+            try:
+                message = self._outbox.popleft()
+            except IndexError:
+                return
+
+            if message.queue in self._declared:
+                self._send(message)
+            elif message.queue in self._declaring:
+                self._declaring[message.queue].append(message)
+            else:
+                self._declaring[message.queue] = [message]
+                self._channels[0].channel.queue_declare(
+                    queue=message.queue,
+                    callback=lambda _frame, q=message.queue: self._on_queue_declared(q),
+                )
+
+        # More queued than one batch; yield to acks and other callbacks first.
+        self._wake()
+
+    def _on_queue_declared(self, queue: str):
+        self._declared.add(queue)
+        for message in self._declaring.pop(queue, []):
+            self._send(message)
+
+    def _send(self, message: Message):
+        state = next(self._next_channel)
+        message.attempts += 1
+        state.unconfirmed[state.next_tag] = message
+        state.next_tag += 1
+        state.channel.basic_publish(
+            exchange=EXCHANGE, routing_key=message.routing_key, body=message.body
+        )
+        self.published += 1
+
+    def _on_confirm(self, state: _Channel, frame):
+        method = frame.method
+        if method.multiple:
+            tags = [tag for tag in state.unconfirmed if tag <= method.delivery_tag]
+        else:
+            tags = [method.delivery_tag]
+
+        for tag in tags:
+            message = state.unconfirmed.pop(tag, None)
+            if message is None or message.future.done():
+                continue
+            if isinstance(method, Basic.Ack):
+                self.confirmed += 1
+                message.future.set_result(None)
+            else:
+                self.nacked += 1
+                message.future.set_exception(
+                    PublishError(f"broker rejected message for {message.queue}")
+                )
+
+    def _on_channel_closed(self, channel, reason):
+        # Every channel is needed for the round-robin; recover by reconnecting.
+        if self._connection is not None and not (
+            self._connection.is_closing or self._connection.is_closed
+        ):
+            logger.error(f"RabbitMQ channel closed: {reason}")
+            self._connection.close()
+
+    def _on_connection_closed(self, connection, reason):
+        if not self._stopping:
+            logger.error(f"RabbitMQ connection lost, reconnecting: {reason}")
+
+        requeue = []
+        for message in self._take_inflight():
+            if message.future.done():
+                continue
+            if message.attempts >= MAX_ATTEMPTS:
+                message.future.set_exception(
+                    PublishError(f"gave up on message for {message.queue}: {reason}")
+                )
+            else:
+                requeue.append(message)
+        self._outbox.extendleft(reversed(requeue))
+        connection.ioloop.stop()
+
+    def _close_connection(self):
+        connection = self._connection
+        if connection is not None and not (
+            connection.is_closing or connection.is_closed
+        ):
+            connection.close()
+
+    def _take_inflight(self) -> list[Message]:
+        """Reset per-connection state, returning messages it still held."""
+        messages = []
+        for state in self._channels:
+            messages.extend(state.unconfirmed[tag] for tag in sorted(state.unconfirmed))
+        for pending in self._declaring.values():
+            messages.extend(pending)
+
+        self._channels = []
+        self._next_channel = None
+        self._ready = False
+        self._declared = set()
+        self._declaring = {}
+        with self._lock:
+            self._connection = None
+            self._wake_pending = False
+        return messages
+
+    def _take_unfinished(self) -> list[Message]:
+        messages = self._take_inflight()
+        while self._outbox:
+            messages.append(self._outbox.popleft())
+        return [message for message in messages if not message.future.done()]
+
+
+publisher = Publisher()
+
+
+def produce_message(
+    payload: object,
+    message_queue: str,
+    routing_key: str = "",
+):
+    """
+    Publish payload to `message_queue` (routing key defaults to the queue
+    name) on the shared publisher, blocking until the broker confirms it.
+    """
+    publisher.publish(payload, message_queue, routing_key).result(
+        timeout=MQ_CONFIRM_TIMEOUT
     )
-    print(f" [x] Sent {payload} to {message_queue}")
-    connection.close()
+    logger.debug(f"Sent message to {message_queue}")
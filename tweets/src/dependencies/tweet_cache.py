@@ -0,0 +1,371 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+from uuid import UUID
+
+import redis
+
+from src.dependencies.cache import TTLCache
+from src.dependencies.config import config
+from src.dependencies.counters import counter_buffer
+from src.dependencies.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+TWEET_CACHE_SIZE = int(config.get("TWEET_CACHE_SIZE", "50000"))
+# The in-process layer is only invalidated on the replica that made the
+# change, so it is kept much shorter than the shared Redis layer.
+TWEET_CACHE_L1_TTL = float(config.get("TWEET_CACHE_L1_TTL", "10"))
+TWEET_CACHE_TTL = int(config.get("TWEET_CACHE_TTL", "300"))
+# Seconds an unknown or deleted id is remembered as missing.
+TWEET_CACHE_NEGATIVE_TTL = int(config.get("TWEET_CACHE_NEGATIVE_TTL", "60"))
+
+# Redis value of a negative entry.
+MISSING = "null"
+_ABSENT = object()
+
+
+def tweet_dict(tweet) -> dict:
+    """The cached form of a tweet: stored columns only, without pending deltas."""
+    return tweet_row_dict(
+        (
+            tweet.id,
+            tweet.user_id,
+            tweet.content,
+            tweet.num_likes,
+            tweet.num_replys,
+            tweet.num_reposts,
+            tweet.created_at,
+        )
+    )
+
+
+def tweet_row_dict(row) -> dict:
+    """
+    tweet_dict for a plain row of (id, user_id, content, num_likes,
+    num_replys, num_reposts, created_at), without per-field attribute lookups.
+    """
+    id, user_id, content, num_likes, num_replys, num_reposts, created_at = row
+    return {
+        "id": str(id),
+        "user_id": str(user_id),
+        "content": content,
+        "num_likes": num_likes or 0,
+        "num_replys": num_replys,
+        "num_reposts": num_reposts or 0,
+        "created_at": created_at.isoformat() if created_at else None,
+    }
+
+
+def with_pending_counts(tweet: dict, tweet_id: Optional[UUID] = None) -> dict:
+    """Merge unflushed like/repost deltas into a cached tweet."""
+    deltas = counter_buffer.pending_deltas(tweet_id or UUID(tweet["id"]))
+    if deltas is None:
+        return tweet
+    return {**tweet, **{column: tweet[column] + deltas[column] for column in deltas}}
+
+
+class TweetCache:
+    """
+    Two-level read-through cache of tweets.
+
+    Lookups try an in-process TTLCache, then Redis (tweet:{id}), then the
+    loader, and fill the levels they missed on the way back. Ids the loader
+    does not find, and deleted tweets, are cached as missing for
+    `negative_ttl` seconds so repeated lookups of them skip the database.
+    Entries hold the stored counter columns; callers merge unflushed deltas
+    with with_pending_counts, and invalidate() is called after every counter
+    flush.
+
+    A read that misses loads from the database while a flush may be
+    committing, so fills are conditional on the tweet not having been
+    invalidated since the read began: invalidate() and mark_deleted() bump a
+    per-tweet generation key in Redis, which the filling read watches, and
+    a process-wide generation for the in-process level.
+    """
+
+    def __init__(
+        self,
+        redis_conn: redis.Redis,
+        maxsize: int = TWEET_CACHE_SIZE,
+        l1_ttl: float = TWEET_CACHE_L1_TTL,
+        ttl: int = TWEET_CACHE_TTL,
+        negative_ttl: int = TWEET_CACHE_NEGATIVE_TTL,
+    ) -> None:
+        self.redis = redis_conn
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.local = TTLCache(maxsize=maxsize, ttl=l1_ttl)
+
+        self._lock = threading.Lock()
+        # Bumped by every invalidate() and mark_deleted(); a read only fills
+        # the in-process level if it is unchanged since the read began.
+        self._generation = 0
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.negative_hits = 0
+        self.loaded = 0
+        self.errors = 0
+
+    @staticmethod
+    def key(tweet_id) -> str:
+        return f"tweet:{tweet_id}"
+
+    @staticmethod
+    def generation_key(tweet_id) -> str:
+        return f"tweet_gen:{tweet_id}"
+
+    def get(
+        self, tweet_id: UUID, loader: Callable[[list[UUID]], dict]
+    ) -> Optional[dict]:
+        return self.get_many([tweet_id], loader)[tweet_id]
+
+    def get_many(
+        self, tweet_ids: Iterable[UUID], loader: Callable[[list[UUID]], dict]
+    ) -> dict[UUID, Optional[dict]]:
+        """
+        Tweets for tweet_ids, None for unknown or deleted ones. `loader`
+        receives the ids missing from both levels and returns {id: tweet_dict}.
+        """
+        tweets: dict[UUID, Optional[dict]] = {}
+        generation = self._generation
+        fetched = missing = self._get_local(tweet_ids, tweets)
+        if missing:
+            missing = self._get_remote(missing, tweets)
+
+        if missing:
+            pipe = self._watch(missing)
+            try:
+                loaded = loader(missing)
+            except BaseException:
+                self._unwatch(pipe)
+                raise
+            self._set_remote(pipe, missing, loaded)
+            self._record_loaded(missing, loaded, tweets)
+
+        self._set_local(fetched, tweets, generation)
+        return tweets
+
+    async def aget(
+        self, tweet_id: UUID, loader: Callable[[list[UUID]], Awaitable[dict]]
+    ) -> Optional[dict]:
+        return (await self.aget_many([tweet_id], loader))[tweet_id]
+
+    async def aget_many(
+        self,
+        tweet_ids: Iterable[UUID],
+        loader: Callable[[list[UUID]], Awaitable[dict]],
+    ) -> dict[UUID, Optional[dict]]:
+        """
+        get_many for event-loop callers, with a coroutine loader. Local hits
+        never leave the loop; Redis round trips run in the default executor.
+        """
+        tweets: dict[UUID, Optional[dict]] = {}
+        generation = self._generation
+        fetched = missing = self._get_local(tweet_ids, tweets)
+        if missing:
+            missing = await asyncio.to_thread(self._get_remote, missing, tweets)
+
+        if missing:
+            pipe = await asyncio.to_thread(self._watch, missing)
+            try:
+                loaded = await loader(missing)
+            except BaseException:
+                self._unwatch(pipe)
+                raise
+            await asyncio.to_thread(self._set_remote, pipe, missing, loaded)
+            self._record_loaded(missing, loaded, tweets)
+
+        self._set_local(fetched, tweets, generation)
+        return tweets
+
+    def invalidate(self, *tweet_ids):
+        """Drop cached tweets whose stored columns changed."""
+        with self._lock:
+            self._generation += 1
+        for tweet_id in tweet_ids:
+            self.local.delete(tweet_id)
+        if not tweet_ids:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(*(self.key(tweet_id) for tweet_id in tweet_ids))
+            self._bump_generations(pipe, tweet_ids)
+            pipe.execute()
+        except redis.RedisError as e:
+            self._record_error(f"Error invalidating tweet cache: {e}")
+
+    def mark_deleted(self, *tweet_ids):
+        """Cache deleted tweets as missing on both levels."""
+        with self._lock:
+            self._generation += 1
+        for tweet_id in tweet_ids:
+            self._set_local_missing(tweet_id)
+        if not tweet_ids:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            self._bump_generations(pipe, tweet_ids)
+            self._store(pipe, tweet_ids, {})
+            pipe.execute()
+        except redis.RedisError as e:
+            self._record_error(f"Error filling tweet cache: {e}")
+
+    def _get_local(self, tweet_ids: Iterable[UUID], tweets: dict) -> list[UUID]:
+        """Fill tweets from the in-process level; return the ids it lacked."""
+        missing = []
+        for tweet_id in dict.fromkeys(tweet_ids):
+            tweet = self.local.get(tweet_id, _ABSENT)
+            if tweet is _ABSENT:
+                missing.append(tweet_id)
+                continue
+            tweets[tweet_id] = tweet
+            if tweet is None:
+                with self._lock:
+                    self.negative_hits += 1
+        return missing
+
+    def _set_local(self, tweet_ids: list[UUID], tweets: dict, generation: int):
+        # Anything read before an invalidation may predate the flush.
+        if generation != self._generation:
+            return
+        # Only entries fetched from Redis or the loader are written back;
+        # rewriting the ones that hit would push their expiry out on every read.
+        for tweet_id in tweet_ids:
+            if tweets[tweet_id] is None:
+                self._set_local_missing(tweet_id)
+            else:
+                self.local.set(tweet_id, tweets[tweet_id])
+
+    def _set_local_missing(self, tweet_id: UUID):
+        ttl = min(self.local.ttl, self.negative_ttl)
+        self.local.set(tweet_id, None, expires_at=time.time() + ttl)
+
+    def _get_remote(self, tweet_ids: list[UUID], tweets: dict) -> list[UUID]:
+        """Fill tweets from Redis; return the ids Redis did not have."""
+        try:
+            values = self.redis.mget([self.key(tweet_id) for tweet_id in tweet_ids])
+        except redis.RedisError as e:
+            self._record_error(f"Error reading tweet cache: {e}")
+            return tweet_ids
+
+        missing = []
+        negative = 0
+        for tweet_id, value in zip(tweet_ids, values):
+            if value is None:
+                missing.append(tweet_id)
+            elif value == MISSING:
+                tweets[tweet_id] = None
+                negative += 1
+            else:
+                tweets[tweet_id] = json.loads(value)
+
+        with self._lock:
+            self.redis_hits += len(tweet_ids) - len(missing)
+            self.redis_misses += len(missing)
+            self.negative_hits += negative
+        return missing
+
+    def _bump_generations(self, pipe, tweet_ids: Iterable[UUID]):
+        # Deleting a missing tweet key does not disturb a WATCH, so fills
+        # are fenced by this key instead.
+        for tweet_id in tweet_ids:
+            pipe.incr(self.generation_key(tweet_id))
+            pipe.expire(self.generation_key(tweet_id), self.ttl)
+
+    def _store(self, pipe, tweet_ids: Iterable[UUID], loaded: dict):
+        """Queue loaded tweets, and every other id in tweet_ids as missing."""
+        for tweet_id in tweet_ids:
+            tweet = loaded.get(tweet_id)
+            if tweet is None:
+                pipe.set(self.key(tweet_id), MISSING, ex=self.negative_ttl)
+            else:
+                pipe.set(self.key(tweet_id), json.dumps(tweet), ex=self.ttl)
+
+    def _watch(self, tweet_ids: list[UUID]) -> Optional[redis.client.Pipeline]:
+        """
+        Watch the generation keys of tweet_ids ahead of loading them, or
+        return None if Redis is unavailable and the fill should be skipped.
+        """
+        try:
+            pipe = self.redis.pipeline()
+            pipe.watch(*(self.generation_key(tweet_id) for tweet_id in tweet_ids))
+        except redis.RedisError as e:
+            self._record_error(f"Error filling tweet cache: {e}")
+            return None
+        return pipe
+
+    @staticmethod
+    def _unwatch(pipe: Optional[redis.client.Pipeline]):
+        if pipe is not None:
+            pipe.reset()
+
+    def _set_remote(
+        self, pipe: Optional[redis.client.Pipeline], tweet_ids: list[UUID], loaded: dict
+    ):
+        """Store what was loaded unless a tweet was invalidated since _watch."""
+        if pipe is None:
+            return
+        try:
+            pipe.multi()
+            self._store(pipe, tweet_ids, loaded)
+            pipe.execute()
+        except redis.WatchError:
+            logger.debug("Tweets invalidated while loading, not cached")
+        except redis.RedisError as e:
+            self._record_error(f"Error filling tweet cache: {e}")
+        finally:
+            pipe.reset()
+
+    def _record_loaded(self, tweet_ids: list[UUID], loaded: dict, tweets: dict):
+        for tweet_id in tweet_ids:
+            tweets[tweet_id] = loaded.get(tweet_id)
+        with self._lock:
+            self.loaded += len(tweet_ids)
+
+    def _record_error(self, message: str):
+        logger.error(message)
+        with self._lock:
+            self.errors += 1
+
+    def clear(self):
+        self.local.clear()
+        with self._lock:
+            self.redis_hits = 0
+            self.redis_misses = 0
+            self.negative_hits = 0
+            self.loaded = 0
+            self.errors = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.redis_hits + self.redis_misses
+            return {
+                "local": self.local.stats(),
+                "redis": {
+                    "hits": self.redis_hits,
+                    "misses": self.redis_misses,
+                    "hit_ratio": self.redis_hits / lookups if lookups else 0.0,
+                    "errors": self.errors,
+                    "ttl_seconds": self.ttl,
+                },
+                # Ids read from the database after missing both levels.
+                "database": {"loaded": self.loaded},
+                # Lookups answered "missing" from either level.
+                "negative_hits": self.negative_hits,
+            }
+
+
+tweet_cache = TweetCache(redis_client)
+
+# Stored counters change on every flush; drop the affected tweets so the
+# next read picks up the new values.
+counter_buffer.add_flush_listener(lambda tweet_ids: tweet_cache.invalidate(*tweet_ids))
+
+
+def get_tweet_cache() -> TweetCache:
+    """FastAPI dependency that provides the shared tweet cache."""
+    return tweet_cache
@@ -1,5 +1,6 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
 """Client and server classes corresponding to protobuf-defined services."""
+
 import grpc
 import warnings
 
@@ -43,12 +44,30 @@ class UserStub(object):
             response_deserializer=user__service__pb2.GetUserRes.FromString,
             _registered_method=True,
         )
+        self.GetUsers = channel.unary_unary(
+            "/user_service.User/GetUsers",
+            request_serializer=user__service__pb2.GetUsersReq.SerializeToString,
+            response_deserializer=user__service__pb2.GetUsersRes.FromString,
+            _registered_method=True,
+        )
         self.IncrementsTweets = channel.unary_unary(
             "/user_service.User/IncrementsTweets",
             request_serializer=user__service__pb2.IncrementTweetsReq.SerializeToString,
             response_deserializer=user__service__pb2.IncrementTweetsRes.FromString,
             _registered_method=True,
         )
+        self.DecrementTweets = channel.unary_unary(
+            "/user_service.User/DecrementTweets",
+            request_serializer=user__service__pb2.DecrementTweetsReq.SerializeToString,
+            response_deserializer=user__service__pb2.DecrementTweetsRes.FromString,
+            _registered_method=True,
+        )
+        self.ApplyCounterDeltas = channel.unary_unary(
+            "/user_service.User/ApplyCounterDeltas",
+            request_serializer=user__service__pb2.ApplyCounterDeltasReq.SerializeToString,
+            response_deserializer=user__service__pb2.ApplyCounterDeltasRes.FromString,
+            _registered_method=True,
+        )
         self.GetFollowers = channel.unary_unary(
             "/user_service.User/GetFollowers",
             request_serializer=user__service__pb2.GetFollowersReq.SerializeToString,
@@ -61,6 +80,24 @@ class UserStub(object):
             response_deserializer=user__service__pb2.GetFollowingRes.FromString,
             _registered_method=True,
         )
+        self.CheckFollows = channel.unary_unary(
+            "/user_service.User/CheckFollows",
+            request_serializer=user__service__pb2.CheckFollowsReq.SerializeToString,
+            response_deserializer=user__service__pb2.CheckFollowsRes.FromString,
+            _registered_method=True,
+        )
+        self.StreamFollowers = channel.unary_stream(
+            "/user_service.User/StreamFollowers",
+            request_serializer=user__service__pb2.StreamFollowsReq.SerializeToString,
+            response_deserializer=user__service__pb2.FollowIdsChunk.FromString,
+            _registered_method=True,
+        )
+        self.StreamFollowing = channel.unary_stream(
+            "/user_service.User/StreamFollowing",
+            request_serializer=user__service__pb2.StreamFollowsReq.SerializeToString,
+            response_deserializer=user__service__pb2.FollowIdsChunk.FromString,
+            _registered_method=True,
+        )
 
 
 class UserServicer(object):
@@ -72,12 +109,30 @@ class UserServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def GetUsers(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
     def IncrementsTweets(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def DecrementTweets(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def ApplyCounterDeltas(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
     def GetFollowers(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -90,6 +145,24 @@ class UserServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def CheckFollows(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def StreamFollowers(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def StreamFollowing(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_UserServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -98,11 +171,26 @@ def add_UserServicer_to_server(servicer, server):
             request_deserializer=user__service__pb2.GetUserReq.FromString,
             response_serializer=user__service__pb2.GetUserRes.SerializeToString,
         ),
+        "GetUsers": grpc.unary_unary_rpc_method_handler(
+            servicer.GetUsers,
+            request_deserializer=user__service__pb2.GetUsersReq.FromString,
+            response_serializer=user__service__pb2.GetUsersRes.SerializeToString,
+        ),
         "IncrementsTweets": grpc.unary_unary_rpc_method_handler(
             servicer.IncrementsTweets,
             request_deserializer=user__service__pb2.IncrementTweetsReq.FromString,
             response_serializer=user__service__pb2.IncrementTweetsRes.SerializeToString,
         ),
+        "DecrementTweets": grpc.unary_unary_rpc_method_handler(
+            servicer.DecrementTweets,
+            request_deserializer=user__service__pb2.DecrementTweetsReq.FromString,
+            response_serializer=user__service__pb2.DecrementTweetsRes.SerializeToString,
+        ),
+        "ApplyCounterDeltas": grpc.unary_unary_rpc_method_handler(
+            servicer.ApplyCounterDeltas,
+            request_deserializer=user__service__pb2.ApplyCounterDeltasReq.FromString,
+            response_serializer=user__service__pb2.ApplyCounterDeltasRes.SerializeToString,
+        ),
         "GetFollowers": grpc.unary_unary_rpc_method_handler(
             servicer.GetFollowers,
             request_deserializer=user__service__pb2.GetFollowersReq.FromString,
@@ -113,6 +201,21 @@ def add_UserServicer_to_server(servicer, server):
             request_deserializer=user__service__pb2.GetFollowingReq.FromString,
             response_serializer=user__service__pb2.GetFollowingRes.SerializeToString,
         ),
+        "CheckFollows": grpc.unary_unary_rpc_method_handler(
+            servicer.CheckFollows,
+            request_deserializer=user__service__pb2.CheckFollowsReq.FromString,
+            response_serializer=user__service__pb2.CheckFollowsRes.SerializeToString,
+        ),
+        "StreamFollowers": grpc.unary_stream_rpc_method_handler(
+            servicer.StreamFollowers,
+            request_deserializer=user__service__pb2.StreamFollowsReq.FromString,
+            response_serializer=user__service__pb2.FollowIdsChunk.SerializeToString,
+        ),
+        "StreamFollowing": grpc.unary_stream_rpc_method_handler(
+            servicer.StreamFollowing,
+            request_deserializer=user__service__pb2.StreamFollowsReq.FromString,
+            response_serializer=user__service__pb2.FollowIdsChunk.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "user_service.User", rpc_method_handlers
@@ -155,6 +258,36 @@ class User(object):
             _registered_method=True,
         )
 
+    @staticmethod
+    def GetUsers(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/user_service.User/GetUsers",
+            user__service__pb2.GetUsersReq.SerializeToString,
+            user__service__pb2.GetUsersRes.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
     @staticmethod
     def IncrementsTweets(
         request,
@@ -185,6 +318,66 @@ class User(object):
             _registered_method=True,
         )
 
+    @staticmethod
+    def DecrementTweets(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/user_service.User/DecrementTweets",
+            user__service__pb2.DecrementTweetsReq.SerializeToString,
+            user__service__pb2.DecrementTweetsRes.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def ApplyCounterDeltas(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/user_service.User/ApplyCounterDeltas",
+            user__service__pb2.ApplyCounterDeltasReq.SerializeToString,
+            user__service__pb2.ApplyCounterDeltasRes.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
     @staticmethod
     def GetFollowers(
         request,
@@ -244,3 +437,93 @@ class User(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def CheckFollows(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/user_service.User/CheckFollows",
+            user__service__pb2.CheckFollowsReq.SerializeToString,
+            user__service__pb2.CheckFollowsRes.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def StreamFollowers(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/user_service.User/StreamFollowers",
+            user__service__pb2.StreamFollowsReq.SerializeToString,
+            user__service__pb2.FollowIdsChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def StreamFollowing(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/user_service.User/StreamFollowing",
+            user__service__pb2.StreamFollowsReq.SerializeToString,
+            user__service__pb2.FollowIdsChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
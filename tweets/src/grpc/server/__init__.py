@@ -1,18 +1,48 @@
+import asyncio
 import logging
 from contextlib import contextmanager
 from concurrent import futures
-from typing import Generator
+from datetime import datetime
+from typing import Generator, Optional
+from uuid import UUID
 
 import grpc
+from sqlalchemy import ARRAY, UUID as UUIDType, any_, bindparam, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
 
 from .tweet_service_pb2 import TweetStruct, GetTweetsRes
 from .tweet_service_pb2_grpc import TweetServicer, add_TweetServicer_to_server
 
 from src.models import Tweet
-from src.dependencies.db import SessionLocal
+from src.dependencies.config import Config
+from src.dependencies.db import SessionLocal, create_async_db_engine
+from src.dependencies.tweet_cache import (
+    tweet_cache,
+    tweet_row_dict,
+    with_pending_counts,
+)
+from src.grpc.ids import unpack_ids
+from src.partitions import id_time_bounds
 
 logger = logging.getLogger(__name__)
+config = Config()
+
+GRPC_ADDRESS = "[::]:50051"
+
+# "thread" serves RPCs on a thread pool; "aio" runs the asyncio servicer on an
+# event loop, with GRPC_MAX_WORKERS threads left for the sync handlers.
+GRPC_SERVER_MODE = config.get("GRPC_SERVER_MODE", "thread")
+GRPC_MAX_WORKERS = int(config.get("GRPC_MAX_WORKERS", "10"))
+# RPCs in flight before new ones fail with RESOURCE_EXHAUSTED; 0 for no limit.
+GRPC_MAX_CONCURRENT_RPCS = int(config.get("GRPC_MAX_CONCURRENT_RPCS", "0")) or None
+# Clients keep idle channels alive with pings this often; accept them
+# instead of answering with GOAWAY (too_many_pings).
+GRPC_KEEPALIVE_TIME_MS = int(config.get("GRPC_KEEPALIVE_TIME_MS", "30000"))
+GRPC_SERVER_OPTIONS = [
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.min_ping_interval_without_data_ms", GRPC_KEEPALIVE_TIME_MS // 2),
+]
 
 
 @contextmanager
@@ -25,36 +55,172 @@ def get_session() -> Generator[Session, None, None]:
         session.close()
 
 
+# Only the columns a TweetStruct needs, in tweet_row_dict order, read as
+# plain rows: no ORM instances, identity map or attribute instrumentation per
+# tweet. Ids are read as the strings the cache stores rather than parsed into
+# UUIDs and printed again.
+TWEET_COLUMNS = (
+    type_coerce(Tweet.id, UUIDType(as_uuid=False)).label("id"),
+    type_coerce(Tweet.user_id, UUIDType(as_uuid=False)).label("user_id"),
+    Tweet.content,
+    Tweet.num_likes,
+    Tweet.num_replys,
+    Tweet.num_reposts,
+    Tweet.created_at,
+)
+
+
+def tweets_by_id(tweet_ids: list[UUID], dialect: str):
+    """
+    Select TWEET_COLUMNS for tweet_ids, within the created_at range their
+    ids span so only those months' partitions are read.
+    """
+    stmt = select(*TWEET_COLUMNS).where(*id_time_bounds(Tweet.created_at, tweet_ids))
+    if dialect == "postgresql":
+        # One array parameter: the same SQL text, and so the same prepared
+        # statement and plan, for any number of ids.
+        ids = bindparam("tweet_ids", tweet_ids, type_=ARRAY(Tweet.id.type))
+        return stmt.where(Tweet.id == any_(ids))
+    return stmt.where(Tweet.id.in_(tweet_ids))
+
+
+def load_tweets(db: Session, tweet_ids: list[UUID]) -> dict:
+    """Cache entries (see tweet_dict) for the tweets in tweet_ids that exist."""
+    rows = db.execute(tweets_by_id(tweet_ids, db.get_bind().dialect.name))
+    return tweets_from_rows(rows, tweet_ids)
+
+
+async def aload_tweets(db: AsyncSession, tweet_ids: list[UUID]) -> dict:
+    """load_tweets on an async session."""
+    rows = await db.execute(tweets_by_id(tweet_ids, db.bind.dialect.name))
+    return tweets_from_rows(rows, tweet_ids)
+
+
+def tweets_from_rows(rows, tweet_ids: list[UUID]) -> dict:
+    by_str = {str(tweet_id): tweet_id for tweet_id in tweet_ids}
+    return {by_str[row[0]]: tweet_row_dict(row) for row in rows}
+
+
+def tweet_struct(
+    tweet: dict, packed: bool = False, tweet_id: Optional[UUID] = None
+) -> TweetStruct:
+    """TweetStruct for a cached tweet (see tweet_dict), with pending counts."""
+    tweet = with_pending_counts(tweet, tweet_id)
+    if packed:
+        ids = {
+            "id_bytes": (tweet_id or UUID(tweet["id"])).bytes,
+            "user_id_bytes": UUID(tweet["user_id"]).bytes,
+        }
+    else:
+        ids = {"id": tweet["id"], "user_id": tweet["user_id"]}
+
+    return TweetStruct(
+        **ids,
+        content=tweet["content"],
+        num_likes=tweet["num_likes"],
+        num_replys=tweet["num_replys"],
+        num_reposts=tweet["num_reposts"],
+        created_at=int(datetime.fromisoformat(tweet["created_at"]).timestamp()),
+    )
+
+
+def tweet_structs(tweets: dict, tweet_ids: list[UUID], packed: bool) -> list:
+    """TweetStructs in request order, skipping unknown and deleted ids."""
+    return [
+        tweet_struct(tweets[tweet_id], packed, tweet_id)
+        for tweet_id in dict.fromkeys(tweet_ids)
+        if tweets[tweet_id] is not None
+    ]
+
+
+def requested_tweet_ids(request) -> list[UUID]:
+    """The ids of a GetTweets request; raises ValueError for malformed ids."""
+    if request.packed_tweet_ids:
+        return unpack_ids(request.packed_tweet_ids)
+    return [UUID(tweet_id) for tweet_id in request.tweet_ids]
+
+
 class TweetService(TweetServicer):
     def GetTweets(self, request, context):
-        with get_session() as db:
-            tweet_ids = request.tweet_ids
+        try:
+            tweet_ids = requested_tweet_ids(request)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        if not tweet_ids:
+            return GetTweetsRes(tweets=[])
+
+        def load(missing: list[UUID]) -> dict:
+            with get_session() as db:
+                return load_tweets(db, missing)
+
+        tweets = tweet_cache.get_many(tweet_ids, load)
+        structs = tweet_structs(tweets, tweet_ids, request.packed)
+
+        logger.debug(f"GetTweets: returning {len(structs)} tweets")
+        return GetTweetsRes(tweets=structs)
+
 
-            if not tweet_ids:
-                return GetTweetsRes(tweets=[])
+class AsyncTweetService(TweetService):
+    """asyncio servicer for the grpc.aio server, backed by an async session."""
 
-            tweets = db.query(Tweet).filter(Tweet.id.in_(tweet_ids)).all()
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
 
-            tweet_structs = [
-                TweetStruct(
-                    id=str(tweet.id),
-                    user_id=str(tweet.user_id),
-                    content=tweet.content,
-                    num_likes=tweet.num_likes,
-                    num_replys=tweet.num_replys,
-                    num_reposts=tweet.num_reposts,
-                    created_at=int(tweet.created_at.timestamp()),
-                )
-                for tweet in tweets
-            ]
+    async def GetTweets(self, request, context):
+        try:
+            tweet_ids = requested_tweet_ids(request)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
 
-            logger.info(f"GetTweets: returning {len(tweet_structs)} tweets")
-            return GetTweetsRes(tweets=tweet_structs)
+        if not tweet_ids:
+            return GetTweetsRes(tweets=[])
+
+        async def load(missing: list[UUID]) -> dict:
+            async with self.session_factory() as db:
+                return await aload_tweets(db, missing)
+
+        tweets = await tweet_cache.aget_many(tweet_ids, load)
+        structs = tweet_structs(tweets, tweet_ids, request.packed)
+
+        logger.debug(f"GetTweets: returning {len(structs)} tweets")
+        return GetTweetsRes(tweets=structs)
 
 
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    if GRPC_SERVER_MODE == "aio":
+        asyncio.run(serve_aio())
+        return
+    if GRPC_SERVER_MODE != "thread":
+        raise ValueError(f"unknown GRPC_SERVER_MODE: {GRPC_SERVER_MODE}")
+
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=GRPC_MAX_WORKERS),
+        maximum_concurrent_rpcs=GRPC_MAX_CONCURRENT_RPCS,
+        options=GRPC_SERVER_OPTIONS,
+    )
     add_TweetServicer_to_server(TweetService(), server)
-    server.add_insecure_port("[::]:50051")
+    server.add_insecure_port(GRPC_ADDRESS)
     server.start()
     server.wait_for_termination()
+
+
+async def serve_aio():
+    # Runs on its own event loop (and thread), so it cannot share the
+    # async engine that FastAPI's loop uses.
+    engine = create_async_db_engine()
+    server = grpc.aio.server(
+        migration_thread_pool=futures.ThreadPoolExecutor(max_workers=GRPC_MAX_WORKERS),
+        maximum_concurrent_rpcs=GRPC_MAX_CONCURRENT_RPCS,
+        options=GRPC_SERVER_OPTIONS,
+    )
+    service = AsyncTweetService(
+        async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    )
+    add_TweetServicer_to_server(service, server)
+    server.add_insecure_port(GRPC_ADDRESS)
+    await server.start()
+    try:
+        await server.wait_for_termination()
+    finally:
+        await engine.dispose()
@@ -1,37 +1,96 @@
-from google.protobuf.internal import containers as _containers
-from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from collections.abc import Iterable as _Iterable, Mapping as _Mapping
-from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
-
-DESCRIPTOR: _descriptor.FileDescriptor
-
-class TweetStruct(_message.Message):
-    __slots__ = ("id", "user_id", "content", "num_likes", "num_replys", "num_reposts", "created_at")
-    ID_FIELD_NUMBER: _ClassVar[int]
-    USER_ID_FIELD_NUMBER: _ClassVar[int]
-    CONTENT_FIELD_NUMBER: _ClassVar[int]
-    NUM_LIKES_FIELD_NUMBER: _ClassVar[int]
-    NUM_REPLYS_FIELD_NUMBER: _ClassVar[int]
-    NUM_REPOSTS_FIELD_NUMBER: _ClassVar[int]
-    CREATED_AT_FIELD_NUMBER: _ClassVar[int]
-    id: str
-    user_id: str
-    content: str
-    num_likes: int
-    num_replys: int
-    num_reposts: int
-    created_at: int
-    def __init__(self, id: _Optional[str] = ..., user_id: _Optional[str] = ..., content: _Optional[str] = ..., num_likes: _Optional[int] = ..., num_replys: _Optional[int] = ..., num_reposts: _Optional[int] = ..., created_at: _Optional[int] = ...) -> None: ...
-
-class GetTweetsReq(_message.Message):
-    __slots__ = ("tweet_ids",)
-    TWEET_IDS_FIELD_NUMBER: _ClassVar[int]
-    tweet_ids: _containers.RepeatedScalarFieldContainer[str]
-    def __init__(self, tweet_ids: _Optional[_Iterable[str]] = ...) -> None: ...
-
-class GetTweetsRes(_message.Message):
-    __slots__ = ("tweets",)
-    TWEETS_FIELD_NUMBER: _ClassVar[int]
-    tweets: _containers.RepeatedCompositeFieldContainer[TweetStruct]
-    def __init__(self, tweets: _Optional[_Iterable[_Union[TweetStruct, _Mapping]]] = ...) -> None: ...
+"""
+@generated by mypy-protobuf.  Do not edit manually!
+isort:skip_file
+"""
+
+import builtins
+import collections.abc
+import google.protobuf.descriptor
+import google.protobuf.internal.containers
+import google.protobuf.message
+import typing
+
+DESCRIPTOR: google.protobuf.descriptor.FileDescriptor
+
+@typing.final
+class TweetStruct(google.protobuf.message.Message):
+    """Ids are 36-character UUID strings by default. Requests that set
+    `packed = true` get 16-byte big-endian UUIDs in the *_bytes fields
+    instead, and the matching string fields are left empty.
+    """
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    ID_FIELD_NUMBER: builtins.int
+    USER_ID_FIELD_NUMBER: builtins.int
+    CONTENT_FIELD_NUMBER: builtins.int
+    NUM_LIKES_FIELD_NUMBER: builtins.int
+    NUM_REPLYS_FIELD_NUMBER: builtins.int
+    NUM_REPOSTS_FIELD_NUMBER: builtins.int
+    CREATED_AT_FIELD_NUMBER: builtins.int
+    ID_BYTES_FIELD_NUMBER: builtins.int
+    USER_ID_BYTES_FIELD_NUMBER: builtins.int
+    id: builtins.str
+    user_id: builtins.str
+    content: builtins.str
+    num_likes: builtins.int
+    num_replys: builtins.int
+    num_reposts: builtins.int
+    created_at: builtins.int
+    id_bytes: builtins.bytes
+    user_id_bytes: builtins.bytes
+    def __init__(
+        self,
+        *,
+        id: builtins.str = ...,
+        user_id: builtins.str = ...,
+        content: builtins.str = ...,
+        num_likes: builtins.int = ...,
+        num_replys: builtins.int = ...,
+        num_reposts: builtins.int = ...,
+        created_at: builtins.int = ...,
+        id_bytes: builtins.bytes = ...,
+        user_id_bytes: builtins.bytes = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["content", b"content", "created_at", b"created_at", "id", b"id", "id_bytes", b"id_bytes", "num_likes", b"num_likes", "num_replys", b"num_replys", "num_reposts", b"num_reposts", "user_id", b"user_id", "user_id_bytes", b"user_id_bytes"]) -> None: ...
+
+global___TweetStruct = TweetStruct
+
+@typing.final
+class GetTweetsReq(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    TWEET_IDS_FIELD_NUMBER: builtins.int
+    PACKED_TWEET_IDS_FIELD_NUMBER: builtins.int
+    PACKED_FIELD_NUMBER: builtins.int
+    packed_tweet_ids: builtins.bytes
+    """Concatenated 16-byte ids, used instead of tweet_ids when set."""
+    packed: builtins.bool
+    @property
+    def tweet_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]: ...
+    def __init__(
+        self,
+        *,
+        tweet_ids: collections.abc.Iterable[builtins.str] | None = ...,
+        packed_tweet_ids: builtins.bytes = ...,
+        packed: builtins.bool = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["packed", b"packed", "packed_tweet_ids", b"packed_tweet_ids", "tweet_ids", b"tweet_ids"]) -> None: ...
+
+global___GetTweetsReq = GetTweetsReq
+
+@typing.final
+class GetTweetsRes(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    TWEETS_FIELD_NUMBER: builtins.int
+    @property
+    def tweets(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___TweetStruct]: ...
+    def __init__(
+        self,
+        *,
+        tweets: collections.abc.Iterable[global___TweetStruct] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["tweets", b"tweets"]) -> None: ...
+
+global___GetTweetsRes = GetTweetsRes
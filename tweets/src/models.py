@@ -1,5 +1,7 @@
 from sqlalchemy import (
     INT,
+    JSON,
+    BigInteger,
     Column,
     UUID,
     DateTime,
@@ -10,10 +12,18 @@ from sqlalchemy import (
     func,
 )
 
+from src.dependencies.counters import counter_buffer
 from src.dependencies.db import Base
+from src.partitions import id_time, stamped_id, utcnow, uuid7
 
 from uuid import uuid4
 
+# Monthly partitions on Postgres; see src.partitions.
+PARTITION_BY_CREATED_AT = {"postgresql_partition_by": "RANGE (created_at)"}
+PARTITION_BY_TWEET_CREATED_AT = {
+    "postgresql_partition_by": "RANGE (tweet_created_at)"
+}
+
 
 class Tweet(Base):
     __tablename__ = "tweets"
@@ -24,26 +34,32 @@ class Tweet(Base):
     num_likes = Column(INT, default=0)
     num_replys = Column(INT, default=0)
     num_reposts = Column(INT, default=0)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    # Part of the key: a partitioned table's keys must contain its
+    # partition key.
+    created_at = Column(DateTime, primary_key=True, default=func.now())
 
     __table_args__ = (
         Index("ix_tweets_user_id", "user_id"),
         Index("ix_tweets_created_at", "created_at"),
         Index("ix_tweets_user_created", "user_id", "created_at"),
+        PARTITION_BY_CREATED_AT,
     )
 
     def __init__(self, user_id, content) -> None:
         self.user_id = user_id
         self.content = content
+        self.id, self.created_at = stamped_id()
 
     def to_dict(self):
+        # Likes and reposts not yet flushed by the write-behind buffer.
+        counts = counter_buffer.counts(self)
         return {
             "id": str(self.id),
             "user_id": str(self.user_id),
             "content": self.content,
-            "num_likes": self.num_likes,
+            "num_likes": counts["num_likes"],
             "num_replys": self.num_replys,
-            "num_reposts": self.num_reposts,
+            "num_reposts": counts["num_reposts"],
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
 
@@ -82,18 +98,22 @@ class ReplyTweet(Base):
     num_likes = Column(INT, default=0)
     num_replys = Column(INT, default=0)
     num_reposts = Column(INT, default=0)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    created_at = Column(DateTime, primary_key=True, default=func.now())
 
     __table_args__ = (
         Index("ix_reply_tweets_parent_id", "parent_id"),
+        Index("ix_reply_tweets_parent_created", "parent_id", "created_at", "id"),
         Index("ix_reply_tweets_user_id", "user_id"),
         Index("ix_reply_tweets_created_at", "created_at"),
+        Index("ix_reply_tweets_user_created", "user_id", "created_at", "id"),
+        PARTITION_BY_CREATED_AT,
     )
 
     def __init__(self, user_id, parent_id, content) -> None:
         self.user_id = user_id
         self.parent_id = parent_id
         self.content = content
+        self.id, self.created_at = stamped_id()
 
     def to_dict(self):
         return {
@@ -126,17 +146,30 @@ class TweetLike(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(UUID(as_uuid=True), nullable=False)
     tweet_id = Column(UUID(as_uuid=True), nullable=False)
+    # The liked tweet's created_at, which partitions the table.
+    tweet_created_at = Column(DateTime, primary_key=True)
     created_at = Column(DateTime, default=func.now(), nullable=False)
 
     __table_args__ = (
-        UniqueConstraint("user_id", "tweet_id", name="unique_like"),
+        # Same as unique (user_id, tweet_id): a tweet has one created_at.
+        UniqueConstraint(
+            "user_id", "tweet_id", "tweet_created_at", name="unique_like"
+        ),
         Index("ix_tweet_like_user_id", "user_id"),
         Index("ix_tweet_like_tweet_id", "tweet_id"),
+        Index("ix_tweet_like_user_created", "user_id", "created_at", "id"),
+        PARTITION_BY_TWEET_CREATED_AT,
     )
 
-    def __init__(self, user_id, tweet_id) -> None:
+    def __init__(self, user_id, tweet_id, tweet_created_at=None) -> None:
         self.user_id = user_id
         self.tweet_id = tweet_id
+        # Left to the id's time when not given; exact for UUIDv7 tweet ids.
+        self.tweet_created_at = tweet_created_at or id_time(tweet_id)
+        # Stamped with the partition key rather than the row's own time, so
+        # lookups by id can be pruned to one partition.
+        self.id = uuid7(self.tweet_created_at)
+        self.created_at = utcnow()
 
     def to_dict(self):
         return {
@@ -153,17 +186,30 @@ class TweetRepost(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(UUID(as_uuid=True), nullable=False)
     tweet_id = Column(UUID(as_uuid=True), nullable=False)
+    # The reposted tweet's created_at, which partitions the table.
+    tweet_created_at = Column(DateTime, primary_key=True)
     created_at = Column(DateTime, default=func.now(), nullable=False)
 
     __table_args__ = (
-        UniqueConstraint("user_id", "tweet_id", name="unique_repost"),
+        # Same as unique (user_id, tweet_id): a tweet has one created_at.
+        UniqueConstraint(
+            "user_id", "tweet_id", "tweet_created_at", name="unique_repost"
+        ),
         Index("ix_tweet_repost_user_id", "user_id"),
         Index("ix_tweet_repost_tweet_id", "tweet_id"),
+        Index("ix_tweet_repost_user_created", "user_id", "created_at", "id"),
+        PARTITION_BY_TWEET_CREATED_AT,
     )
 
-    def __init__(self, user_id, tweet_id) -> None:
+    def __init__(self, user_id, tweet_id, tweet_created_at=None) -> None:
         self.user_id = user_id
         self.tweet_id = tweet_id
+        # Left to the id's time when not given; exact for UUIDv7 tweet ids.
+        self.tweet_created_at = tweet_created_at or id_time(tweet_id)
+        # Stamped with the partition key rather than the row's own time, so
+        # lookups by id can be pruned to one partition.
+        self.id = uuid7(self.tweet_created_at)
+        self.created_at = utcnow()
 
     def to_dict(self):
         return {
@@ -172,3 +218,21 @@ class TweetRepost(Base):
             "tweet_id": str(self.tweet_id),
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+
+
+class OutboxEvent(Base):
+    """A message staged in the writer's transaction, sent later by the relay."""
+
+    __tablename__ = "outbox"
+
+    # BIGINT identity on Postgres; SQLite only autoincrements INTEGER keys.
+    id = Column(BigInteger().with_variant(INT, "sqlite"), primary_key=True)
+    queue = Column(String, nullable=False)
+    routing_key = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+
+    def __init__(self, payload, queue, routing_key) -> None:
+        self.payload = payload
+        self.queue = queue
+        self.routing_key = routing_key
@@ -0,0 +1,148 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from src.dependencies.config import config
+from src.dependencies.mq import MQ_CONFIRM_TIMEOUT, Publisher, publisher
+from src.models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(config.get("OUTBOX_BATCH_SIZE", "200"))
+# Seconds between polls when no local write has woken the relay.
+OUTBOX_POLL_INTERVAL = float(config.get("OUTBOX_POLL_INTERVAL", "0.5"))
+
+
+def enqueue_event(db, payload: dict, queue: str, routing_key: str = ""):
+    """
+    Stage a message in the caller's transaction. It reaches RabbitMQ only
+    if that transaction commits. Works with sync and async sessions.
+    """
+    db.add(OutboxEvent(payload, queue, routing_key or queue))
+
+
+class OutboxRelay:
+    """
+    Moves committed outbox rows to RabbitMQ.
+
+    Each pass claims up to `batch_size` of the oldest rows with
+    SELECT ... FOR UPDATE SKIP LOCKED (so several replicas can relay at
+    once without sending the same row twice), publishes them through the
+    confirm-mode publisher and deletes the rows the broker acknowledged,
+    all in one transaction. Unconfirmed rows stay for the next pass, so
+    delivery is at-least-once and ordering is only per relay batch.
+
+    The relay polls every `interval` seconds and right away after wake(),
+    which routes call once their transaction has committed.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        publisher: Publisher = publisher,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        interval: float = OUTBOX_POLL_INTERVAL,
+        confirm_timeout: float = MQ_CONFIRM_TIMEOUT,
+    ) -> None:
+        self.session_factory = session_factory
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.interval = interval
+        self.confirm_timeout = confirm_timeout
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def relay_once(self) -> int:
+        """Relay one batch. Returns the number of rows sent and deleted."""
+        db = self._session()
+        try:
+            events = (
+                db.execute(
+                    select(OutboxEvent)
+                    .order_by(OutboxEvent.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                .scalars()
+                .all()
+            )
+            if not events:
+                db.rollback()
+                return 0
+
+            pending = [
+                (
+                    event.id,
+                    self.publisher.publish(
+                        event.payload, event.queue, event.routing_key
+                    ),
+                )
+                for event in events
+            ]
+
+            deadline = time.monotonic() + self.confirm_timeout
+            sent = []
+            for event_id, future in pending:
+                try:
+                    future.result(timeout=max(0.0, deadline - time.monotonic()))
+                    sent.append(event_id)
+                except Exception as e:
+                    logger.error(
+                        f"Outbox event {event_id} not confirmed, will retry: {e}"
+                    )
+
+            if sent:
+                db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(sent)))
+            db.commit()
+            return len(sent)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def wake(self):
+        """Relay now instead of at the next poll."""
+        self._wake.set()
+
+    def _session(self) -> Session:
+        if self.session_factory is None:
+            from src.dependencies.db import SessionLocal
+
+            return SessionLocal()
+        return self.session_factory()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self.relay_once() >= self.batch_size:
+                    continue  # more rows are probably waiting
+            except Exception as e:
+                logger.error(f"Error relaying outbox: {e}")
+
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop relaying after the current batch."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+outbox_relay = OutboxRelay()
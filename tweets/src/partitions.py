@@ -0,0 +1,396 @@
+"""
+Monthly range partitions and time-ordered ids.
+
+On Postgres, tweets and reply_tweets are partitioned by created_at, and
+tweet_like and tweet_repost by tweet_created_at (the liked tweet's
+created_at), one partition per calendar month named <table>_pYYYYMM.
+Partitioning the engagement tables by their tweet keeps the one-like-per-
+user unique keys valid (a unique key must contain the partition key, and a
+tweet has exactly one created_at) and keeps a month of tweets and their
+likes in partitions that are detached together.
+
+New ids are UUIDv7: the first 48 bits are the Unix time in milliseconds of
+the row's partition key (created_at for tweets and replies, tweet_created_at
+for likes and reposts), which is kept to the millisecond so id_time() reads
+it back exactly. A lookup by id can then add a range on the partition key
+that lets the planner skip every other partition. Ids from before
+partitioning (UUIDv4) carry no time and are looked up in all partitions.
+
+Tables created before partitioning are plain tables, which take no
+partitions; init_db refuses to start on them until migrate_partitions.py
+(migrate_unpartitioned) has moved their rows into partitioned tables.
+"""
+
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import Engine, text
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from src.dependencies.config import config
+
+logger = logging.getLogger(__name__)
+
+# Months of partitions kept ready past the current one.
+TWEET_PARTITION_MONTHS_AHEAD = int(config.get("TWEET_PARTITION_MONTHS_AHEAD", "3"))
+# Whole months kept attached before the current one; 0 keeps everything.
+TWEET_RETENTION_MONTHS = int(config.get("TWEET_RETENTION_MONTHS", "0"))
+# Seconds between partition maintenance runs.
+TWEET_PARTITION_CHECK_INTERVAL = float(
+    config.get("TWEET_PARTITION_CHECK_INTERVAL", "3600")
+)
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MS = timedelta(milliseconds=1)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def uuid7(at: Optional[datetime] = None) -> UUID:
+    """A random UUIDv7 stamped with `at` (naive UTC, default now)."""
+    ms = ((at or utcnow()) - EPOCH) // ONE_MS
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (ms & (1 << 48) - 1) << 80
+    value |= 0x7 << 76 | (rand >> 62 & 0xFFF) << 64
+    value |= 0b10 << 62 | rand & (1 << 62) - 1
+    return UUID(int=value)
+
+
+def to_ms(at: datetime) -> datetime:
+    return at.replace(microsecond=at.microsecond // 1000 * 1000)
+
+
+def stamped_id() -> tuple[UUID, datetime]:
+    """A new id and the created_at it encodes."""
+    now = to_ms(utcnow())
+    return uuid7(now), now
+
+
+def id_time(id) -> Optional[datetime]:
+    """The millisecond a UUIDv7 was stamped with, or None for other ids."""
+    if not isinstance(id, UUID) or id.version != 7:
+        return None
+    return EPOCH + timedelta(milliseconds=id.int >> 80)
+
+
+def matches_id_time(id: UUID, created_at: datetime) -> bool:
+    """Whether id is unstamped or stamped with created_at."""
+    stamped = id_time(id)
+    return stamped is None or stamped == created_at
+
+
+def id_time_bounds(column, ids: Iterable) -> list:
+    """
+    created_at range conditions covering the rows with `ids`, for pruning
+    partitions, or [] unless every id carries a time.
+    """
+    times = [id_time(id) for id in ids]
+    if not times or None in times:
+        return []
+    return [column >= min(times), column < max(times) + ONE_MS]
+
+
+def month_start(at: datetime) -> datetime:
+    return datetime(at.year, at.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return datetime(year, month_index + 1, 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def partition_month(table: str, name: str) -> Optional[datetime]:
+    """The month a partition of table covers, or None if not one of ours."""
+    match = re.fullmatch(rf"{re.escape(table)}_p(\d{{4}})(\d{{2}})", name)
+    if match is None:
+        return None
+    return datetime(int(match[1]), int(match[2]), 1)
+
+
+def partition_ddl(table: str, month: datetime) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} FOR VALUES "
+        f"FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    )
+
+
+def partitioned_tables() -> list[str]:
+    """The tables declared with postgresql_partition_by."""
+    import src.models  # noqa: F401
+    from src.dependencies.db import Base
+
+    return [
+        table.name
+        for table in Base.metadata.sorted_tables
+        if table.dialect_options["postgresql"].get("partition_by")
+    ]
+
+
+PARTITIONS_QUERY = text(
+    "SELECT child.relname FROM pg_inherits "
+    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    "WHERE parent.relname = :table"
+)
+
+
+UNPARTITIONED_QUERY = text(
+    "SELECT relname FROM pg_class "
+    "WHERE relkind = 'r' AND relname = ANY(:tables) AND pg_table_is_visible(oid)"
+)
+
+
+def unpartitioned_tables(conn) -> list[str]:
+    """
+    The partitioned tables that exist as plain tables, i.e. were created
+    before partitioning and need migrate_unpartitioned(). [] off Postgres.
+    """
+    if conn.dialect.name != "postgresql":
+        return []
+    tables = partitioned_tables()
+    found = set(conn.execute(UNPARTITIONED_QUERY, {"tables": tables}).scalars())
+    return [table for table in tables if table in found]
+
+
+class PartitionMaintainer:
+    """
+    Keeps the monthly partitions of the partitioned tables in step with time.
+
+    Every `interval` seconds it creates the partitions for the current
+    month and `months_ahead` more, so writes never land outside one, and
+    when `retention_months` is set detaches (DETACH PARTITION CONCURRENTLY)
+    every partition that ends before the first retained month. Detached
+    partitions stay in the database as plain tables; listeners added with
+    add_detach_listener are called with (table, partition) to archive or
+    drop them. Does nothing on databases other than Postgres.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        months_ahead: int = TWEET_PARTITION_MONTHS_AHEAD,
+        retention_months: int = TWEET_RETENTION_MONTHS,
+        interval: float = TWEET_PARTITION_CHECK_INTERVAL,
+    ) -> None:
+        self.engine = engine
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.interval = interval
+
+        # Months known to have all their partitions.
+        self._ready: set[datetime] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._detach_listeners: list[Callable[[str, str], None]] = []
+
+    def add_detach_listener(self, listener: Callable[[str, str], None]):
+        """Call listener with (table, partition) after each detach."""
+        self._detach_listeners.append(listener)
+
+    def _engine(self) -> Engine:
+        if self.engine is None:
+            from src.dependencies.db import engine
+
+            return engine
+        return self.engine
+
+    def upcoming_months(self, now: Optional[datetime] = None) -> list[datetime]:
+        current = month_start(now or utcnow())
+        return [add_months(current, i) for i in range(self.months_ahead + 1)]
+
+    def retention_cutoff(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """The first month kept attached, or None if nothing expires."""
+        if self.retention_months <= 0:
+            return None
+        return add_months(month_start(now or utcnow()), -self.retention_months)
+
+    def ensure(
+        self, months: Iterable[datetime], engine: Optional[Engine] = None
+    ) -> list[str]:
+        """
+        Create any missing partitions for the months of the datetimes
+        given. Returns the partitions checked; months already ensured by
+        this process are skipped.
+        """
+        engine = engine or self._engine()
+        if engine.dialect.name != "postgresql":
+            return []
+
+        months = {month_start(month) for month in months}
+        with self._lock:
+            months -= self._ready
+        if not months:
+            return []
+
+        tables = partitioned_tables()
+        names = []
+        with engine.begin() as conn:
+            for month in sorted(months):
+                for table in tables:
+                    conn.execute(text(partition_ddl(table, month)))
+                    names.append(partition_name(table, month))
+        with self._lock:
+            self._ready |= months
+        return names
+
+    def detach_expired(self, now: Optional[datetime] = None) -> list[str]:
+        """Detach the partitions past retention. Returns their names."""
+        cutoff = self.retention_cutoff(now)
+        engine = self._engine()
+        if cutoff is None or engine.dialect.name != "postgresql":
+            return []
+
+        detached = []
+        # DETACH ... CONCURRENTLY cannot run inside a transaction block.
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table in partitioned_tables():
+                for name in conn.execute(PARTITIONS_QUERY, {"table": table}).scalars():
+                    month = partition_month(table, name)
+                    if month is None or add_months(month, 1) > cutoff:
+                        continue
+                    detach = f"ALTER TABLE {table} DETACH PARTITION {name} CONCURRENTLY"
+                    conn.execute(text(detach))
+                    logger.info(f"Detached partition {name} of {table}")
+                    detached.append(name)
+                    with self._lock:
+                        self._ready.discard(month)
+                    for listener in self._detach_listeners:
+                        try:
+                            listener(table, name)
+                        except Exception as e:
+                            logger.error(f"Partition detach listener failed: {e}")
+        return detached
+
+    def maintain(self, now: Optional[datetime] = None) -> dict:
+        """Create upcoming partitions, then detach expired ones."""
+        return {
+            "created": self.ensure(self.upcoming_months(now)),
+            "detached": self.detach_expired(now),
+        }
+
+    def _run(self):
+        while True:
+            try:
+                self.maintain()
+            except Exception as e:
+                logger.error(f"Error maintaining partitions: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+partition_maintainer = PartitionMaintainer()
+
+
+
+# Suffix of the plain tables, and their indexes, that migrate_unpartitioned
+# moves out of the way.
+LEGACY_SUFFIX = "_legacy"
+
+INDEXES_QUERY = text(
+    "SELECT indexname FROM pg_indexes "
+    "WHERE tablename = :table AND schemaname = current_schema()"
+)
+
+
+def migrate_unpartitioned(
+    engine: Engine, drop_legacy: bool = False, now: Optional[datetime] = None
+) -> dict:
+    """
+    Move the rows of tables created before partitioning into partitioned
+    tables, in one transaction. Each plain table is renamed to
+    <table>_legacy along with its indexes and constraints, the partitioned
+    table is created with a partition for every month its rows span, and
+    the rows are copied across. Likes and reposts take tweet_created_at
+    from their tweet; those of tweets that no longer exist stay behind.
+    With drop_legacy, legacy tables that were copied in full are dropped.
+
+    Returns {table: {"copied": n, "left": n}} for the tables migrated.
+    """
+    from src.dependencies.db import Base
+
+    result = {}
+    with engine.begin() as conn:
+        legacy = unpartitioned_tables(conn)
+        if not legacy:
+            return result
+
+        tables = [Base.metadata.tables[name] for name in legacy]
+        for table in tables:
+            indexes = conn.execute(INDEXES_QUERY, {"table": table.name})
+            for index in indexes.scalars().all():
+                conn.execute(
+                    text(f"ALTER INDEX {index} RENAME TO {index}{LEGACY_SUFFIX}")
+                )
+            conn.execute(
+                text(f"ALTER TABLE {table.name} RENAME TO {table.name}{LEGACY_SUFFIX}")
+            )
+            conn.execute(CreateTable(table))
+            for index in table.indexes:
+                conn.execute(CreateIndex(index))
+
+        # Likes and reposts share the month of the tweet they belong to.
+        months = set(partition_maintainer.upcoming_months(now))
+        for name in ("tweets", "reply_tweets"):
+            source = f"{name}{LEGACY_SUFFIX}" if name in legacy else name
+            query = f"SELECT DISTINCT date_trunc('month', created_at) FROM {source}"
+            months.update(conn.execute(text(query)).scalars())
+        for month in sorted(months):
+            for name in partitioned_tables():
+                conn.execute(text(partition_ddl(name, month)))
+
+        # Tweets first, as likes and reposts read tweet_created_at from them.
+        for table in sorted(tables, key=lambda table: "tweet_created_at" in table.c):
+            copied, total = _copy_legacy_rows(conn, table)
+            result[table.name] = {"copied": copied, "left": total - copied}
+            logger.info(f"Copied {copied} of {total} rows into {table.name}")
+            if drop_legacy and copied == total:
+                conn.execute(text(f"DROP TABLE {table.name}{LEGACY_SUFFIX}"))
+    return result
+
+
+def _copy_legacy_rows(conn, table) -> tuple[int, int]:
+    """Copy <table>_legacy into table. Returns (rows copied, rows there were)."""
+    legacy = f"{table.name}{LEGACY_SUFFIX}"
+    columns = [column.name for column in table.c]
+    if "tweet_created_at" in columns:
+        selected = [
+            "tweets.created_at" if name == "tweet_created_at" else f"old.{name}"
+            for name in columns
+        ]
+        source = f"{legacy} old JOIN tweets ON tweets.id = old.tweet_id"
+    else:
+        selected, source = columns, legacy
+    copied = conn.execute(
+        text(
+            f"INSERT INTO {table.name} ({', '.join(columns)}) "
+            f"SELECT {', '.join(selected)} FROM {source}"
+        )
+    ).rowcount
+    total = conn.execute(text(f"SELECT count(*) FROM {legacy}")).scalar()
+    return copied, total
@@ -1,15 +1,46 @@
+import json
 import logging
+from typing import AsyncIterator, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-
-from src.dependencies.mq import produce_message
-from src.dependencies.db import get_db
-from src.dependencies.auth import UserToken, VerifyToken
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from src.dependencies.db import get_async_db, get_db
+from src.dependencies.auth import UserToken, VerifyAdminToken, VerifyToken
+from src.dependencies.counters import counter_buffer, counter_deltas
+from src.dependencies.tweet_cache import (
+    TweetCache,
+    get_tweet_cache,
+    tweet_cache,
+    tweet_dict,
+    with_pending_counts,
+)
 from src.models import Tweet, TweetRepost, ReplyTweet, TweetLike
-from src.grpc.client import IncrementTweets
+from src.outbox import enqueue_event, outbox_relay
+from src.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    async_keyset_page,
+    keyset_page,
+)
+from src.partitions import id_time_bounds
 from src.schemas import CreateReplyRequest, CreateTweetRequest
+from src.threads import (
+    DEFAULT_THREAD_DEPTH,
+    DEFAULT_THREAD_FAN_OUT,
+    DEFAULT_THREAD_PAGE_SIZE,
+    MAX_THREAD_DEPTH,
+    MAX_THREAD_FAN_OUT,
+    MAX_THREAD_PAGE_SIZE,
+    load_thread,
+    reply_page,
+)
+from src.tweet_import import TweetImporter
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -21,63 +52,152 @@ def health_check():
     return {"status": "healthy", "service": "tweets-service"}
 
 
+@router.get("/metrics/cache")
+def cache_metrics(tweets: TweetCache = Depends(get_tweet_cache)):
+    """Hit ratio of each level of the tweet cache."""
+    return {"tweet_cache": tweets.stats()}
+
+
 @router.post("/tweet")
-def createTweet(
+async def createTweet(
     req: CreateTweetRequest,
     user: UserToken = Depends(VerifyToken),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    tweet = Tweet(user.id, req.content)
+    tweet = Tweet(UUID(user.id), req.content)
 
     try:
         db.add(tweet)
-        db.commit()
-        db.refresh(tweet)
+        # Flush first so the events carry the generated id and created_at.
+        await db.flush()
+        await db.refresh(tweet)
+        tweet_dict = tweet.to_dict()
+
+        # Feed and search events commit with the tweet; the relay sends them.
+        enqueue_event(db, tweet_dict, "general_tweets")
+        enqueue_event(db, tweet_dict, "tweet_events", "tweet.create")
+        await db.commit()
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error creating tweet: {e}")
         raise HTTPException(status_code=500, detail="database error")
 
-    IncrementTweets(user.id)
+    outbox_relay.wake()
+    counter_deltas.add(user.id, 1)
+    return {"message": "tweet created"}
 
-    produce_message(tweet.to_dict(), "general_tweets")  # Produce to tweet feed queue
 
-    produce_message(  # Produce to the tweet event queue
-        tweet.to_dict(), "tweet_events", "tweet.create"
-    )
-    return {"message": "tweet created"}
+async def iter_ndjson(request: Request) -> AsyncIterator:
+    """Yield one parsed object per line of a streamed NDJSON body."""
+    buffer = b""
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _parse_line(line)
+    if buffer.strip():
+        yield _parse_line(buffer)
 
 
-@router.get("/tweet")
-def getTweets(
-    user: UserToken = Depends(VerifyToken),
-    db: Session = Depends(get_db),
-):
-    tweets = db.query(Tweet).filter_by(user_id=user.id).all()
+def _parse_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
 
-    if not tweets:
-        raise HTTPException(status_code=404, detail="Invalid Request")
 
-    res = [tweet.to_dict() for tweet in tweets]
+@router.post("/tweets/bulk", dependencies=[Depends(VerifyAdminToken)])
+async def bulkCreateTweets(request: Request, db: Session = Depends(get_db)):
+    """
+    Import tweets in bulk.
 
-    return {"result": res}
+    Accepts a JSON list of {"user_id", "content"} objects (with optional
+    "id" and "created_at"; optionally wrapped as {"tweets": [...]}) or, with
+    Content-Type application/x-ndjson, one such object per line streamed in
+    chunks.
+    """
+    importer = TweetImporter(db)
 
+    try:
+        if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+            chunk = []
+            async for tweet in iter_ndjson(request):
+                chunk.append(tweet)
+                if len(chunk) >= importer.chunk_size:
+                    await run_in_threadpool(importer.insert_chunk, chunk)
+                    outbox_relay.wake()
+                    chunk = []
+            await run_in_threadpool(importer.insert_chunk, chunk)
+        else:
+            try:
+                body = await request.json()
+            except ValueError:
+                raise HTTPException(status_code=400, detail="invalid json")
+
+            tweets = body.get("tweets") if isinstance(body, dict) else body
+            if not isinstance(tweets, list):
+                raise HTTPException(status_code=400, detail="expected a list of tweets")
+
+            await run_in_threadpool(importer.import_tweets, tweets)
+
+        result = await run_in_threadpool(importer.finish)
+    except SQLAlchemyError as e:
+        logger.error(f"Database error importing tweets: {e}")
+        # Committed chunks stay; re-running an import with tweet ids skips them.
+        raise HTTPException(status_code=500, detail="database error")
+    finally:
+        outbox_relay.wake()
 
-@router.get("/tweet/{tweet_id}")
-def getTweetByID(
-    tweet_id: str,
-    db: Session = Depends(get_db),
-):
-    tweet = db.query(Tweet).filter_by(id=tweet_id).first()
+    return {"result": result}
 
-    if not tweet:
-        raise HTTPException(status_code=404, detail="invalid request")
 
-    replyTweets = db.query(ReplyTweet).filter_by(parent_id=tweet.id).all()
+def page_response(rows: list, next_cursor: Optional[str], detail: str) -> dict:
+    if not rows:
+        raise HTTPException(status_code=404, detail=detail)
 
-    replyTweetsRes = [t.to_dict() for t in replyTweets]
+    return {"result": [row.to_dict() for row in rows], "next_cursor": next_cursor}
 
-    return {"tweet": tweet.to_dict(), "replys": replyTweetsRes}
+
+def user_page(db: Session, model, user_id: str, limit: int, cursor: Optional[str]):
+    """One newest-first page of `model` rows owned by user_id."""
+    try:
+        return keyset_page(
+            db.query(model).filter(model.user_id == UUID(user_id)),
+            model.created_at,
+            model.id,
+            limit,
+            cursor,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+def by_id(query, model, id: UUID):
+    """Filter query to the row with id, in the partition its id points to."""
+    return query.filter(model.id == id, *id_time_bounds(model.created_at, [id]))
+
+
+@router.get("/tweet")
+async def getTweets(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: UserToken = Depends(VerifyToken),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        tweets, next_cursor = await async_keyset_page(
+            db,
+            select(Tweet).where(Tweet.user_id == UUID(user.id)),
+            Tweet.created_at,
+            Tweet.id,
+            limit,
+            cursor,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+    return page_response(tweets, next_cursor, "Invalid Request")
 
 
 @router.delete("/tweet/{tweet_id}")
@@ -86,7 +206,10 @@ def deleteTweet(
     user: UserToken = Depends(VerifyToken),
     db: Session = Depends(get_db),
 ):
-    tweet = db.query(Tweet).filter_by(id=tweet_id).first()
+    try:
+        tweet = by_id(db.query(Tweet), Tweet, UUID(tweet_id)).first()
+    except ValueError:
+        tweet = None
 
     if not tweet:
         raise HTTPException(status_code=404, detail="invalid request")
@@ -102,6 +225,8 @@ def deleteTweet(
         logger.error(f"Error deleting tweet: {e}")
         raise HTTPException(status_code=500, detail="database error")
 
+    tweet_cache.mark_deleted(tweet.id)
+    counter_deltas.add(user.id, -1)
     return {"message": "tweet deleted"}
 
 
@@ -121,23 +246,20 @@ def createTweetReply(
         logger.error(f"Error creating reply: {e}")
         raise HTTPException(status_code=500, detail="database error")
 
-    IncrementTweets(user.id)
+    counter_deltas.add(user.id, 1)
     return {"message": "tweet created"}
 
 
 @router.get("/tweet/reply")
 def getTweetReplys(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     user: UserToken = Depends(VerifyToken),
     db: Session = Depends(get_db),
 ):
-    tweets = db.query(ReplyTweet).filter_by(user_id=user.id).all()
-
-    if not tweets:
-        raise HTTPException(status_code=404, detail="invalid request")
-
-    res = [tweet.to_dict() for tweet in tweets]
+    tweets, next_cursor = user_page(db, ReplyTweet, user.id, limit, cursor)
 
-    return {"result": res}
+    return page_response(tweets, next_cursor, "invalid request")
 
 
 @router.delete("/tweet/reply/{tweet_id}")
@@ -146,7 +268,10 @@ def deleteTweetReply(
     user: UserToken = Depends(VerifyToken),
     db: Session = Depends(get_db),
 ):
-    tweet = db.query(ReplyTweet).filter_by(id=tweet_id).first()
+    try:
+        tweet = by_id(db.query(ReplyTweet), ReplyTweet, UUID(tweet_id)).first()
+    except ValueError:
+        tweet = None
 
     if not tweet:
         raise HTTPException(status_code=404, detail="invalid request")
@@ -162,47 +287,60 @@ def deleteTweetReply(
         logger.error(f"Error deleting reply: {e}")
         raise HTTPException(status_code=500, detail="database error")
 
+    counter_deltas.add(user.id, -1)
     return {"message": "tweet deleted"}
 
 
+def existing_tweet(db: Session, tweet_id: str):
+    """The id and created_at of an existing tweet, or a 404."""
+    try:
+        tweet = by_id(
+            db.query(Tweet.id, Tweet.created_at), Tweet, UUID(tweet_id)
+        ).first()
+    except ValueError:
+        tweet = None
+
+    if not tweet:
+        raise HTTPException(status_code=404, detail="invalid request")
+    return tweet
+
+
 @router.post("/tweet/like/{tweet_id}")
 def createLike(
     tweet_id: str,
     user: UserToken = Depends(VerifyToken),
     db: Session = Depends(get_db),
 ):
-    tweet: Tweet = db.query(Tweet).filter_by(id=tweet_id).first()
-
-    if not tweet:
-        raise HTTPException(status_code=404, detail="invalid request")
+    tweet = existing_tweet(db, tweet_id)
 
-    like = TweetLike(user.id, tweet_id)
-    tweet.increment_likes()
+    like = TweetLike(UUID(user.id), tweet.id, tweet.created_at)
 
     try:
         db.add(like)
         db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="already liked")
     except SQLAlchemyError as e:
         db.rollback()
         logger.error(f"Error creating like: {e}")
         raise HTTPException(status_code=500, detail="database error")
 
+    # The tweets row is updated by the write-behind buffer, not here.
+    counter_buffer.add(tweet.id, "num_likes", 1)
     return {"message": "like created"}
 
 
 @router.get("/tweet/like")
 def getLikes(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     user: UserToken = Depends(VerifyToken),
     db: Session = Depends(get_db),
 ):
-    likes = db.query(TweetLike).filter_by(user_id=user.id).all()
-
-    if not likes:
-        raise HTTPException(status_code=404, detail="invalid request")
+    likes, next_cursor = user_page(db, TweetLike, user.id, limit, cursor)
 
-    res = [like.to_dict() for like in likes]
-
-    return {"result": res}
+    return page_response(likes, next_cursor, "invalid request")
 
 
 @router.delete("/tweet/like/{tweet_id}")
@@ -211,7 +349,19 @@ def deleteLike(
     user: UserToken = Depends(VerifyToken),
     db: Session = Depends(get_db),
 ):
-    like = db.query(TweetLike).filter_by(id=tweet_id).first()
+    try:
+        like_id = UUID(tweet_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="invalid request")
+
+    like = (
+        db.query(TweetLike)
+        .filter(
+            TweetLike.id == like_id,
+            *id_time_bounds(TweetLike.tweet_created_at, [like_id]),
+        )
+        .first()
+    )
 
     if not like:
         raise HTTPException(status_code=404, detail="invalid request")
@@ -219,10 +369,6 @@ def deleteLike(
     if str(like.user_id) != user.id:
         raise HTTPException(status_code=403, detail="unauthorized")
 
-    tweet = db.query(Tweet).filter_by(id=like.tweet_id).first()
-    if tweet:
-        tweet.decrement_likes(1)
-
     try:
         db.delete(like)
         db.commit()
@@ -231,6 +377,7 @@ def deleteLike(
         logger.error(f"Error deleting like: {e}")
         raise HTTPException(status_code=500, detail="database error")
 
+    counter_buffer.add(like.tweet_id, "num_likes", -1)
     return {"message": "like deleted"}
 
 
@@ -240,38 +387,36 @@ def createRepost(
     user: UserToken = Depends(VerifyToken),
     db: Session = Depends(get_db),
 ):
-    tweet: Tweet = db.query(Tweet).filter_by(id=tweet_id).first()
-
-    if not tweet:
-        raise HTTPException(status_code=404, detail="invalid request")
+    tweet = existing_tweet(db, tweet_id)
 
-    repost = TweetRepost(user.id, tweet_id)
-    tweet.increment_reposts()
+    repost = TweetRepost(UUID(user.id), tweet.id, tweet.created_at)
 
     try:
         db.add(repost)
         db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="already reposted")
     except SQLAlchemyError as e:
         db.rollback()
         logger.error(f"Error creating repost: {e}")
         raise HTTPException(status_code=500, detail="database error")
 
+    # The tweets row is updated by the write-behind buffer, not here.
+    counter_buffer.add(tweet.id, "num_reposts", 1)
     return {"message": "repost created"}
 
 
 @router.get("/tweet/repost")
 def getReposts(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     user: UserToken = Depends(VerifyToken),
     db: Session = Depends(get_db),
 ):
-    reposts = db.query(TweetRepost).filter_by(user_id=user.id).all()
-
-    if not reposts:
-        raise HTTPException(status_code=404, detail="invalid request")
+    reposts, next_cursor = user_page(db, TweetRepost, user.id, limit, cursor)
 
-    res = [repost.to_dict() for repost in reposts]
-
-    return {"result": res}
+    return page_response(reposts, next_cursor, "invalid request")
 
 
 @router.delete("/tweet/repost/{tweet_id}")
@@ -280,7 +425,19 @@ def deleteRepost(
     user: UserToken = Depends(VerifyToken),
     db: Session = Depends(get_db),
 ):
-    repost = db.query(TweetRepost).filter_by(id=tweet_id).first()
+    try:
+        repost_id = UUID(tweet_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="invalid request")
+
+    repost = (
+        db.query(TweetRepost)
+        .filter(
+            TweetRepost.id == repost_id,
+            *id_time_bounds(TweetRepost.tweet_created_at, [repost_id]),
+        )
+        .first()
+    )
 
     if not repost:
         raise HTTPException(status_code=404, detail="invalid request")
@@ -288,10 +445,6 @@ def deleteRepost(
     if str(repost.user_id) != user.id:
         raise HTTPException(status_code=403, detail="unauthorized")
 
-    tweet = db.query(Tweet).filter_by(id=repost.tweet_id).first()
-    if tweet:
-        tweet.decrement_reposts()
-
     try:
         db.delete(repost)
         db.commit()
@@ -300,9 +453,78 @@ def deleteRepost(
         logger.error(f"Error deleting repost: {e}")
         raise HTTPException(status_code=500, detail="database error")
 
+    counter_buffer.add(repost.tweet_id, "num_reposts", -1)
     return {"message": "repost deleted"}
 
 
+# Declared after the static GET /tweet/* listings, which it would shadow.
+@router.get("/tweet/{tweet_id}")
+async def getTweetByID(
+    tweet_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    async def load(missing: list[UUID]) -> dict:
+        query = select(Tweet).where(
+            Tweet.id == missing[0], *id_time_bounds(Tweet.created_at, missing)
+        )
+        tweet = (await db.execute(query)).scalar_one_or_none()
+        return {tweet.id: tweet_dict(tweet)} if tweet else {}
+
+    try:
+        tweet_uuid = UUID(tweet_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="invalid request")
+
+    tweet = await tweet_cache.aget(tweet_uuid, load)
+    if not tweet:
+        raise HTTPException(status_code=404, detail="invalid request")
+
+    try:
+        replyTweets, next_cursor = await reply_page(db, tweet_uuid, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+    replyTweetsRes = [t.to_dict() for t in replyTweets]
+
+    return {
+        "tweet": with_pending_counts(tweet),
+        "replys": replyTweetsRes,
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/tweet/{tweet_id}/thread")
+async def getThread(
+    tweet_id: str,
+    limit: int = Query(DEFAULT_THREAD_PAGE_SIZE, ge=1, le=MAX_THREAD_PAGE_SIZE),
+    depth: int = Query(DEFAULT_THREAD_DEPTH, ge=1, le=MAX_THREAD_DEPTH),
+    fan_out: int = Query(DEFAULT_THREAD_FAN_OUT, ge=1, le=MAX_THREAD_FAN_OUT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    The conversation under a tweet or reply: a page of `limit` direct
+    replies, each nested `depth` levels deep with up to `fan_out` replies
+    per reply. Replies flagged has_more_replys expand via their own thread.
+    """
+    try:
+        root_id = UUID(tweet_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="invalid request")
+
+    try:
+        thread = await load_thread(db, root_id, limit, depth, fan_out, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+    if thread is None:
+        raise HTTPException(status_code=404, detail="invalid request")
+
+    return thread
+
+
 @router.get("/test")
 def testRoute(user: UserToken = Depends(VerifyToken)):
     logger.info(f"Received test request from user: {user.username}")
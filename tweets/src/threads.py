@@ -0,0 +1,177 @@
+"""
+Bounded conversation trees.
+
+Replies form a tree through ReplyTweet.parent_id, which holds the id of
+either a tweet or another reply. A thread is read one level at a time:
+each level is a single UNION ALL of per-parent `ORDER BY created_at, id
+LIMIT n` subqueries, so every parent costs one short range scan of
+ix_reply_tweets_parent_created however many replies it has, and a tweet
+with 100k replies costs the same as one with ten.
+"""
+
+from datetime import timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.models import ReplyTweet, Tweet
+from src.pagination import decode_cursor, encode_cursor
+from src.partitions import id_time, id_time_bounds
+
+DEFAULT_THREAD_PAGE_SIZE = 20
+DEFAULT_THREAD_DEPTH = 3
+DEFAULT_THREAD_FAN_OUT = 5
+MAX_THREAD_PAGE_SIZE = 100
+MAX_THREAD_DEPTH = 5
+MAX_THREAD_FAN_OUT = 20
+# Replies in one response across all levels. Parents past the budget are
+# returned without children, flagged if they have any.
+MAX_THREAD_NODES = 500
+
+# Subqueries per UNION ALL; SQLite caps compound selects at 500 terms.
+PARENTS_PER_QUERY = 100
+
+# Replies are stamped after their parent, give or take the clock skew
+# between the replicas that created them.
+REPLY_CLOCK_SKEW = timedelta(minutes=5)
+
+
+async def get_root(db: AsyncSession, id: UUID):
+    """The tweet or reply a thread starts from, or None."""
+    for model in (Tweet, ReplyTweet):
+        query = select(model).where(
+            model.id == id, *id_time_bounds(model.created_at, [id])
+        )
+        root = (await db.execute(query)).scalar_one_or_none()
+        if root is not None:
+            return root
+    return None
+
+
+def replies_of(parent_id: UUID) -> list:
+    """
+    Conditions selecting the replies to parent_id. A UUIDv7 parent id also
+    skips the reply_tweets partitions older than the parent.
+    """
+    conditions = [ReplyTweet.parent_id == parent_id]
+    parent_time = id_time(parent_id)
+    if parent_time is not None:
+        conditions.append(ReplyTweet.created_at >= parent_time - REPLY_CLOCK_SKEW)
+    return conditions
+
+
+async def reply_page(
+    db: AsyncSession, parent_id: UUID, limit: int, cursor: Optional[str]
+) -> tuple[list[ReplyTweet], Optional[str]]:
+    """
+    One page of the direct replies to parent_id, oldest first, and the
+    cursor for the next page. Raises ValueError for a malformed cursor.
+    """
+    query = select(ReplyTweet).where(*replies_of(parent_id))
+    if cursor is not None:
+        after_created_at, after_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(ReplyTweet.created_at, ReplyTweet.id)
+            > tuple_(after_created_at, after_id)
+        )
+    query = query.order_by(ReplyTweet.created_at, ReplyTweet.id).limit(limit + 1)
+
+    replies = (await db.execute(query)).scalars().all()
+    if len(replies) <= limit:
+        return replies, None
+
+    replies = replies[:limit]
+    return replies, encode_cursor(replies[-1].created_at, replies[-1].id)
+
+
+async def first_replies(
+    db: AsyncSession, parent_ids: list[UUID], limit: int
+) -> dict[UUID, list[ReplyTweet]]:
+    """Up to `limit` oldest replies of each parent, keyed by parent id."""
+    children: dict[UUID, list[ReplyTweet]] = {}
+    for start in range(0, len(parent_ids), PARENTS_PER_QUERY):
+        chunk = parent_ids[start : start + PARENTS_PER_QUERY]
+        # Each LIMIT sits in its own subquery: SQLite rejects ORDER BY and
+        # LIMIT on the arms of a compound select.
+        parts = [
+            select(
+                select(ReplyTweet)
+                .where(*replies_of(parent_id))
+                .order_by(ReplyTweet.created_at, ReplyTweet.id)
+                .limit(limit)
+                .subquery()
+            )
+            for parent_id in chunk
+        ]
+        rows = aliased(ReplyTweet, union_all(*parts).subquery())
+        for reply in (await db.execute(select(rows))).scalars():
+            children.setdefault(reply.parent_id, []).append(reply)
+
+    for replies in children.values():
+        replies.sort(key=lambda reply: (reply.created_at, reply.id))
+    return children
+
+
+def reply_node(reply: ReplyTweet) -> dict:
+    node = reply.to_dict()
+    node["replys"] = []
+    node["has_more_replys"] = False
+    return node
+
+
+async def load_thread(
+    db: AsyncSession,
+    root_id: UUID,
+    limit: int = DEFAULT_THREAD_PAGE_SIZE,
+    depth: int = DEFAULT_THREAD_DEPTH,
+    fan_out: int = DEFAULT_THREAD_FAN_OUT,
+    cursor: Optional[str] = None,
+    max_nodes: int = MAX_THREAD_NODES,
+) -> Optional[dict]:
+    """
+    The conversation under root_id: a page of `limit` direct replies
+    (paged by `cursor`), each with up to `fan_out` replies of its own, down
+    to `depth` levels. Replies whose children were not loaded carry
+    has_more_replys; fetching the thread of that reply expands them.
+
+    Returns None if root_id is unknown. Raises ValueError for a malformed
+    cursor.
+    """
+    root = await get_root(db, root_id)
+    if root is None:
+        return None
+
+    top, next_cursor = await reply_page(db, root.id, limit, cursor)
+    nodes = [reply_node(reply) for reply in top]
+    frontier = nodes
+    budget = max_nodes - len(frontier)
+    unexpanded = []
+
+    for _ in range(depth - 1):
+        expand = frontier[: max(0, budget) // fan_out]
+        unexpanded += frontier[len(expand) :]
+        if not expand:
+            frontier = []
+            break
+
+        # One extra reply per parent tells whether it has more.
+        children = await first_replies(db, [UUID(n["id"]) for n in expand], fan_out + 1)
+        frontier = []
+        for node in expand:
+            replies = children.get(UUID(node["id"]), [])
+            node["has_more_replys"] = len(replies) > fan_out
+            node["replys"] = [reply_node(reply) for reply in replies[:fan_out]]
+            frontier += node["replys"]
+        budget -= len(frontier)
+
+    # Only whether the deepest (or over-budget) replies have replies at all.
+    unexpanded += frontier
+    if unexpanded:
+        has_replies = await first_replies(db, [UUID(n["id"]) for n in unexpanded], 1)
+        for node in unexpanded:
+            node["has_more_replys"] = UUID(node["id"]) in has_replies
+
+    return {"tweet": root.to_dict(), "replys": nodes, "next_cursor": next_cursor}
@@ -0,0 +1,251 @@
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import batched
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.dependencies.config import config
+from src.dependencies.counters import COUNTER_DELTA_MAX_BACKOFF, counter_deltas
+from src.dependencies.tweet_cache import tweet_cache, tweet_row_dict
+from src.models import OutboxEvent, Tweet
+from src.partitions import (
+    id_time,
+    matches_id_time,
+    partition_maintainer,
+    to_ms,
+    utcnow,
+    uuid7,
+)
+
+logger = logging.getLogger(__name__)
+
+# Tweets inserted and committed together during a bulk import.
+TWEET_IMPORT_CHUNK_SIZE = int(config.get("TWEET_IMPORT_CHUNK_SIZE", "5000"))
+# Tweets per outbox event, i.e. per broker message on each queue.
+TWEET_EVENT_BATCH_SIZE = int(config.get("TWEET_EVENT_BATCH_SIZE", "500"))
+# Seconds import_tweets.py keeps retrying the authors' num_tweets deltas.
+TWEET_IMPORT_FLUSH_TIMEOUT = float(config.get("TWEET_IMPORT_FLUSH_TIMEOUT", "120"))
+
+TWEET_FIELDS = ("user_id", "content", "created_at")
+
+
+# Imports repeat the same authors many times over.
+@lru_cache(maxsize=65536)
+def _author_id(value: str) -> UUID:
+    return UUID(value)
+
+
+def parse_tweet(raw, now: Optional[datetime] = None) -> Optional[dict]:
+    """
+    Parse one tweet from a dict ({"user_id", "content"} plus optional "id"
+    and ISO 8601 "created_at") or a (user_id, content[, created_at])
+    sequence into a tweets row. Returns None for malformed tweets.
+
+    created_at is kept to the millisecond and new ids are UUIDv7 stamped
+    with it. A UUIDv7 id given without created_at supplies it; one whose
+    time disagrees with created_at is malformed, as lookups by id would
+    search the wrong partition.
+    """
+    try:
+        if not isinstance(raw, dict):
+            raw = dict(zip(TWEET_FIELDS, raw))
+        user_id = _author_id(str(raw["user_id"]))
+        content = raw["content"]
+        id = UUID(str(raw["id"])) if raw.get("id") else None
+        created_at = raw.get("created_at")
+        if created_at:
+            created_at = datetime.fromisoformat(created_at)
+            if created_at.tzinfo is not None:
+                created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        else:
+            created_at = id_time(id) or now or utcnow()
+        created_at = to_ms(created_at)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if not isinstance(content, str) or not content:
+        return None
+    if id is None:
+        id = uuid7(created_at)
+    elif not matches_id_time(id, created_at):
+        return None
+    # In tweet_row_dict's column order.
+    return {
+        "id": id,
+        "user_id": user_id,
+        "content": content,
+        "num_likes": 0,
+        "num_replys": 0,
+        "num_reposts": 0,
+        "created_at": created_at,
+    }
+
+
+def _insert(db: Session):
+    """Return the dialect's INSERT, which provides on_conflict_do_nothing."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(Tweet)
+
+
+class TweetImporter:
+    """
+    Bulk-loads tweets for backfills and imports.
+
+    Each chunk is written with multi-row INSERT ... ON CONFLICT (id,
+    created_at) DO NOTHING RETURNING id and committed with its feed and
+    search events, so re-running an import that carries tweet ids skips
+    what already landed. Partitions for the months the chunk covers are
+    created first.
+    Events are staged in the outbox as one message per TWEET_EVENT_BATCH_SIZE
+    tweets (a JSON list; search events use the tweet.create.batch routing
+    key) instead of two per tweet, and num_tweets changes go to the shared
+    CounterDeltaBuffer as one delta per author per chunk.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        chunk_size: int = TWEET_IMPORT_CHUNK_SIZE,
+        event_batch_size: int = TWEET_EVENT_BATCH_SIZE,
+    ) -> None:
+        self.db = db
+        self.chunk_size = max(1, chunk_size)
+        self.event_batch_size = max(1, event_batch_size)
+
+        self.inserted = 0
+        self.skipped = 0
+        self.invalid = 0
+        self.events = 0
+
+    def insert_chunk(self, raw_tweets: Iterable) -> int:
+        """Insert and commit one chunk. Returns the number of new tweets."""
+        now = utcnow()
+        rows = {}
+        supplied = []
+        for raw in raw_tweets:
+            row = parse_tweet(raw, now)
+            if row is None:
+                self.invalid += 1
+            elif row["id"] in rows:
+                self.skipped += 1
+            else:
+                rows[row["id"]] = row
+                if isinstance(raw, dict) and raw.get("id"):
+                    supplied.append(row["id"])
+
+        self.skipped += self._drop_existing(rows, supplied)
+        if not rows:
+            return 0
+
+        # Backfills may reach months the maintainer has not created.
+        partition_maintainer.ensure(
+            (row["created_at"] for row in rows.values()), self.db.get_bind()
+        )
+
+        # An executemany of one cached statement: SQLAlchemy sends it as
+        # multi-row INSERT ... VALUES pages ("insertmanyvalues") without
+        # building and compiling a statement with a bind per value.
+        stmt = (
+            _insert(self.db)
+            .on_conflict_do_nothing(index_elements=["id", "created_at"])
+            .returning(Tweet.id)
+        )
+
+        try:
+            result = self.db.connection().execute(stmt, list(rows.values()))
+            inserted_ids = set(result.scalars())
+            tweets = [
+                tweet_row_dict(row.values())
+                for id, row in rows.items()
+                if id in inserted_ids
+            ]
+            events = []
+            for batch in batched(tweets, self.event_batch_size):
+                batch = list(batch)
+                events.append(OutboxEvent(batch, "general_tweets", "general_tweets"))
+                events.append(OutboxEvent(batch, "tweet_events", "tweet.create.batch"))
+            self.db.add_all(events)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        per_author = Counter(rows[id]["user_id"] for id in inserted_ids)
+        for user_id, count in per_author.items():
+            counter_deltas.add(user_id, count)
+        # Ids given by the caller may have been cached as missing.
+        if supplied:
+            tweet_cache.invalidate(*supplied)
+
+        self.inserted += len(inserted_ids)
+        self.skipped += len(rows) - len(inserted_ids)
+        self.events += len(events)
+        return len(inserted_ids)
+
+    def _drop_existing(self, rows: dict, supplied: list[UUID]) -> int:
+        """
+        Remove rows whose supplied pre-UUIDv7 id is already stored. The
+        conflict target is (id, created_at), and such an id given without
+        its created_at gets a new one, so ON CONFLICT would not match it.
+        """
+        unstamped = [id for id in supplied if id_time(id) is None]
+        if not unstamped:
+            return 0
+        existing = self.db.scalars(select(Tweet.id).where(Tweet.id.in_(unstamped)))
+        dropped = 0
+        for id in existing:
+            if rows.pop(id, None) is not None:
+                dropped += 1
+        return dropped
+
+    def import_tweets(self, raw_tweets: Iterable) -> int:
+        """Insert tweets from any iterable in chunks of chunk_size."""
+        inserted = 0
+        for chunk in batched(raw_tweets, self.chunk_size):
+            inserted += self.insert_chunk(chunk)
+        return inserted
+
+    def finish(self, timeout: float = 0) -> dict:
+        """
+        Send the authors' num_tweets deltas now rather than at the next
+        periodic flush, retrying with backoff for up to `timeout` seconds.
+        Deltas still unsent are returned as "unsent_deltas"; they stay
+        buffered for the service's flush thread, if one is running.
+        """
+        counts_sent = self._send_counts(timeout)
+        unsent = {} if counts_sent else counter_deltas.unsent()
+        if not counts_sent:
+            logger.error(f"num_tweets deltas for {len(unsent)} authors not sent")
+        return {**self.summary(), "counts_sent": counts_sent, "unsent_deltas": unsent}
+
+    @staticmethod
+    def _send_counts(timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        delay = 1.0
+        while True:
+            try:
+                if counter_deltas.flush():
+                    return True
+            except Exception as e:
+                logger.error(f"Error sending num_tweets deltas: {e}")
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, COUNTER_DELTA_MAX_BACKOFF)
+
+    def summary(self) -> dict:
+        return {
+            "inserted": self.inserted,
+            "skipped": self.skipped,
+            "invalid": self.invalid,
+            "events": self.events,
+        }
@@ -0,0 +1,240 @@
+from unittest.mock import MagicMock
+
+import pytest
+from src.dependencies.counters import CounterDeltaBuffer
+
+
+class TestCounterDeltaBuffer:
+    """Tests for coalescing num_tweets deltas sent to the users service."""
+
+    def test_flush_sends_net_deltas_once(self):
+        """Test that many adds become one call with per-user net deltas."""
+        send = MagicMock(return_value=True)
+        buffer = CounterDeltaBuffer(send)
+
+        for _ in range(3):
+            buffer.add("alice", 1)
+        buffer.add("bob", 1)
+        buffer.add("bob", -1)
+        buffer.add("carol", -1)
+
+        assert buffer.flush()
+        send.assert_called_once()
+        deltas, batch_id = send.call_args.args
+        assert deltas == {"alice": 3, "carol": -1}
+        assert batch_id
+
+    def test_nothing_pending_sends_nothing(self):
+        """Test that an idle flush makes no call."""
+        send = MagicMock(return_value=True)
+
+        assert CounterDeltaBuffer(send).flush()
+        send.assert_not_called()
+
+    def test_failed_batch_is_retried_with_same_id(self):
+        """Test that a failed batch is resent unchanged before newer deltas."""
+        send = MagicMock(side_effect=[False, True, True])
+        buffer = CounterDeltaBuffer(send)
+        buffer.add("alice", 2)
+
+        assert not buffer.flush()
+        buffer.add("alice", 1)
+        assert buffer.pending("alice") == 3
+
+        assert buffer.flush()
+        assert buffer.flush()
+
+        first, retry, newer = [c.args for c in send.call_args_list]
+        assert retry == first == ({"alice": 2}, first[1])
+        assert newer[0] == {"alice": 1}
+        assert newer[1] != first[1]
+
+    def test_send_error_backs_off(self):
+        """Test that a send that raises delays the retry like a failed one."""
+        send = MagicMock(side_effect=[RuntimeError("boom"), RuntimeError("boom")])
+        buffer = CounterDeltaBuffer(send, interval=1)
+        buffer.add("alice", 1)
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                buffer.flush()
+
+        assert buffer._delay() == 4
+        assert buffer.pending("alice") == 1
+
+    def test_stop_flushes(self):
+        """Test that stopping sends what is still pending."""
+        send = MagicMock(return_value=True)
+        buffer = CounterDeltaBuffer(send, interval=60)
+        buffer.start()
+        buffer.add("alice", 1)
+
+        buffer.stop()
+
+        send.assert_called_once()
+
+
+class TestRouteCounterDeltas:
+    """Tests that tweet routes no longer call the users service inline."""
+
+    def test_create_tweet_buffers_increment(
+        self, test_client, counter_deltas, mock_user_token
+    ):
+        """Test that posting a tweet records a +1 delta for its author."""
+        response = test_client.post("/tweet", json={"content": "hi"})
+
+        assert response.status_code == 200
+        assert counter_deltas.pending(mock_user_token.id) == 1
+
+
+def add_tweet(db, **counts):
+    from uuid import uuid4
+
+    from src.models import Tweet
+
+    tweet = Tweet(uuid4(), "hot")
+    for column, value in counts.items():
+        setattr(tweet, column, value)
+    db.add(tweet)
+    db.commit()
+    return tweet
+
+
+class TestCounterBuffer:
+    """Tests for the write-behind like/repost counters."""
+
+    def test_reads_merge_unflushed_deltas(self, test_db, counter_buffer):
+        """Test that to_dict and GetTweets structs include pending deltas."""
+        from src.dependencies.tweet_cache import tweet_dict
+        from src.grpc.server import tweet_struct
+
+        tweet = add_tweet(test_db, num_likes=2)
+        counter_buffer.add(tweet.id, "num_likes", 3)
+        counter_buffer.add(str(tweet.id), "num_reposts", 1)
+
+        assert tweet.to_dict()["num_likes"] == 5
+        assert tweet.to_dict()["num_reposts"] == 1
+        struct = tweet_struct(tweet_dict(tweet))
+        assert (struct.num_likes, struct.num_reposts) == (5, 1)
+
+    def test_flush_applies_batched_deltas(self, test_db, counter_buffer):
+        """Test that one flush adds every tweet's net delta to its row."""
+        tweets = [add_tweet(test_db, num_likes=1) for _ in range(20)]
+        for tweet in tweets:
+            counter_buffer.add(tweet.id, "num_likes", 2)
+            counter_buffer.add(tweet.id, "num_likes", -1)
+            counter_buffer.add(tweet.id, "num_reposts", 1)
+        listener = MagicMock()
+        counter_buffer.add_flush_listener(listener)
+
+        try:
+            assert counter_buffer.flush() == 20
+        finally:
+            counter_buffer._flush_listeners.remove(listener)
+
+        test_db.expire_all()
+        for tweet in tweets:
+            assert (tweet.num_likes, tweet.num_reposts) == (2, 1)
+            assert counter_buffer.pending(tweet.id, "num_likes") == 0
+        assert sorted(listener.call_args.args[0]) == sorted(t.id for t in tweets)
+
+    def test_failed_flush_is_retried(self, test_db, counter_buffer):
+        """Test that deltas survive a flush whose transaction fails."""
+        tweet = add_tweet(test_db)
+        counter_buffer.add(tweet.id, "num_likes")
+        good_factory = counter_buffer.session_factory
+        failing = MagicMock()
+        failing.execute.side_effect = RuntimeError("db down")
+        counter_buffer.session_factory = lambda: failing
+
+        assert counter_buffer.flush() == 0
+        assert counter_buffer.pending(tweet.id, "num_likes") == 1
+
+        counter_buffer.session_factory = good_factory
+        assert counter_buffer.flush() == 1
+        test_db.expire_all()
+        assert tweet.num_likes == 1
+
+    def test_unknown_column(self, counter_buffer):
+        """Test that only engagement counters are accepted."""
+        from uuid import uuid4
+
+        with pytest.raises(ValueError):
+            counter_buffer.add(uuid4(), "num_replys")
+
+    def test_reconcile_recounts_from_rows(self, test_db, counter_buffer):
+        """Test that drifted counters are recomputed from likes and reposts."""
+        from uuid import uuid4
+
+        from src.models import TweetLike, TweetRepost
+
+        drifted = add_tweet(test_db, num_likes=7, num_reposts=3)
+        correct = add_tweet(test_db, num_likes=1, num_reposts=0)
+        test_db.add_all(
+            [
+                TweetLike(uuid4(), drifted.id),
+                TweetLike(uuid4(), drifted.id),
+                TweetLike(uuid4(), correct.id),
+                TweetRepost(uuid4(), drifted.id),
+            ]
+        )
+        test_db.commit()
+
+        assert counter_buffer.reconcile() == 1
+        test_db.expire_all()
+        assert (drifted.num_likes, drifted.num_reposts) == (2, 1)
+
+        counter_buffer.add(correct.id, "num_likes", 5)
+        assert counter_buffer.reconcile([correct.id]) == 1
+        test_db.expire_all()
+        assert correct.num_likes == 1
+        assert counter_buffer.pending(correct.id, "num_likes") == 0
+
+
+class TestEngagementRoutes:
+    """Tests that likes and reposts leave the tweets row to the buffer."""
+
+    def test_like_is_buffered(self, test_client, test_db, counter_buffer):
+        """Test that a like is visible right away and stored on flush."""
+        tweet = add_tweet(test_db)
+
+        response = test_client.post(f"/tweet/like/{tweet.id}")
+
+        assert response.status_code == 200
+        test_db.expire_all()
+        assert tweet.num_likes == 0
+        assert test_client.get(f"/tweet/{tweet.id}").json()["tweet"]["num_likes"] == 1
+
+        counter_buffer.flush()
+        test_db.expire_all()
+        assert tweet.num_likes == 1
+
+    def test_duplicate_like_is_rejected(self, test_client, test_db, counter_buffer):
+        """Test that liking twice is a 409 and counts once."""
+        tweet = add_tweet(test_db)
+
+        assert test_client.post(f"/tweet/like/{tweet.id}").status_code == 200
+        assert test_client.post(f"/tweet/like/{tweet.id}").status_code == 409
+        assert counter_buffer.pending(tweet.id, "num_likes") == 1
+
+    def test_unknown_tweet(self, test_client, test_db):
+        """Test that liking or reposting a missing tweet is a 404."""
+        from uuid import uuid4
+
+        assert test_client.post(f"/tweet/like/{uuid4()}").status_code == 404
+        assert test_client.post("/tweet/repost/not-a-uuid").status_code == 404
+
+    def test_repost_then_delete(
+        self, test_client, test_db, counter_buffer, mock_user_token
+    ):
+        """Test that deleting a repost cancels its buffered increment."""
+        from src.models import TweetRepost
+
+        tweet = add_tweet(test_db)
+        assert test_client.post(f"/tweet/repost/{tweet.id}").status_code == 200
+        repost = test_db.query(TweetRepost).one()
+
+        response = test_client.delete(f"/tweet/repost/{repost.id}")
+
+        assert response.status_code == 200
+        assert counter_buffer.pending(tweet.id, "num_reposts") == 0
@@ -0,0 +1,120 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import grpc
+import pytest
+from src.grpc.ids import pack_ids
+from src.grpc.server import AsyncTweetService, TweetService
+from src.grpc.server.tweet_service_pb2 import GetTweetsReq
+from src.models import Tweet
+
+
+def make_tweet(db, content):
+    tweet = Tweet(uuid4(), content)
+    db.add(tweet)
+    db.commit()
+    db.refresh(tweet)
+    return tweet
+
+
+@pytest.fixture
+def grpc_context():
+    """Mock gRPC servicer context."""
+    context = MagicMock()
+    context.abort.side_effect = grpc.RpcError()
+    return context
+
+
+class TestGetTweets:
+    """Tests for the thread-pool GetTweets servicer."""
+
+    def test_returns_requested_tweets(self, test_db, grpc_context):
+        """Test that only the requested tweets are returned."""
+        first = make_tweet(test_db, "first")
+        make_tweet(test_db, "other")
+
+        with patch("src.grpc.server.SessionLocal", return_value=test_db):
+            response = TweetService().GetTweets(
+                GetTweetsReq(tweet_ids=[str(first.id), str(uuid4())]), grpc_context
+            )
+
+        assert [tweet.content for tweet in response.tweets] == ["first"]
+
+    def test_rejects_malformed_ids(self, test_db, grpc_context):
+        """Test that malformed ids are rejected before querying."""
+        with pytest.raises(grpc.RpcError):
+            TweetService().GetTweets(GetTweetsReq(tweet_ids=["nope"]), grpc_context)
+
+        grpc_context.abort.assert_called_once()
+
+
+class TestAsyncGetTweets:
+    """Tests for the asyncio servicer used by the grpc.aio server."""
+
+    def service(self):
+        from tests.conftest import TestingAsyncSessionLocal
+
+        return AsyncTweetService(TestingAsyncSessionLocal)
+
+    def test_returns_packed_tweets(self, test_db, grpc_context):
+        """Test that packed requests are served through the async session."""
+        tweet = make_tweet(test_db, "hello")
+
+        response = asyncio.run(
+            self.service().GetTweets(
+                GetTweetsReq(packed_tweet_ids=pack_ids([tweet.id]), packed=True),
+                grpc_context,
+            )
+        )
+
+        assert len(response.tweets) == 1
+        assert response.tweets[0].id_bytes == tweet.id.bytes
+        assert response.tweets[0].content == "hello"
+
+    def test_rejects_truncated_ids(self, test_db):
+        """Test that the async abort is awaited for malformed packed ids."""
+        context = AsyncMock()
+        context.abort.side_effect = grpc.RpcError()
+
+        with pytest.raises(grpc.RpcError):
+            asyncio.run(
+                self.service().GetTweets(
+                    GetTweetsReq(packed_tweet_ids=b"\x00" * 17, packed=True), context
+                )
+            )
+
+        context.abort.assert_awaited_once()
+
+
+class TestLoadTweets:
+    """Tests for the column-only query behind GetTweets."""
+
+    def test_loads_rows_without_orm_instances(self, test_db):
+        """Test that existing ids come back as cache entries, missing ones absent."""
+        from src.grpc.server import load_tweets
+
+        tweet = make_tweet(test_db, "row")
+        test_db.expunge_all()
+
+        tweets = load_tweets(test_db, [tweet.id, uuid4()])
+
+        assert list(tweets) == [tweet.id]
+        assert tweets[tweet.id]["content"] == "row"
+        assert tweets[tweet.id]["created_at"] == tweet.created_at.isoformat()
+        assert len(test_db.identity_map) == 0
+
+    def test_postgres_binds_one_array(self):
+        """Test that Postgres gets `= ANY(:tweet_ids)` whatever the id count."""
+        from sqlalchemy.dialects import postgresql
+        from src.grpc.server import tweets_by_id
+
+        sql = {
+            str(tweets_by_id([uuid4() for _ in range(n)], "postgresql").compile(
+                dialect=postgresql.dialect()
+            ))
+            for n in (1, 50, 500)
+        }
+
+        assert len(sql) == 1
+        assert "= ANY (%(tweet_ids)s::UUID[])" in sql.pop()
@@ -0,0 +1,75 @@
+import json
+import time
+
+import pytest
+from benchmarks.fake_broker import FakeBroker
+from src.dependencies.mq import EXCHANGE, Publisher, PublishError
+
+
+@pytest.fixture
+def broker():
+    return FakeBroker(rtt=0.001)
+
+
+@pytest.fixture
+def publisher(broker):
+    publisher = Publisher(broker.connect, pool_size=2, max_reconnect_delay=0.05)
+    yield publisher
+    publisher.close()
+
+
+class TestPublisher:
+    """Tests for the pooled confirm-mode RabbitMQ publisher."""
+
+    def test_publish_is_confirmed(self, broker, publisher):
+        """Test that a published message resolves once the broker acks it."""
+        publisher.publish({"id": 1}, "general_tweets").result(timeout=2)
+
+        body = json.dumps({"id": 1}).encode()
+        assert broker.messages == [(EXCHANGE, "general_tweets", body)]
+        assert broker.exchanges == {EXCHANGE}
+        assert publisher.stats()["confirmed"] == 1
+
+    def test_reuses_one_connection(self, broker, publisher):
+        """Test that many publishes share a connection and declare queues once."""
+        futures = [
+            publisher.publish({"n": i}, "tweet_events", "tweet.create")
+            for i in range(200)
+        ]
+        for future in futures:
+            future.result(timeout=2)
+
+        assert len(broker.connections) == 1
+        assert broker.queues == {"tweet_events"}
+        assert {key for _, key, _ in broker.messages} == {"tweet.create"}
+
+    def test_nack_fails_the_future(self, broker, publisher):
+        """Test that a broker nack surfaces as a PublishError."""
+        broker.nack_queues.add("rejected")
+
+        with pytest.raises(PublishError):
+            publisher.publish({}, "rejected").result(timeout=2)
+        publisher.publish({}, "accepted").result(timeout=2)
+
+    def test_republishes_after_connection_loss(self, broker, publisher):
+        """Test that unconfirmed messages are sent again on a new connection."""
+        publisher.publish({}, "general_tweets").result(timeout=2)
+        broker.rtt = 0.2  # keep the next message unconfirmed
+        future = publisher.publish({"after": "drop"}, "general_tweets")
+        time.sleep(0.05)
+
+        broker.rtt = 0.001
+        broker.connections[0].drop()
+
+        future.result(timeout=2)
+        assert len(broker.connections) == 2
+        assert publisher.stats()["reconnects"] == 1
+        assert [body for _, _, body in broker.messages].count(b'{"after": "drop"}') == 2
+
+    def test_close_then_reopen(self, broker, publisher):
+        """Test that publishing after close starts a fresh connection."""
+        publisher.publish({}, "general_tweets").result(timeout=2)
+        publisher.close()
+
+        publisher.publish({}, "general_tweets").result(timeout=2)
+        assert len(broker.connections) == 2
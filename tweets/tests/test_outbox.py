@@ -0,0 +1,76 @@
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+from src.models import OutboxEvent
+from src.outbox import OutboxRelay, enqueue_event
+
+from tests.conftest import TestingSessionLocal
+
+
+def resolved(error=None):
+    future = Future()
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+    return future
+
+
+def relay_with(publisher, batch_size=100):
+    return OutboxRelay(
+        TestingSessionLocal, publisher, batch_size=batch_size, confirm_timeout=1
+    )
+
+
+class TestOutboxRelay:
+    """Tests for relaying committed outbox rows to RabbitMQ."""
+
+    def test_relays_and_deletes_in_order(self, test_db):
+        """Test that confirmed rows are published oldest first and removed."""
+        enqueue_event(test_db, {"n": 1}, "general_tweets")
+        enqueue_event(test_db, {"n": 2}, "tweet_events", "tweet.create")
+        test_db.commit()
+        publisher = MagicMock()
+        publisher.publish.return_value = resolved()
+
+        assert relay_with(publisher).relay_once() == 2
+
+        assert [c.args for c in publisher.publish.call_args_list] == [
+            ({"n": 1}, "general_tweets", "general_tweets"),
+            ({"n": 2}, "tweet_events", "tweet.create"),
+        ]
+        test_db.expire_all()
+        assert test_db.query(OutboxEvent).count() == 0
+
+    def test_unconfirmed_rows_are_kept(self, test_db):
+        """Test that a failed publish leaves its row for the next pass."""
+        enqueue_event(test_db, {"n": 1}, "general_tweets")
+        enqueue_event(test_db, {"n": 2}, "general_tweets")
+        test_db.commit()
+        publisher = MagicMock()
+        publisher.publish.side_effect = [resolved(), resolved(RuntimeError("nack"))]
+
+        assert relay_with(publisher).relay_once() == 1
+
+        test_db.expire_all()
+        assert [e.payload for e in test_db.query(OutboxEvent)] == [{"n": 2}]
+
+    def test_batch_size_limits_a_pass(self, test_db):
+        """Test that one pass claims at most batch_size rows."""
+        for n in range(5):
+            enqueue_event(test_db, {"n": n}, "general_tweets")
+        test_db.commit()
+        publisher = MagicMock()
+        publisher.publish.return_value = resolved()
+        relay = relay_with(publisher, batch_size=2)
+
+        assert [relay.relay_once() for _ in range(4)] == [2, 2, 1, 0]
+
+    def test_rolled_back_events_are_never_sent(self, test_db):
+        """Test that events staged in an aborted transaction disappear."""
+        enqueue_event(test_db, {"n": 1}, "general_tweets")
+        test_db.rollback()
+        publisher = MagicMock()
+
+        assert relay_with(publisher).relay_once() == 0
+        publisher.publish.assert_not_called()
@@ -0,0 +1,320 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+from src.grpc.server import tweets_by_id
+from src.models import Tweet, TweetLike, TweetRepost
+from src.partitions import (
+    PartitionMaintainer,
+    add_months,
+    id_time,
+    id_time_bounds,
+    migrate_unpartitioned,
+    partition_ddl,
+    partition_month,
+    uuid7,
+)
+
+
+def postgres_engine():
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+    return engine
+
+
+def executed_sql(conn) -> list[str]:
+    return [str(call.args[0]) for call in conn.execute.call_args_list]
+
+
+def legacy_conn(conn, tables, months=()):
+    """Make conn a Postgres connection on which `tables` are plain tables."""
+
+    def execute(statement, params=None):
+        sql = str(statement)
+        result = MagicMock()
+        if "pg_class" in sql:
+            result.scalars.return_value = list(tables)
+        elif "pg_indexes" in sql:
+            result.scalars.return_value.all.return_value = [f"{params['table']}_pkey"]
+        elif "date_trunc" in sql:
+            result.scalars.return_value = list(months)
+        elif "count(*)" in sql:
+            result.scalar.return_value = 5
+        result.rowcount = 4 if "tweet_like" in sql else 5
+        return result
+
+    conn.dialect.name = "postgresql"
+    conn.execute.side_effect = execute
+    return conn
+
+
+class TestIds:
+    """Tests for UUIDv7 ids and the time they carry."""
+
+    def test_uuid7_carries_its_millisecond(self):
+        """Test that id_time reads back the millisecond an id was stamped with."""
+        at = datetime(2026, 3, 4, 5, 6, 7, 891234)
+
+        id = uuid7(at)
+
+        assert id.version == 7
+        assert id_time(id) == datetime(2026, 3, 4, 5, 6, 7, 891000)
+        assert uuid7(at) != id
+        one_ms = timedelta(milliseconds=1)
+        assert uuid7(at - one_ms) < id < uuid7(at + one_ms)
+        assert id_time(uuid4()) is None
+        assert id_time("not a uuid") is None
+
+    def test_bounds_only_when_every_id_has_a_time(self):
+        """Test that a single unstamped id drops the created_at range."""
+        early, late = datetime(2026, 1, 31), datetime(2026, 2, 2)
+        ids = [uuid7(early), uuid7(late)]
+
+        low, high = id_time_bounds(Tweet.created_at, ids)
+
+        assert low.right.value == early
+        assert high.right.value == late + timedelta(milliseconds=1)
+        assert id_time_bounds(Tweet.created_at, ids + [uuid4()]) == []
+        assert id_time_bounds(Tweet.created_at, []) == []
+
+    def test_models_stamp_created_at_into_ids(self):
+        """Test that new rows get ids carrying their created_at."""
+        tweet = Tweet(uuid4(), "hi")
+        like = TweetLike(uuid4(), tweet.id)
+
+        assert id_time(tweet.id) == tweet.created_at
+        assert like.tweet_created_at == tweet.created_at
+        assert id_time(like.id) == tweet.created_at
+
+
+class TestSchema:
+    """Tests for the partitioned table definitions."""
+
+    def test_postgres_ddl_partitions_by_month_key(self):
+        """Test that keys include the partition key on Postgres."""
+        tweets = str(
+            CreateTable(Tweet.__table__).compile(dialect=postgresql.dialect())
+        )
+        likes = str(
+            CreateTable(TweetLike.__table__).compile(dialect=postgresql.dialect())
+        )
+
+        assert "PARTITION BY RANGE (created_at)" in tweets
+        assert "PRIMARY KEY (id, created_at)" in tweets
+        assert "PARTITION BY RANGE (tweet_created_at)" in likes
+        assert "UNIQUE (user_id, tweet_id, tweet_created_at)" in likes
+
+    def test_partition_names_and_ranges(self):
+        """Test monthly partition naming, parsing and bounds."""
+        assert add_months(datetime(2026, 11, 1), 3) == datetime(2027, 2, 1)
+        assert add_months(datetime(2026, 1, 1), -1) == datetime(2025, 12, 1)
+        assert partition_ddl("tweets", datetime(2026, 12, 1)) == (
+            "CREATE TABLE IF NOT EXISTS tweets_p202612 PARTITION OF tweets "
+            "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+        )
+        assert partition_month("tweets", "tweets_p202612") == datetime(2026, 12, 1)
+        assert partition_month("tweets", "tweet_like_p202612") is None
+        assert partition_month("tweets", "tweets_archive") is None
+
+
+class TestPartitionMaintainer:
+    """Tests for partition creation and retention."""
+
+    def test_creates_upcoming_months_once(self):
+        """Test that the current and upcoming months are created, then cached."""
+        engine = postgres_engine()
+        conn = engine.begin.return_value.__enter__.return_value
+        maintainer = PartitionMaintainer(engine, months_ahead=1)
+
+        created = maintainer.ensure(maintainer.upcoming_months(datetime(2026, 12, 15)))
+
+        assert set(created) == {
+            f"{table}_p{month}"
+            for table in ("tweets", "reply_tweets", "tweet_like", "tweet_repost")
+            for month in ("202612", "202701")
+        }
+        assert len(executed_sql(conn)) == 8
+        assert maintainer.ensure([datetime(2027, 1, 20)]) == []
+
+    def test_detaches_partitions_past_retention(self):
+        """Test that only whole months before the cutoff are detached."""
+        engine = postgres_engine()
+        conn = (
+            engine.connect.return_value.execution_options.return_value
+            .__enter__.return_value
+        )
+        conn.execute.return_value.scalars.side_effect = lambda: iter(
+            ["tweets_p202608", "tweets_p202609", "tweets_p202610", "tweets_old"]
+        )
+        detached = []
+        maintainer = PartitionMaintainer(engine, retention_months=1)
+        maintainer.add_detach_listener(lambda *args: detached.append(args))
+
+        names = maintainer.detach_expired(datetime(2026, 10, 17))
+
+        assert names.count("tweets_p202608") == 1
+        assert "tweets_p202609" not in names and "tweets_old" not in names
+        assert ("tweets", "tweets_p202608") in detached
+        assert (
+            "ALTER TABLE tweets DETACH PARTITION tweets_p202608 CONCURRENTLY"
+            in executed_sql(conn)
+        )
+
+    def test_noop_without_postgres_or_retention(self, test_db):
+        """Test that SQLite and a zero retention leave everything alone."""
+        maintainer = PartitionMaintainer(test_db.get_bind(), retention_months=1)
+
+        assert maintainer.maintain() == {"created": [], "detached": []}
+        assert PartitionMaintainer(postgres_engine()).detach_expired() == []
+
+
+class TestLegacyTables:
+    """Tests for databases whose tables predate partitioning."""
+
+    def test_init_db_refuses_unpartitioned_tables(self):
+        """Test that the service stops with a pointer to the migration."""
+        from src.dependencies import db
+
+        engine = postgres_engine()
+        legacy_conn(engine.connect.return_value.__enter__.return_value, ["tweets"])
+        maintain = MagicMock()
+
+        with patch.object(db, "engine", engine), patch.object(
+            db.Base.metadata, "create_all"
+        ), patch("src.partitions.partition_maintainer.maintain", maintain):
+            with pytest.raises(RuntimeError, match="migrate_partitions.py"):
+                db.init_db()
+        maintain.assert_not_called()
+
+    def test_migration_copies_rows_into_partitions(self):
+        """Test the rename, create, partition and copy steps, in one transaction."""
+        engine = postgres_engine()
+        conn = legacy_conn(
+            engine.begin.return_value.__enter__.return_value,
+            ["tweets", "tweet_like"],
+            months=[datetime(2023, 4, 1)],
+        )
+
+        result = migrate_unpartitioned(
+            engine, drop_legacy=True, now=datetime(2026, 10, 17)
+        )
+
+        assert result == {
+            "tweets": {"copied": 5, "left": 0},
+            "tweet_like": {"copied": 4, "left": 1},
+        }
+        sql = executed_sql(conn)
+        renamed = sql.index("ALTER TABLE tweets RENAME TO tweets_legacy")
+        index_renamed = "ALTER INDEX tweets_pkey RENAME TO tweets_pkey_legacy"
+        assert sql[renamed - 1] == index_renamed
+        assert sql[renamed + 1].strip().startswith("CREATE TABLE tweets")
+        assert partition_ddl("tweet_like", datetime(2023, 4, 1)) in sql
+        assert partition_ddl("tweets", datetime(2026, 10, 1)) in sql
+        inserts = [line for line in sql if line.startswith("INSERT")]
+        assert inserts[0].startswith("INSERT INTO tweets ")
+        assert "tweets.created_at" in inserts[1]
+        assert "JOIN tweets ON tweets.id = old.tweet_id" in inserts[1]
+        assert "DROP TABLE tweets_legacy" in sql
+        assert "DROP TABLE tweet_like_legacy" not in sql
+
+    def test_migration_without_legacy_tables_does_nothing(self, test_db):
+        """Test that partitioned and SQLite databases are left alone."""
+        engine = postgres_engine()
+        conn = legacy_conn(engine.begin.return_value.__enter__.return_value, [])
+
+        assert migrate_unpartitioned(engine) == {}
+        assert len(executed_sql(conn)) == 1
+        assert migrate_unpartitioned(test_db.get_bind()) == {}
+
+
+class TestPrunedLookups:
+    """Tests that lookups by id add the id's created_at range."""
+
+    def test_get_tweets_query_is_bounded(self):
+        """Test that GetTweets' select carries the ids' time range."""
+        ids = [uuid7(datetime(2026, 5, 1)), uuid7(datetime(2026, 6, 1))]
+
+        stmt = tweets_by_id(ids, "postgresql")
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "tweets.created_at >=" in sql and "tweets.created_at <" in sql
+        assert "created_at" not in str(tweets_by_id([uuid4()], "sqlite").whereclause)
+
+    def test_rows_with_legacy_ids_are_still_found(self, test_client, test_db):
+        """Test that tweets stored with UUIDv4 ids are read and liked."""
+        tweet = Tweet(uuid4(), "from before partitioning")
+        tweet.id = uuid4()
+        test_db.add(tweet)
+        test_db.commit()
+
+        response = test_client.get(f"/tweet/{tweet.id}")
+        like = test_client.post(f"/tweet/like/{tweet.id}")
+
+        assert response.status_code == 200
+        assert response.json()["tweet"]["content"] == "from before partitioning"
+        assert like.status_code == 200
+        stored = test_db.query(TweetLike).filter_by(tweet_id=tweet.id).one()
+        assert stored.tweet_created_at == tweet.created_at
+
+    def test_like_records_tweet_created_at(self, test_client, test_db):
+        """Test that likes land in the partition of the liked tweet."""
+        tweet = Tweet(uuid4(), "hi")
+        test_db.add(tweet)
+        test_db.commit()
+
+        assert test_client.post(f"/tweet/like/{tweet.id}").status_code == 200
+        assert test_client.post(f"/tweet/like/{tweet.id}").status_code == 409
+        other = UUID(int=tweet.id.int ^ 1)
+        assert test_client.delete(f"/tweet/{other}").status_code == 404
+
+        like = test_db.query(TweetLike).filter_by(tweet_id=tweet.id).one()
+        assert like.tweet_created_at == tweet.created_at
+
+    def test_unlike_and_unrepost_by_id(self, test_client, test_db):
+        """Test that likes and reposts are deleted through their stamped ids."""
+        tweet = Tweet(uuid4(), "hi")
+        test_db.add(tweet)
+        test_db.commit()
+        test_client.post(f"/tweet/like/{tweet.id}")
+        test_client.post(f"/tweet/repost/{tweet.id}")
+        like = test_db.query(TweetLike).filter_by(tweet_id=tweet.id).one()
+        repost = test_db.query(TweetRepost).filter_by(tweet_id=tweet.id).one()
+
+        assert id_time(like.id) == id_time(repost.id) == tweet.created_at
+        assert test_client.delete(f"/tweet/like/{like.id}").status_code == 200
+        assert test_client.delete(f"/tweet/repost/{repost.id}").status_code == 200
+        assert test_client.delete(f"/tweet/like/{like.id}").status_code == 404
+        assert test_client.delete("/tweet/repost/not-a-uuid").status_code == 404
+        assert test_db.query(TweetLike).count() == 0
+
+    def test_counter_flush_updates_are_bounded(self, test_db, counter_buffer):
+        """Test that flushed deltas carry the created_at of stamped ids."""
+        stamped = Tweet(uuid4(), "new")
+        legacy = Tweet(uuid4(), "old")
+        legacy.id = uuid4()
+        test_db.add_all([stamped, legacy])
+        test_db.commit()
+        for tweet in (stamped, legacy):
+            counter_buffer.add(tweet.id, "num_likes", 3)
+
+        statements = []
+        engine = test_db.get_bind()
+
+        def capture(conn, cursor, sql, *args):
+            statements.append(sql)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            assert counter_buffer.flush() == 2
+            assert counter_buffer.reconcile([stamped.id]) == 1
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        updates = [sql for sql in statements if sql.startswith("UPDATE tweets")]
+        assert [("created_at >=" in sql) for sql in updates] == [True, False, True]
+        test_db.expire_all()
+        assert (stamped.num_likes, legacy.num_likes) == (0, 3)
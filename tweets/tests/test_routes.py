@@ -10,8 +10,8 @@ class TestHealthEndpoint:
     def test_health_check_returns_200(self):
         """Test health check returns 200 OK."""
         with patch("src.routes.DB"), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
 
             app = FastAPI()
@@ -25,8 +25,8 @@ class TestHealthEndpoint:
     def test_health_check_returns_correct_body(self):
         """Test health check returns expected JSON body."""
         with patch("src.routes.DB"), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
 
             app = FastAPI()
@@ -58,8 +58,8 @@ class TestCreateTweetEndpoint:
 
         with patch("src.routes.DB", mock_db), \
              patch("src.routes.Tweet", return_value=mock_tweet), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
             from src.dependencies.auth import VerifyToken
 
@@ -76,8 +76,8 @@ class TestCreateTweetEndpoint:
     def test_create_tweet_missing_content(self):
         """Test tweet creation fails without content."""
         with patch("src.routes.DB"), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
             from src.dependencies.auth import VerifyToken
 
@@ -94,19 +94,19 @@ class TestCreateTweetEndpoint:
             assert response.status_code == 422  # Validation error
 
     def test_create_tweet_publishes_to_queues(self):
-        """Test that creating a tweet publishes to message queues."""
+        """Test that creating a tweet stages events for both queues."""
         mock_db = MagicMock()
         mock_tweet = MagicMock()
         mock_tweet.to_dict.return_value = {"id": "tweet-1", "content": "Test"}
-        mock_produce = MagicMock()
+        mock_enqueue = MagicMock()
 
         mock_user_token = MagicMock()
         mock_user_token.id = "user-1"
 
         with patch("src.routes.DB", mock_db), \
              patch("src.routes.Tweet", return_value=mock_tweet), \
-             patch("src.routes.produce_message", mock_produce), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event", mock_enqueue), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
             from src.dependencies.auth import VerifyToken
 
@@ -118,7 +118,7 @@ class TestCreateTweetEndpoint:
             client.post("/tweet", json={"content": "Test tweet"})
 
             # Should be called twice: once for feed, once for search
-            assert mock_produce.call_count == 2
+            assert mock_enqueue.call_count == 2
 
 
 class TestGetTweetEndpoint:
@@ -135,8 +135,8 @@ class TestGetTweetEndpoint:
         mock_user_token.id = "user-1"
 
         with patch("src.routes.DB", mock_db), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
             from src.dependencies.auth import VerifyToken
 
@@ -160,8 +160,8 @@ class TestGetTweetEndpoint:
         mock_db.query.return_value.filter_by.return_value.all.return_value = []
 
         with patch("src.routes.DB", mock_db), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
 
             app = FastAPI()
@@ -179,8 +179,8 @@ class TestGetTweetEndpoint:
         mock_db.query.return_value.filter_by.return_value.first.return_value = None
 
         with patch("src.routes.DB", mock_db), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
 
             app = FastAPI()
@@ -206,8 +206,8 @@ class TestDeleteTweetEndpoint:
         mock_user_token.id = "user-1"
 
         with patch("src.routes.DB", mock_db), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
             from src.dependencies.auth import VerifyToken
 
@@ -232,8 +232,8 @@ class TestDeleteTweetEndpoint:
         mock_user_token.id = "user-1"
 
         with patch("src.routes.DB", mock_db), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
             from src.dependencies.auth import VerifyToken
 
@@ -261,8 +261,8 @@ class TestLikeEndpoints:
 
         with patch("src.routes.DB", mock_db), \
              patch("src.routes.TweetLike"), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
             from src.dependencies.auth import VerifyToken
 
@@ -285,8 +285,8 @@ class TestLikeEndpoints:
         mock_user_token.id = "user-1"
 
         with patch("src.routes.DB", mock_db), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
             from src.dependencies.auth import VerifyToken
 
@@ -314,8 +314,8 @@ class TestRepostEndpoints:
 
         with patch("src.routes.DB", mock_db), \
              patch("src.routes.TweetRepost"), \
-             patch("src.routes.produce_message"), \
-             patch("src.routes.IncrementTweets"):
+             patch("src.routes.enqueue_event"), \
+             patch("src.routes.counter_deltas"):
             from src.routes import router
             from src.dependencies.auth import VerifyToken
 
@@ -328,3 +328,162 @@ class TestRepostEndpoints:
 
             assert response.status_code == 200
             mock_tweet.increment_reposts.assert_called_once()
+
+
+class TestAsyncTweetRoutes:
+    """Tests for the tweet routes served by the async session."""
+
+    def test_create_then_list_tweets(self, test_client):
+        """Test that a created tweet is returned by GET /tweet."""
+        response = test_client.post("/tweet", json={"content": "hello async"})
+        assert response.status_code == 200
+
+        response = test_client.get("/tweet")
+
+        assert response.status_code == 200
+        assert [t["content"] for t in response.json()["result"]] == ["hello async"]
+
+    def test_create_tweet_writes_outbox(self, test_client, test_db):
+        """Test that tweet events are committed to the outbox, not published."""
+        from src.models import OutboxEvent
+
+        response = test_client.post("/tweet", json={"content": "outboxed"})
+        assert response.status_code == 200
+
+        events = test_db.query(OutboxEvent).order_by(OutboxEvent.id).all()
+        assert [(e.queue, e.routing_key) for e in events] == [
+            ("general_tweets", "general_tweets"),
+            ("tweet_events", "tweet.create"),
+        ]
+        assert events[0].payload["content"] == "outboxed"
+        assert events[0].payload["id"] == events[1].payload["id"]
+
+    def test_get_tweet_by_id_with_replies(self, test_client, test_db, mock_user_token):
+        """Test fetching a tweet and its replies by id."""
+        from uuid import UUID
+
+        from src.models import ReplyTweet, Tweet
+
+        tweet = Tweet(UUID(mock_user_token.id), "parent")
+        test_db.add(tweet)
+        test_db.commit()
+        test_db.add(ReplyTweet(UUID(mock_user_token.id), tweet.id, "child"))
+        test_db.commit()
+
+        response = test_client.get(f"/tweet/{tweet.id}")
+
+        assert response.status_code == 200
+        assert response.json()["tweet"]["content"] == "parent"
+        assert [r["content"] for r in response.json()["replys"]] == ["child"]
+
+    def test_get_tweet_by_malformed_id(self, test_client):
+        """Test that a malformed id is a 404, not a server error."""
+        response = test_client.get("/tweet/not-a-uuid")
+
+        assert response.status_code == 404
+
+
+class TestTweetPagination:
+    """Tests for keyset pagination of a user's tweets, replies, likes and reposts."""
+
+    def add_rows(self, db, rows):
+        from datetime import datetime, timedelta
+
+        base = datetime(2024, 1, 1)
+        for i, row in enumerate(rows):
+            row.created_at = base + timedelta(minutes=i)
+        db.add_all(rows)
+        db.commit()
+        return [str(row.id) for row in reversed(rows)]
+
+    def collect(self, client, path, limit):
+        seen, pages, cursor = [], 0, None
+        while True:
+            params = {"limit": limit}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get(path, params=params)
+            assert response.status_code == 200
+            body = response.json()
+            seen += [row["id"] for row in body["result"]]
+            pages += 1
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return seen, pages
+
+    def test_tweets_newest_first_without_gaps(
+        self, test_client, test_db, mock_user_token
+    ):
+        """Test that following next_cursor visits every tweet exactly once."""
+        from uuid import UUID, uuid4
+
+        from src.models import Tweet
+
+        expected = self.add_rows(
+            test_db, [Tweet(UUID(mock_user_token.id), f"t{i}") for i in range(5)]
+        )
+        self.add_rows(test_db, [Tweet(uuid4(), "someone else")])
+
+        seen, pages = self.collect(test_client, "/tweet", 2)
+
+        assert seen == expected
+        assert pages == 3
+
+    def test_same_timestamp_ties_broken_by_id(
+        self, test_client, test_db, mock_user_token
+    ):
+        """Test that rows sharing created_at are split across pages correctly."""
+        from datetime import datetime
+        from uuid import UUID, uuid4
+
+        from src.models import ReplyTweet
+
+        parent_id = uuid4()
+        replies = [
+            ReplyTweet(UUID(mock_user_token.id), parent_id, f"r{i}") for i in range(4)
+        ]
+        for reply in replies:
+            reply.created_at = datetime(2024, 1, 1)
+        test_db.add_all(replies)
+        test_db.commit()
+
+        seen, _ = self.collect(test_client, "/tweet/reply", 1)
+
+        assert sorted(seen) == sorted(str(r.id) for r in replies)
+        assert len(set(seen)) == 4
+
+    def test_likes_and_reposts_paginate(self, test_client, test_db, mock_user_token):
+        """Test that the like and repost listings are reachable and paginated."""
+        from datetime import datetime
+        from uuid import UUID, uuid4
+
+        from src.models import TweetLike, TweetRepost
+
+        user_id = UUID(mock_user_token.id)
+        tweet_created_at = datetime(2024, 1, 1)
+        likes = self.add_rows(
+            test_db,
+            [TweetLike(user_id, uuid4(), tweet_created_at) for _ in range(3)],
+        )
+        reposts = self.add_rows(
+            test_db,
+            [TweetRepost(user_id, uuid4(), tweet_created_at) for _ in range(3)],
+        )
+
+        assert self.collect(test_client, "/tweet/like", 2) == (likes, 2)
+        assert self.collect(test_client, "/tweet/repost", 2) == (reposts, 2)
+
+    def test_rejects_bad_cursor(self, test_client, test_db):
+        """Test that a malformed cursor is a 400."""
+        for path in ("/tweet", "/tweet/like"):
+            response = test_client.get(path, params={"cursor": "garbage"})
+
+            assert response.status_code == 400
+
+    def test_limit_is_capped(self, test_client):
+        """Test that page sizes above the cap are rejected."""
+        from src.pagination import MAX_PAGE_SIZE
+
+        response = test_client.get("/tweet", params={"limit": MAX_PAGE_SIZE + 1})
+
+        assert response.status_code == 422
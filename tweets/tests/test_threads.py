@@ -0,0 +1,170 @@
+import asyncio
+from datetime import timedelta
+from uuid import uuid4
+
+from src.models import ReplyTweet, Tweet
+from src.partitions import utcnow, uuid7
+
+
+def add_replies(db, parent_id, count, start=0):
+    """Add `count` replies to parent_id, one minute apart, oldest first."""
+    base = utcnow() + timedelta(hours=start)
+    replies = []
+    for i in range(count):
+        reply = ReplyTweet(uuid4(), parent_id, f"reply {i}")
+        reply.created_at = base + timedelta(minutes=i)
+        reply.id = uuid7(reply.created_at)
+        replies.append(reply)
+    db.add_all(replies)
+    db.commit()
+    return replies
+
+
+def ids(nodes):
+    return [node["id"] for node in nodes]
+
+
+class TestThreadEndpoint:
+    """Tests for GET /tweet/{tweet_id}/thread."""
+
+    def add_tweet(self, db):
+        tweet = Tweet(uuid4(), "root")
+        db.add(tweet)
+        db.commit()
+        return tweet
+
+    def test_nested_replies_bounded_by_depth_and_fan_out(self, test_client, test_db):
+        """Test that each level keeps its oldest fan_out replies and flags the rest."""
+        tweet = self.add_tweet(test_db)
+        top = add_replies(test_db, tweet.id, 2)
+        second = add_replies(test_db, top[0].id, 3, start=1)
+        add_replies(test_db, second[0].id, 1, start=2)
+
+        response = test_client.get(
+            f"/tweet/{tweet.id}/thread", params={"depth": 2, "fan_out": 2}
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["tweet"]["id"] == str(tweet.id)
+        assert ids(body["replys"]) == [str(r.id) for r in top]
+        assert body["next_cursor"] is None
+
+        first, last = body["replys"]
+        assert ids(first["replys"]) == [str(r.id) for r in second[:2]]
+        assert first["has_more_replys"] is True
+        assert last["replys"] == [] and last["has_more_replys"] is False
+
+        # Depth 2 stops here, but a reply with children is flagged.
+        assert first["replys"][0]["replys"] == []
+        assert first["replys"][0]["has_more_replys"] is True
+        assert first["replys"][1]["has_more_replys"] is False
+
+    def test_top_level_pages(self, test_client, test_db):
+        """Test that next_cursor walks every direct reply exactly once."""
+        tweet = self.add_tweet(test_db)
+        replies = add_replies(test_db, tweet.id, 5)
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, "depth": 1}
+            if cursor:
+                params["cursor"] = cursor
+            body = test_client.get(f"/tweet/{tweet.id}/thread", params=params).json()
+            seen += ids(body["replys"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == [str(r.id) for r in replies]
+
+    def test_thread_of_a_reply(self, test_client, test_db):
+        """Test that a reply's thread expands the replies under it."""
+        tweet = self.add_tweet(test_db)
+        (reply,) = add_replies(test_db, tweet.id, 1)
+        nested = add_replies(test_db, reply.id, 2, start=1)
+
+        body = test_client.get(f"/tweet/{reply.id}/thread").json()
+
+        assert body["tweet"]["id"] == str(reply.id)
+        assert ids(body["replys"]) == [str(r.id) for r in nested]
+
+    def test_unknown_and_malformed_ids(self, test_client, test_db):
+        """Test that unknown and malformed roots are a 404."""
+        assert test_client.get(f"/tweet/{uuid4()}/thread").status_code == 404
+        assert test_client.get("/tweet/not-a-uuid/thread").status_code == 404
+
+    def test_bad_cursor_and_limits(self, test_client, test_db):
+        """Test that a malformed cursor is a 400 and oversized bounds a 422."""
+        from src.threads import MAX_THREAD_DEPTH
+
+        tweet = self.add_tweet(test_db)
+
+        response = test_client.get(
+            f"/tweet/{tweet.id}/thread", params={"cursor": "garbage"}
+        )
+        assert response.status_code == 400
+
+        response = test_client.get(
+            f"/tweet/{tweet.id}/thread", params={"depth": MAX_THREAD_DEPTH + 1}
+        )
+        assert response.status_code == 422
+
+    def test_tweet_by_id_pages_replies(self, test_client, test_db):
+        """Test that GET /tweet/{id} returns a bounded page of replies."""
+        tweet = self.add_tweet(test_db)
+        replies = add_replies(test_db, tweet.id, 3)
+
+        body = test_client.get(f"/tweet/{tweet.id}", params={"limit": 2}).json()
+
+        assert ids(body["replys"]) == [str(r.id) for r in replies[:2]]
+        assert body["next_cursor"] is not None
+
+
+class TestLoadThread:
+    """Tests for the thread loader."""
+
+    def test_node_budget(self, test_db):
+        """Test that parents past the node budget are flagged, not expanded."""
+        from src.threads import load_thread
+
+        from tests.conftest import TestingAsyncSessionLocal
+
+        tweet = Tweet(uuid4(), "root")
+        test_db.add(tweet)
+        test_db.commit()
+        top = add_replies(test_db, tweet.id, 3)
+        for i, reply in enumerate(top):
+            add_replies(test_db, reply.id, 2, start=i + 1)
+
+        async def run():
+            async with TestingAsyncSessionLocal() as db:
+                return await load_thread(db, tweet.id, depth=2, fan_out=2, max_nodes=5)
+
+        thread = asyncio.run(run())
+
+        # 3 top-level replies leave room to expand one parent by fan_out=2.
+        expanded, *rest = thread["replys"]
+        assert len(expanded["replys"]) == 2
+        for node in rest:
+            assert node["replys"] == []
+            assert node["has_more_replys"] is True
+
+    def test_first_replies_many_parents(self, test_db):
+        """Test that parents beyond one UNION ALL chunk are all fetched."""
+        from src.threads import PARENTS_PER_QUERY, first_replies
+
+        from tests.conftest import TestingAsyncSessionLocal
+
+        parents = [uuid4() for _ in range(PARENTS_PER_QUERY + 5)]
+        for parent in parents:
+            add_replies(test_db, parent, 2)
+
+        async def run():
+            async with TestingAsyncSessionLocal() as db:
+                return await first_replies(db, parents, 1)
+
+        children = asyncio.run(run())
+
+        assert set(children) == set(parents)
+        assert all(len(replies) == 1 for replies in children.values())
@@ -0,0 +1,259 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import redis
+from src.dependencies.cache import TTLCache
+from src.dependencies.tweet_cache import MISSING, TweetCache, tweet_dict
+from src.grpc.server import AsyncTweetService, TweetService
+from src.grpc.server.tweet_service_pb2 import GetTweetsReq
+from src.models import Tweet
+
+from tests.conftest import FakeRedis
+
+
+def add_tweet(db, content="cached"):
+    tweet = Tweet(uuid4(), content)
+    db.add(tweet)
+    db.commit()
+    db.refresh(tweet)
+    return tweet
+
+
+def loader_for(*tweets):
+    """A loader over `tweets` that records the ids it was asked for."""
+    by_id = {tweet.id: tweet_dict(tweet) for tweet in tweets}
+    return MagicMock(side_effect=lambda ids: {i: by_id[i] for i in ids if i in by_id})
+
+
+class TestTweetCache:
+    """Tests for the two-level read-through tweet cache."""
+
+    def test_local_hit_skips_redis_and_loader(self, test_db):
+        """Test that a repeated read is answered in-process."""
+        tweet = add_tweet(test_db)
+        cache = TweetCache(FakeRedis())
+        load = loader_for(tweet)
+
+        assert cache.get(tweet.id, load)["content"] == "cached"
+        cache.redis = MagicMock()
+        assert cache.get(tweet.id, load)["content"] == "cached"
+
+        load.assert_called_once_with([tweet.id])
+        cache.redis.mget.assert_not_called()
+        assert cache.stats()["local"]["hits"] == 1
+
+    def test_redis_hit_fills_local_level(self, test_db):
+        """Test that another replica's Redis entry is used without the loader."""
+        tweet = add_tweet(test_db)
+        shared = FakeRedis()
+        TweetCache(shared).get(tweet.id, loader_for(tweet))
+
+        cache = TweetCache(shared)
+        load = loader_for(tweet)
+        assert cache.get(tweet.id, load)["id"] == str(tweet.id)
+        assert cache.get(tweet.id, load)["id"] == str(tweet.id)
+
+        load.assert_not_called()
+        stats = cache.stats()
+        assert (stats["redis"]["hits"], stats["local"]["hits"]) == (1, 1)
+
+    def test_get_many_loads_only_misses(self, test_db):
+        """Test that one loader call fetches every id missing from both levels."""
+        first, second, third = (add_tweet(test_db, str(n)) for n in range(3))
+        cache = TweetCache(FakeRedis())
+        cache.get(first.id, loader_for(first))
+        load = loader_for(first, second, third)
+
+        tweets = cache.get_many([third.id, first.id, second.id], load)
+
+        contents = [tweets[t.id]["content"] for t in (first, second, third)]
+        assert contents == ["0", "1", "2"]
+        load.assert_called_once_with([third.id, second.id])
+
+    def test_unknown_ids_are_cached_as_missing(self):
+        """Test that a miss is remembered with the negative TTL."""
+        fake = FakeRedis()
+        cache = TweetCache(fake, negative_ttl=7)
+        load = loader_for()
+        tweet_id = uuid4()
+
+        assert cache.get(tweet_id, load) is None
+        assert cache.get(tweet_id, load) is None
+
+        load.assert_called_once()
+        assert fake.values[TweetCache.key(tweet_id)] == MISSING
+        assert fake.ttls[TweetCache.key(tweet_id)] == 7
+        assert cache.stats()["negative_hits"] == 1
+
+    def test_negative_entries_expire_with_negative_ttl(self):
+        """Test that a short negative TTL also bounds the in-process entry."""
+        cache = TweetCache(FakeRedis(), l1_ttl=60, negative_ttl=0)
+        tweet_id = uuid4()
+        cache.get(tweet_id, loader_for())
+        cache.redis = FakeRedis()
+        load = loader_for()
+
+        assert cache.get(tweet_id, load) is None
+        load.assert_called_once()
+
+    def test_mark_deleted(self, test_db):
+        """Test that a deleted tweet reads as missing on both levels."""
+        tweet = add_tweet(test_db)
+        fake = FakeRedis()
+        cache = TweetCache(fake)
+        cache.get(tweet.id, loader_for(tweet))
+
+        cache.mark_deleted(tweet.id)
+
+        assert cache.get(tweet.id, loader_for(tweet)) is None
+        assert fake.values[TweetCache.key(tweet.id)] == MISSING
+
+    def test_invalidate(self, test_db):
+        """Test that invalidated tweets are read again from the loader."""
+        tweet = add_tweet(test_db)
+        fake = FakeRedis()
+        cache = TweetCache(fake)
+        cache.get(tweet.id, loader_for(tweet))
+
+        cache.invalidate(tweet.id)
+
+        assert TweetCache.key(tweet.id) not in fake.values
+        load = loader_for(tweet)
+        cache.get(tweet.id, load)
+        load.assert_called_once()
+
+    def test_redis_errors_fall_back_to_loader(self, test_db):
+        """Test that an unavailable Redis only costs a database read."""
+        tweet = add_tweet(test_db)
+        broken = MagicMock()
+        broken.mget.side_effect = redis.ConnectionError("down")
+        broken.pipeline.side_effect = redis.ConnectionError("down")
+        cache = TweetCache(broken)
+
+        assert cache.get(tweet.id, loader_for(tweet))["content"] == "cached"
+        assert cache.stats()["redis"]["errors"] == 2
+
+    def test_aget_many(self, test_db):
+        """Test the event-loop variant with a coroutine loader."""
+        tweet = add_tweet(test_db)
+        cache = TweetCache(FakeRedis())
+        missing = uuid4()
+
+        async def load(ids):
+            return {tweet.id: tweet_dict(tweet)} if tweet.id in ids else {}
+
+        tweets = asyncio.run(cache.aget_many([tweet.id, missing], load))
+
+        assert tweets[tweet.id]["content"] == "cached"
+        assert tweets[missing] is None
+
+    def test_counter_flush_invalidates(self, test_db, counter_buffer):
+        """Test that flushed like counts are not hidden by a stale entry."""
+        from src.dependencies.tweet_cache import tweet_cache, with_pending_counts
+
+        tweet = add_tweet(test_db)
+        load = loader_for(tweet)
+        tweet_cache.get(tweet.id, load)
+        counter_buffer.add(tweet.id, "num_likes", 2)
+
+        counter_buffer.flush()
+        test_db.refresh(tweet)
+        cached = tweet_cache.get(tweet.id, loader_for(tweet))
+
+        assert with_pending_counts(cached)["num_likes"] == 2
+
+
+    def test_flush_during_load_is_not_cached(self, test_db, counter_buffer):
+        """Test that counts read before a flush are not cached after it."""
+        from src.dependencies.tweet_cache import tweet_cache, with_pending_counts
+
+        tweet = add_tweet(test_db)
+        counter_buffer.add(tweet.id, "num_likes", 2)
+        stale = tweet_dict(tweet)
+
+        def load(ids):
+            # The flush commits, invalidates and clears its deltas after
+            # this read.
+            counter_buffer.flush()
+            return {tweet.id: stale}
+
+        tweet_cache.get(tweet.id, load)
+        test_db.refresh(tweet)
+        cached = tweet_cache.get(tweet.id, loader_for(tweet))
+
+        assert TweetCache.key(tweet.id) in tweet_cache.redis.values
+        assert with_pending_counts(cached)["num_likes"] == 2
+
+
+class TestTweetCacheReads:
+    """Tests that the REST route and the gRPC servicers read through the cache."""
+
+    def test_rest_reads_through_cache(self, test_client, test_db):
+        """Test that GET /tweet/{id} serves repeat reads without the database."""
+        tweet = add_tweet(test_db)
+
+        assert test_client.get(f"/tweet/{tweet.id}").status_code == 200
+        assert test_client.get(f"/tweet/{tweet.id}").status_code == 200
+
+        stats = test_client.get("/metrics/cache").json()["tweet_cache"]
+        assert stats["database"]["loaded"] == 1
+        assert stats["local"]["hits"] == 1
+
+    def test_rest_pending_likes_bypass_cache(self, test_client, test_db):
+        """Test that a like shows up on a cached tweet before it is flushed."""
+        tweet = add_tweet(test_db)
+        test_client.get(f"/tweet/{tweet.id}")
+
+        test_client.post(f"/tweet/like/{tweet.id}")
+
+        assert test_client.get(f"/tweet/{tweet.id}").json()["tweet"]["num_likes"] == 1
+
+    def test_deleted_tweet_is_gone(self, test_client, test_db, mock_user_token):
+        """Test that deleting a cached tweet makes reads 404."""
+        from uuid import UUID
+
+        tweet = Tweet(UUID(mock_user_token.id), "mine")
+        test_db.add(tweet)
+        test_db.commit()
+        assert test_client.get(f"/tweet/{tweet.id}").status_code == 200
+
+        assert test_client.delete(f"/tweet/{tweet.id}").status_code == 200
+
+        assert test_client.get(f"/tweet/{tweet.id}").status_code == 404
+
+    def test_grpc_keeps_request_order(self, test_db):
+        """Test that cached and loaded tweets come back in request order."""
+        first, second = add_tweet(test_db, "first"), add_tweet(test_db, "second")
+        request = GetTweetsReq(tweet_ids=[str(second.id), str(uuid4()), str(first.id)])
+
+        with patch("src.grpc.server.SessionLocal", return_value=test_db):
+            warm = GetTweetsReq(tweet_ids=[str(first.id)])
+            TweetService().GetTweets(warm, MagicMock())
+            response = TweetService().GetTweets(request, MagicMock())
+
+        assert [tweet.content for tweet in response.tweets] == ["second", "first"]
+
+    def test_async_grpc_uses_cache(self, test_db):
+        """Test that the asyncio servicer skips the session for cached tweets."""
+        from tests.conftest import TestingAsyncSessionLocal
+
+        tweet = add_tweet(test_db)
+        request = GetTweetsReq(tweet_ids=[str(tweet.id)])
+        service = AsyncTweetService(TestingAsyncSessionLocal)
+        asyncio.run(service.GetTweets(request, MagicMock()))
+
+        session_factory = MagicMock()
+        service = AsyncTweetService(session_factory)
+        response = asyncio.run(service.GetTweets(request, MagicMock()))
+
+        assert [t.content for t in response.tweets] == ["cached"]
+        session_factory.assert_not_called()
+
+
+def test_ttl_cache_default_distinguishes_none():
+    """Test that a stored None is returned rather than the default."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("k", None)
+
+    assert cache.get("k", "absent") is None
@@ -0,0 +1,192 @@
+import json
+from datetime import datetime
+from unittest.mock import patch
+from uuid import uuid4
+
+from src.models import OutboxEvent, Tweet
+from src.partitions import id_time, uuid7
+from src.tweet_import import TweetImporter, parse_tweet
+
+
+class TestTweetImporter:
+    """Tests for bulk tweet imports."""
+
+    def test_parse_tweet(self):
+        """Test tweet parsing from dicts and sequences."""
+        user_id = uuid4()
+
+        row = parse_tweet({"user_id": str(user_id), "content": "hi"})
+        assert (row["user_id"], row["content"], row["num_likes"]) == (user_id, "hi", 0)
+        row = parse_tweet([str(user_id), "hi", "2024-01-01T12:00:00+02:00"])
+        assert row["created_at"].isoformat() == "2024-01-01T10:00:00"
+        assert parse_tweet({"user_id": "nope", "content": "hi"}) is None
+        assert parse_tweet({"user_id": str(user_id), "content": ""}) is None
+        assert parse_tweet({"user_id": str(user_id)}) is None
+        assert parse_tweet(None) is None
+
+    def test_parse_tweet_keeps_ids_and_created_at_together(self):
+        """Test that UUIDv7 ids and created_at always agree."""
+        user_id = str(uuid4())
+        created_at = datetime(2023, 5, 6, 7, 8, 9)
+
+        row = parse_tweet([user_id, "old", created_at.isoformat()])
+        assert id_time(row["id"]) == created_at
+        id = str(uuid7(created_at))
+        row = parse_tweet({"id": id, "user_id": user_id, "content": "x"})
+        assert row["created_at"] == created_at
+        mismatched = {
+            "id": str(uuid7(created_at)),
+            "user_id": user_id,
+            "content": "x",
+            "created_at": "2024-01-01T00:00:00",
+        }
+        assert parse_tweet(mismatched) is None
+
+    def test_import_batches_rows_events_and_counts(self, test_db, counter_deltas):
+        """Test one INSERT and a few list events per chunk, one delta per author."""
+        alice, bob = uuid4(), uuid4()
+        tweets = [{"user_id": str(alice), "content": f"a{i}"} for i in range(5)]
+        tweets += [{"user_id": str(bob), "content": "b"}, {"user_id": "bad"}]
+
+        importer = TweetImporter(test_db, chunk_size=100, event_batch_size=4)
+        importer.import_tweets(tweets)
+        result = importer.finish()
+
+        assert (result["inserted"], result["invalid"], result["events"]) == (6, 1, 4)
+        assert test_db.query(Tweet).count() == 6
+        events = test_db.query(OutboxEvent).order_by(OutboxEvent.id).all()
+        assert [(e.queue, e.routing_key, len(e.payload)) for e in events] == [
+            ("general_tweets", "general_tweets", 4),
+            ("tweet_events", "tweet.create.batch", 4),
+            ("general_tweets", "general_tweets", 2),
+            ("tweet_events", "tweet.create.batch", 2),
+        ]
+        assert set(events[0].payload[0]) >= {"id", "user_id", "content", "created_at"}
+        counter_deltas.send.assert_called_once()
+        assert counter_deltas.send.call_args.args[0] == {str(alice): 5, str(bob): 1}
+
+    def test_finish_retries_counts_until_sent(self, test_db, counter_deltas):
+        """Test that finish keeps resending the deltas within its timeout."""
+        user_id = str(uuid4())
+        counter_deltas.send.side_effect = [False, RuntimeError("down"), True]
+        importer = TweetImporter(test_db)
+        importer.import_tweets([{"user_id": user_id, "content": "x"}])
+
+        with patch("src.tweet_import.time.sleep") as sleep:
+            result = importer.finish(timeout=60)
+
+        assert result["counts_sent"]
+        assert result["unsent_deltas"] == {}
+        assert [c.args[0] for c in sleep.call_args_list] == [1.0, 2.0]
+        assert counter_deltas.send.call_count == 3
+
+    def test_finish_reports_unsent_counts(self, test_db, counter_deltas):
+        """Test that deltas still unsent at the deadline are returned."""
+        user_id = str(uuid4())
+        counter_deltas.send.return_value = False
+        importer = TweetImporter(test_db)
+        importer.import_tweets([{"user_id": user_id, "content": "x"}] * 2)
+
+        clock = [0.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        with patch("src.tweet_import.time.monotonic", lambda: clock[0]), patch(
+            "src.tweet_import.time.sleep", sleep
+        ):
+            result = importer.finish(timeout=5)
+
+        assert not result["counts_sent"]
+        assert result["unsent_deltas"] == {user_id: 2}
+        assert counter_deltas.send.call_count == 3
+
+    def test_rerun_with_ids_skips_existing(self, test_db, counter_deltas):
+        """Test that tweets carrying ids are not inserted or counted twice."""
+        user_id = str(uuid4())
+        tweets = [
+            {"id": str(uuid4()), "user_id": user_id, "content": "x"} for _ in range(3)
+        ]
+
+        TweetImporter(test_db).import_tweets(tweets)
+        importer = TweetImporter(test_db, chunk_size=2)
+        importer.import_tweets(tweets + tweets[:1])
+
+        assert importer.summary()["inserted"] == 0
+        assert importer.summary()["skipped"] == 4
+        assert importer.summary()["events"] == 0
+        assert test_db.query(Tweet).count() == 3
+        assert counter_deltas.pending(user_id) == 3
+
+    def test_supplied_ids_leave_negative_cache(self, test_db, fake_redis):
+        """Test that an imported id cached as missing becomes readable."""
+        from src.dependencies.tweet_cache import tweet_cache
+
+        tweet_id = uuid4()
+        assert tweet_cache.get(tweet_id, lambda ids: {}) is None
+
+        TweetImporter(test_db).import_tweets(
+            [{"id": str(tweet_id), "user_id": str(uuid4()), "content": "late"}]
+        )
+
+        tweet = tweet_cache.get(tweet_id, lambda ids: {tweet_id: {"content": "late"}})
+        assert tweet == {"content": "late"}
+
+
+class TestBulkTweetEndpoint:
+    """Tests for POST /tweets/bulk."""
+
+    def test_requires_admin_token(self, test_client):
+        """Test that the endpoint is closed without the admin token."""
+        with patch("src.dependencies.auth.ADMIN_TOKEN", "secret"):
+            response = test_client.post("/tweets/bulk", json=[])
+
+        assert response.status_code == 403
+
+    def test_json_import(self, test_client, test_db):
+        """Test importing a JSON tweet list."""
+        tweets = [{"user_id": str(uuid4()), "content": "hello"} for _ in range(3)]
+
+        with patch("src.dependencies.auth.ADMIN_TOKEN", "secret"):
+            response = test_client.post(
+                "/tweets/bulk",
+                json={"tweets": tweets + [{"content": "no author"}]},
+                headers={"X-Admin-Token": "secret"},
+            )
+
+        assert response.status_code == 200
+        assert response.json()["result"]["inserted"] == 3
+        assert response.json()["result"]["invalid"] == 1
+        assert test_db.query(Tweet).count() == 3
+
+    def test_ndjson_import(self, test_client, test_db):
+        """Test importing a streamed NDJSON body."""
+        lines = [
+            json.dumps({"user_id": str(uuid4()), "content": f"line {i}"})
+            for i in range(4)
+        ]
+
+        with patch("src.dependencies.auth.ADMIN_TOKEN", "secret"):
+            response = test_client.post(
+                "/tweets/bulk",
+                content="\n".join(lines + ["{not json"]) + "\n",
+                headers={
+                    "X-Admin-Token": "secret",
+                    "Content-Type": "application/x-ndjson",
+                },
+            )
+
+        assert response.status_code == 200
+        assert response.json()["result"]["inserted"] == 4
+        assert response.json()["result"]["invalid"] == 1
+
+    def test_rejects_non_list(self, test_client):
+        """Test that a body without a tweet list is a 400."""
+        with patch("src.dependencies.auth.ADMIN_TOKEN", "secret"):
+            response = test_client.post(
+                "/tweets/bulk",
+                json={"tweets": "nope"},
+                headers={"X-Admin-Token": "secret"},
+            )
+
+        assert response.status_code == 400
@@ -0,0 +1 @@
+# Users Service Benchmarks
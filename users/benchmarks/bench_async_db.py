@@ -0,0 +1,101 @@
+"""
+Sync vs async database throughput benchmark.
+
+Runs the login lookup (SELECT actors WHERE email = ?) against the configured
+Postgres database, once through the sync engine on a thread pool and once
+through the asyncpg engine on the event loop, with the same number of
+concurrent workers and the same connection pool size for both.
+
+Requires a reachable database (DB_* settings). Usage (from the users/ directory):
+    python -m benchmarks.bench_async_db --workers 10 --requests 5000
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.dependencies.db import DB_ASYNC_DRIVER, init_db, url
+from src.models import User
+
+BENCH_EMAIL = "bench-async-db@example.com"
+
+
+def seed(session_factory):
+    with session_factory() as db:
+        if not db.execute(select(User).filter_by(email=BENCH_EMAIL)).first():
+            db.add(User(BENCH_EMAIL, None, "bench-async-db", password_hash="x"))
+            db.commit()
+
+
+def bench_sync(workers: int, requests: int) -> float:
+    engine = create_engine(url, pool_size=workers, max_overflow=0)
+    session_factory = sessionmaker(bind=engine)
+    seed(session_factory)
+
+    def lookup(_):
+        with session_factory() as db:
+            db.execute(select(User).filter_by(email=BENCH_EMAIL)).scalars().first()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lookup, range(workers)))  # warm the pool
+        start = time.perf_counter()
+        list(pool.map(lookup, range(requests)))
+        elapsed = time.perf_counter() - start
+
+    engine.dispose()
+    return requests / elapsed
+
+
+async def bench_async(workers: int, requests: int) -> float:
+    engine = create_async_engine(
+        url.set(drivername=f"postgresql+{DB_ASYNC_DRIVER}"),
+        pool_size=workers,
+        max_overflow=0,
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def lookup():
+        async with session_factory() as db:
+            result = await db.execute(select(User).filter_by(email=BENCH_EMAIL))
+            result.scalars().first()
+
+    async def worker(count: int):
+        for _ in range(count):
+            await lookup()
+
+    await asyncio.gather(*(lookup() for _ in range(workers)))  # warm the pool
+    start = time.perf_counter()
+    per_worker, extra = divmod(requests, workers)
+    await asyncio.gather(
+        *(worker(per_worker + (i < extra)) for i in range(workers))
+    )
+    elapsed = time.perf_counter() - start
+
+    await engine.dispose()
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    init_db()
+
+    sync_rps = bench_sync(args.workers, args.requests)
+    async_rps = asyncio.run(bench_async(args.workers, args.requests))
+
+    print(f"workers:               {args.workers}")
+    print(f"sync (thread pool):    {sync_rps:10.0f} req/s")
+    print(f"async ({DB_ASYNC_DRIVER}):       {async_rps:10.0f} req/s")
+    print(f"ratio:                 {async_rps / sync_rps:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Per-request authentication cost benchmark.
+
+Compares the cost of verifying a bearer token with a full decode_jwt on every
+request against the verified-token cache used by VerifyToken.
+
+Usage (from the users/ directory):
+    python -m benchmarks.bench_auth --requests 100000 --tokens 100
+"""
+
+import argparse
+import time
+
+from src.dependencies import auth
+
+
+def bench(fn, tokens: list[str], requests: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        fn(tokens[i % len(tokens)])
+    return (time.perf_counter() - start) / requests
+
+
+def uncached(token: str):
+    payload = auth.decode_jwt(token)
+    return auth.UserToken(payload["user_id"], payload["username"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--tokens", type=int, default=100)
+    args = parser.parse_args()
+
+    tokens = [auth.sign_jwt(f"user-{i}", f"user{i}") for i in range(args.tokens)]
+
+    auth.token_cache.clear()
+    before = bench(uncached, tokens, args.requests)
+    after = bench(auth.verify_token, tokens, args.requests)
+
+    print(f"decode_jwt per request:   {before * 1e6:8.2f} us")
+    print(f"verify_token (cached):    {after * 1e6:8.2f} us")
+    print(f"speedup:                  {before / after:8.1f}x")
+    print(f"cache stats:              {auth.token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Follow-state lookup latency benchmark.
+
+Times CheckFollows for one viewer against --targets ids, once answered by the
+index-only query on unique_follow and once from the viewer's cached following
+set in Redis. Seeds the viewer's follows on first run.
+
+Requires the configured database and Redis. Usage (from the users/ directory):
+    python -m benchmarks.bench_follow_lookup --targets 500 --follows 5000
+"""
+
+import argparse
+import statistics
+import time
+from unittest.mock import MagicMock
+from uuid import NAMESPACE_URL, UUID, uuid5
+
+import src.grpc.user_service_pb2 as pb2
+from src.dependencies.db import SessionLocal, init_db
+from src.dependencies.follow_cache import follow_cache
+from src.follow_import import FollowImporter
+from src.grpc.server import UserService
+
+VIEWER_ID = uuid5(NAMESPACE_URL, "bench-follow-lookup")
+
+
+def seed(follows: int) -> list[UUID]:
+    followed = [uuid5(VIEWER_ID, str(i)) for i in range(follows)]
+    db = SessionLocal()
+    try:
+        FollowImporter(db).import_edges((VIEWER_ID, f) for f in followed)
+    finally:
+        db.close()
+    return followed
+
+
+def timed(request, rounds: int) -> list[float]:
+    service = UserService()
+    context = MagicMock()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        service.CheckFollows(request, context)
+        samples.append((time.perf_counter() - start) * 1e3)
+    return samples
+
+
+def report(name: str, samples: list[float]):
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{name:<22} p50 {statistics.median(samples):7.3f} ms   p99 {p99:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--targets", type=int, default=500)
+    parser.add_argument("--follows", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    init_db()
+    followed = seed(args.follows)
+    # Half followed, half not.
+    half = args.targets // 2
+    strangers = [uuid5(NAMESPACE_URL, f"stranger-{i}") for i in range(args.targets - half)]
+    targets = followed[:half] + strangers
+    request = pb2.CheckFollowsReq(
+        viewer_id=str(VIEWER_ID), target_ids=[str(t) for t in targets]
+    )
+
+    follow_cache.invalidate(VIEWER_ID)
+    report("index-only query", timed(request, args.rounds))
+
+    follow_cache.get_following(VIEWER_ID, lambda: followed)
+    report("cached following set", timed(request, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Thread-pool vs grpc.aio server load test.
+
+Starts the users gRPC server in a child process, once per mode, and drives
+GetUser from an asyncio client with a fixed number of requests in flight.
+Profile caching is disabled and the database is replaced by a loader that
+sleeps for --latency ms (time.sleep in the thread servicer, asyncio.sleep in
+the async one), so the run measures how many slow RPCs each server keeps
+in flight rather than database throughput.
+
+Usage (from the users/ directory):
+    python -m benchmarks.bench_grpc_server --concurrency 100 --requests 5000
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+from concurrent import futures
+from uuid import uuid4
+
+import grpc
+
+import src.grpc.user_service_pb2 as pb2
+import src.grpc.user_service_pb2_grpc as pb2_grpc
+
+
+class NullRedis:
+    """Redis stand-in that never has a profile cached."""
+
+    def mget(self, keys):
+        return [None] * len(keys)
+
+    def delete(self, *keys):
+        pass
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def set(self, *args, **kwargs):
+        pass
+
+    def execute(self):
+        return []
+
+
+def fake_profile(user_id):
+    return {
+        "id": str(user_id),
+        "email": "bench@example.com",
+        "username": "bench",
+        "num_tweets": 0,
+        "num_followers": 0,
+        "created_at": None,
+    }
+
+
+def run_server(mode: str, port: int, workers: int, latency: float, ready):
+    import src.grpc.server as server_module
+    from src.dependencies.cache import TTLCache
+    from src.dependencies.profile_cache import profile_cache
+
+    profile_cache.redis = NullRedis()
+    profile_cache.local = TTLCache(maxsize=0)
+
+    def load_profiles(user_ids):
+        time.sleep(latency)
+        return {user_id: fake_profile(user_id) for user_id in user_ids}
+
+    server_module.load_profiles = load_profiles
+
+    class BenchAsyncUserService(server_module.AsyncUserService):
+        async def load_profiles(self, user_ids):
+            await asyncio.sleep(latency)
+            return {user_id: fake_profile(user_id) for user_id in user_ids}
+
+    if mode == "thread":
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers))
+        pb2_grpc.add_UserServicer_to_server(server_module.UserService(), server)
+        server.add_insecure_port(f"127.0.0.1:{port}")
+        server.start()
+        ready.set()
+        server.wait_for_termination()
+        return
+
+    async def serve():
+        server = grpc.aio.server(
+            migration_thread_pool=futures.ThreadPoolExecutor(max_workers=workers)
+        )
+        pb2_grpc.add_UserServicer_to_server(BenchAsyncUserService(None), server)
+        server.add_insecure_port(f"127.0.0.1:{port}")
+        await server.start()
+        ready.set()
+        await server.wait_for_termination()
+
+    asyncio.run(serve())
+
+
+async def load(port: int, concurrency: int, requests: int) -> tuple[float, list[float]]:
+    latencies = []
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+        stub = pb2_grpc.UserStub(channel)
+
+        async def call():
+            start = time.perf_counter()
+            await stub.GetUser(pb2.GetUserReq(user_id=str(uuid4())))
+            latencies.append(time.perf_counter() - start)
+
+        async def worker(count: int):
+            for _ in range(count):
+                await call()
+
+        await asyncio.gather(*(call() for _ in range(concurrency)))  # warm up
+        latencies.clear()
+
+        per_worker, extra = divmod(requests, concurrency)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(worker(per_worker + (i < extra)) for i in range(concurrency))
+        )
+        elapsed = time.perf_counter() - start
+
+    return requests / elapsed, latencies
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=10, help="thread pool size")
+    parser.add_argument("--latency", type=float, default=5.0, help="loader ms")
+    parser.add_argument("--port", type=int, default=50151)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    print(
+        f"{args.requests} GetUser calls, {args.concurrency} in flight, "
+        f"{args.latency:g} ms loader, {args.workers} workers"
+    )
+    for mode in ("thread", "aio"):
+        ready = ctx.Event()
+        server = ctx.Process(
+            target=run_server,
+            args=(mode, args.port, args.workers, args.latency / 1000, ready),
+            daemon=True,
+        )
+        server.start()
+        ready.wait()
+        try:
+            rps, latencies = asyncio.run(
+                load(args.port, args.concurrency, args.requests)
+            )
+        finally:
+            server.terminate()
+            server.join()
+
+        print(
+            f"  {mode:<6}  {rps:8.0f} rps  "
+            f"p50 {percentile(latencies, 50) * 1000:6.1f} ms  "
+            f"p99 {percentile(latencies, 99) * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Password hashing throughput benchmark.
+
+Measures how many bcrypt verifications (one per login) the PasswordHasher can
+complete per second, and how that scales per worker process.
+
+Usage (from the users/ directory):
+    python -m benchmarks.bench_hashing --workers 4 --logins 200 --rounds 12
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.dependencies.hashing import HasherBusy, PasswordHasher
+
+
+async def run(workers: int, logins: int, rounds: int, concurrency: int) -> dict:
+    hasher = PasswordHasher(workers=workers, max_pending=concurrency, rounds=rounds)
+    try:
+        hashed = await hasher.hash("benchmark-password")
+
+        # Warm the pool so process start-up is not counted.
+        await asyncio.gather(
+            *(hasher.verify("benchmark-password", hashed) for _ in range(workers))
+        )
+
+        semaphore = asyncio.Semaphore(concurrency)
+        rejected = 0
+
+        async def login():
+            nonlocal rejected
+            async with semaphore:
+                try:
+                    await hasher.verify("benchmark-password", hashed)
+                except HasherBusy:
+                    rejected += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+    finally:
+        hasher.shutdown()
+
+    completed = logins - rejected
+    return {
+        "workers": workers,
+        "rounds": rounds,
+        "logins": completed,
+        "rejected": rejected,
+        "seconds": elapsed,
+        "logins_per_sec": completed / elapsed,
+        "logins_per_sec_per_core": completed / elapsed / workers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'rounds':>7} {'logins/s':>10} {'per core':>10}")
+    for workers in args.workers:
+        result = asyncio.run(run(workers, args.logins, args.rounds, args.concurrency))
+        print(
+            f"{result['workers']:>8} {result['rounds']:>7} "
+            f"{result['logins_per_sec']:>10.1f} "
+            f"{result['logins_per_sec_per_core']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
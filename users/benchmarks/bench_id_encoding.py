@@ -0,0 +1,96 @@
+"""
+gRPC id encoding benchmark.
+
+Compares payload size and encode/decode cost of follower lists and user
+batches sent as UUID strings against the packed 16-byte encoding.
+
+Usage (from the users/ directory):
+    python -m benchmarks.bench_id_encoding --ids 10000 --rounds 50
+"""
+
+import argparse
+import time
+from uuid import UUID, uuid4
+
+import src.grpc.user_service_pb2 as pb2
+from src.grpc.ids import pack_ids, unpack_ids
+
+
+def bench(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def followers_as_strings(ids: list[UUID]) -> bytes:
+    return pb2.FollowIdsChunk(user_ids=[str(i) for i in ids]).SerializeToString()
+
+
+def followers_packed(ids: list[UUID]) -> bytes:
+    return pb2.FollowIdsChunk(packed_ids=pack_ids(ids)).SerializeToString()
+
+
+def parse_strings(payload: bytes) -> list[UUID]:
+    return [UUID(i) for i in pb2.FollowIdsChunk.FromString(payload).user_ids]
+
+
+def parse_packed(payload: bytes) -> list[UUID]:
+    return unpack_ids(pb2.FollowIdsChunk.FromString(payload).packed_ids)
+
+
+def users_response(ids: list[UUID], packed: bool) -> bytes:
+    users = []
+    for i, user_id in enumerate(ids):
+        id_field = {"id_bytes": user_id.bytes} if packed else {"id": str(user_id)}
+        users.append(
+            pb2.GetUserRes(
+                valid=True,
+                user=pb2.UserStruct(
+                    **id_field, email=f"user{i}@example.com", username=f"user{i}"
+                ),
+            )
+        )
+    return pb2.GetUsersRes(users=users).SerializeToString()
+
+
+def report(name: str, strings: float, packed: float):
+    print(f"{name:<28} {strings * 1e3:9.3f} ms {packed * 1e3:9.3f} ms "
+          f"{strings / packed:6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ids", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    ids = [uuid4() for _ in range(args.ids)]
+    string_payload = followers_as_strings(ids)
+    packed_payload = followers_packed(ids)
+    users_strings = users_response(ids[:1000], packed=False)
+    users_packed = users_response(ids[:1000], packed=True)
+
+    print(f"{args.ids} follower ids:")
+    print(f"  strings payload:            {len(string_payload):>9} bytes")
+    print(f"  packed payload:             {len(packed_payload):>9} bytes "
+          f"({len(string_payload) / len(packed_payload):.1f}x smaller)")
+    print("1000-user GetUsers response:")
+    print(f"  strings payload:            {len(users_strings):>9} bytes")
+    print(f"  packed payload:             {len(users_packed):>9} bytes")
+    print()
+    print(f"{'':<28} {'strings':>12} {'packed':>12} {'speedup':>7}")
+    report(
+        "encode follower chunk",
+        bench(lambda: followers_as_strings(ids), args.rounds),
+        bench(lambda: followers_packed(ids), args.rounds),
+    )
+    report(
+        "decode follower chunk",
+        bench(lambda: parse_strings(string_payload), args.rounds),
+        bench(lambda: parse_packed(packed_payload), args.rounds),
+    )
+
+
+if __name__ == "__main__":
+    main()
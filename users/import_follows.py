@@ -0,0 +1,65 @@
+"""
+Bulk-import follow edges into the users database.
+
+Reads NDJSON ({"follower_id": ..., "following_id": ...} per line) or CSV
+(follower_id,following_id per line) from a file or stdin, inserts the edges
+in chunks, then recomputes num_followers for every followed user.
+
+Usage (from the users/ directory):
+    python import_follows.py edges.ndjson
+    python import_follows.py --format csv --chunk-size 10000 < edges.csv
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from src.dependencies.db import SessionLocal
+from src.follow_import import FOLLOW_IMPORT_CHUNK_SIZE, FollowImporter
+
+
+def read_ndjson(lines):
+    for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def read_csv(lines):
+    for row in csv.reader(lines):
+        if row and row[0] != "follower_id":
+            yield row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", help="input file (default: stdin)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    parser.add_argument("--chunk-size", type=int, default=FOLLOW_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if args.path and args.path.endswith(".csv") else "ndjson"
+
+    source = open(args.path, newline="") if args.path else sys.stdin
+    reader = read_csv if fmt == "csv" else read_ndjson
+
+    db = SessionLocal()
+    try:
+        importer = FollowImporter(db, chunk_size=args.chunk_size)
+        importer.import_edges(reader(source))
+        result = importer.finish()
+    finally:
+        db.close()
+        if source is not sys.stdin:
+            source.close()
+
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,10 @@ from fastapi import FastAPI
 
 from src.grpc.server import serve
 
+from src.dependencies.availability import availability
 from src.dependencies.config import Config
+from src.dependencies.counters import counter_buffer
+from src.dependencies.hashing import password_hasher
 
 # OpenTelemetry Components
 from opentelemetry import trace
@@ -37,8 +40,15 @@ class App:
 
     def startup_event(self):
         self.grpc_startup_event()
+        counter_buffer.start()
+        availability.start()
         print(f"Server initialized")
 
+    def shutdown_event(self):
+        availability.stop()
+        counter_buffer.stop()
+        password_hasher.shutdown()
+
     def grpc_startup_event(self):
         # Start grpc
         grpc_thread = Thread(target=serve)
@@ -58,7 +68,9 @@ class App:
 
         trace.set_tracer_provider(provider)
 
-        app = FastAPI(on_startup=[self.startup_event])
+        app = FastAPI(
+            on_startup=[self.startup_event], on_shutdown=[self.shutdown_event]
+        )
 
         FastAPIInstrumentor.instrument_app(app)
         RequestsInstrumentor().instrument()
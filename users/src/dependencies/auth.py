@@ -1,15 +1,19 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from fastapi import HTTPException, Request, Depends
+from fastapi import Header, HTTPException, Request, Depends
 
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from src.dependencies.cache import TTLCache
 from src.dependencies.config import Config
 
 from typing import Dict
 
 import os
 import logging
+import hashlib
+import hmac
+import time
 import jwt
 
 logger = logging.getLogger(__name__)
@@ -33,6 +37,9 @@ if not JWT_SECRET:
 
 JWT_ALGO = os.getenv("JWT_ALGO") or config.get("JWT_ALGO", "HS256")
 
+# Shared secret for operator-only endpoints; they are disabled when unset.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or config.get("ADMIN_TOKEN")
+
 security = HTTPBearer()
 
 
@@ -70,20 +77,51 @@ def decode_jwt(token: str) -> Dict:
         return {}
 
 
-async def VerifyToken(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
+# Verified tokens are cached by digest so repeat requests skip HMAC and
+# claim parsing. Entries expire at the token's own exp claim, capped at
+# TOKEN_CACHE_MAX_TTL seconds.
+TOKEN_CACHE_SIZE = int(config.get("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_MAX_TTL = float(config.get("TOKEN_CACHE_MAX_TTL", "900"))
 
-    try:
-        payload = decode_jwt(token)
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_MAX_TTL)
 
-        user_id: str = payload["user_id"]
-        username: str = payload["username"]
 
-        decoded_token = UserToken(user_id, username)
+def verify_token(token: str) -> UserToken:
+    key = hashlib.sha256(token.encode("utf-8")).digest()
 
-        return decoded_token
+    cached = token_cache.get(key)
+    if cached is not None:
+        return cached
+
+    payload = decode_jwt(token)
+
+    user_id: str = payload["user_id"]
+    username: str = payload["username"]
+
+    decoded_token = UserToken(user_id, username)
+
+    expires_at = time.time() + TOKEN_CACHE_MAX_TTL
+    if "exp" in payload:
+        expires_at = min(expires_at, float(payload["exp"]))
+    token_cache.set(key, decoded_token, expires_at=expires_at)
+
+    return decoded_token
+
+
+async def VerifyToken(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+
+    try:
+        return verify_token(token)
 
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=403, detail="Expired JWT Token")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=403, detail="Invalid JWT Token")
+
+
+async def VerifyAdminToken(x_admin_token: str = Header(default="")):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="admin endpoints disabled")
+    if not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="invalid admin token")
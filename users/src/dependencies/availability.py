@@ -0,0 +1,251 @@
+import logging
+import threading
+from datetime import timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.dependencies.bloom import BloomFilter
+from src.dependencies.config import Config
+
+logger = logging.getLogger(__name__)
+config = Config()
+
+AVAILABILITY_FILTER_CAPACITY = int(
+    config.get("AVAILABILITY_FILTER_CAPACITY", "1000000")
+)
+AVAILABILITY_FILTER_ERROR_RATE = float(
+    config.get("AVAILABILITY_FILTER_ERROR_RATE", "0.01")
+)
+# Seconds between pulls of users registered on other replicas.
+AVAILABILITY_REFRESH_INTERVAL = float(
+    config.get("AVAILABILITY_REFRESH_INTERVAL", "30")
+)
+
+# Each refresh re-reads rows created this long before the newest one seen, to
+# catch registrations that committed after a later-stamped row.
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+FIELDS = ("username", "email")
+
+
+class AvailabilityIndex:
+    """
+    Bloom filter of every taken username and email.
+
+    A miss proves a value is free without touching the database; a hit may be
+    a false positive, so it is confirmed with an indexed lookup. The filter is
+    built from the actors table by load(), kept current by add() after each
+    local registration and by refresh() for registrations on other replicas.
+    Until the first load succeeds every check goes to the database.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        capacity: int = AVAILABILITY_FILTER_CAPACITY,
+        error_rate: float = AVAILABILITY_FILTER_ERROR_RATE,
+        interval: float = AVAILABILITY_REFRESH_INTERVAL,
+    ) -> None:
+        self.session_factory = session_factory
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.interval = interval
+
+        self.filter: Optional[BloomFilter] = None
+        self._watermark = None
+        # Values added while a load is building its filter, replayed into it.
+        self._added_during_load: Optional[list[str]] = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.checks = 0
+        self.filtered = 0
+        self.false_positives = 0
+
+    @staticmethod
+    def _key(field: str, value: str) -> str:
+        return f"{field}:{value}"
+
+    def might_be_taken(self, field: str, value: str) -> bool:
+        """False only when value is certainly not taken."""
+        key = self._key(field, value)
+        with self._lock:
+            self.checks += 1
+            if self.filter is None or key in self.filter:
+                return True
+            self.filtered += 1
+            return False
+
+    def add(self, username: str, email: str):
+        keys = [self._key("username", username), self._key("email", email)]
+        with self._lock:
+            if self.filter is not None:
+                for key in keys:
+                    self.filter.add(key)
+            if self._added_during_load is not None:
+                self._added_during_load.extend(keys)
+
+    async def taken(self, db: AsyncSession, **values: Optional[str]) -> dict[str, bool]:
+        """
+        Whether each given field value (username=..., email=...) is taken,
+        querying the database only for possible positives.
+        """
+        from src.models import User
+
+        result = {}
+        for field, value in values.items():
+            if value is None:
+                continue
+            if not self.might_be_taken(field, value):
+                result[field] = False
+                continue
+
+            column = getattr(User, field)
+            row = await db.execute(select(User.id).where(column == value).limit(1))
+            result[field] = row.first() is not None
+            if not result[field] and self.filter is not None:
+                with self._lock:
+                    self.false_positives += 1
+        return result
+
+    def load(self) -> int:
+        """Rebuild the filter from the actors table. Returns the row count."""
+        from src.models import User
+
+        with self._load_lock:
+            with self._lock:
+                self._added_during_load = []
+
+            try:
+                db = self._session()
+                try:
+                    rows = db.execute(select(func.count(User.id))).scalar_one()
+                    # Leave headroom so growth does not degrade the error rate
+                    # before the next restart.
+                    new_filter = BloomFilter(
+                        max(self.capacity, 2 * rows), self.error_rate
+                    )
+                    watermark = self._fill(db, new_filter, select(User))
+                finally:
+                    db.close()
+            except Exception:
+                with self._lock:
+                    self._added_during_load = None
+                raise
+
+            with self._lock:
+                for key in self._added_during_load:
+                    new_filter.add(key)
+                self._added_during_load = None
+                self.filter = new_filter
+                self._watermark = watermark
+            return rows
+
+    def refresh(self) -> int:
+        """Add users created since the last load or refresh."""
+        from src.models import User
+
+        if self.filter is None or self._watermark is None:
+            return self.load()
+
+        with self._load_lock:
+            db = self._session()
+            try:
+                query = select(User).where(
+                    User.created_at >= self._watermark - REFRESH_OVERLAP
+                )
+                before = len(self.filter)
+                watermark = self._fill(db, self.filter, query)
+            finally:
+                db.close()
+
+            with self._lock:
+                if watermark is not None:
+                    self._watermark = max(self._watermark, watermark)
+                return len(self.filter) - before
+
+    def _fill(self, db: Session, bloom: BloomFilter, query):
+        """Add the username and email of every row in query to bloom."""
+        from src.models import User
+
+        query = query.with_only_columns(User.username, User.email, User.created_at)
+        watermark = None
+        for username, email, created_at in db.execute(
+            query.execution_options(yield_per=10000)
+        ):
+            for field, value in (("username", username), ("email", email)):
+                key = self._key(field, value)
+                with self._lock:
+                    if key not in bloom:
+                        bloom.add(key)
+            if watermark is None or created_at > watermark:
+                watermark = created_at
+        return watermark
+
+    def clear(self):
+        with self._lock:
+            self.filter = None
+            self._watermark = None
+            self.checks = 0
+            self.filtered = 0
+            self.false_positives = 0
+
+    def _session(self) -> Session:
+        if self.session_factory is None:
+            from src.dependencies.db import SessionLocal
+
+            return SessionLocal()
+        return self.session_factory()
+
+    def _run(self):
+        interval = 0.0
+        while not self._stop.wait(interval):
+            try:
+                self.refresh()
+                interval = self.interval
+            except Exception as e:
+                logger.error(f"Error loading availability filter: {e}")
+                interval = min(self.interval, 5.0)
+
+    def start(self):
+        """Load the filter in the background and keep refreshing it."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            confirmed = self.checks - self.filtered
+            return {
+                "ready": self.filter is not None,
+                "items": len(self.filter) if self.filter is not None else 0,
+                "capacity": self.filter.capacity if self.filter is not None else 0,
+                "checks": self.checks,
+                # Checks answered by the filter alone.
+                "filtered": self.filtered,
+                "false_positives": self.false_positives,
+                "false_positive_ratio": (
+                    self.false_positives / confirmed if confirmed else 0.0
+                ),
+            }
+
+
+availability = AvailabilityIndex()
+
+
+def get_availability() -> AvailabilityIndex:
+    """FastAPI dependency that provides the username/email availability index."""
+    return availability
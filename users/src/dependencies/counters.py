@@ -0,0 +1,177 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from src.dependencies.config import Config
+
+logger = logging.getLogger(__name__)
+config = Config()
+
+COUNTER_FLUSH_INTERVAL = float(config.get("COUNTER_FLUSH_INTERVAL", "0.25"))
+
+COUNTER_COLUMNS = ("num_tweets", "num_followers")
+
+
+class CounterBuffer:
+    """
+    Write-behind buffer for the per-user counters on the actors table.
+
+    Deltas are accumulated in memory and applied every `interval` seconds as a
+    single batched `UPDATE actors SET n = n + :delta` statement, so concurrent
+    follows and tweets never read-modify-write the same row. Deltas from a
+    failed flush are put back and retried on the next one.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        interval: float = COUNTER_FLUSH_INTERVAL,
+    ) -> None:
+        self.session_factory = session_factory
+        self.interval = interval
+
+        self._pending: dict[UUID, dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(COUNTER_COLUMNS, 0)
+        )
+        # Deltas taken by a flush that has not committed yet.
+        self._inflight: dict[UUID, dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._flush_listeners: list[Callable[[list[UUID]], None]] = []
+
+    def add_flush_listener(self, listener: Callable[[list[UUID]], None]):
+        """Call listener with the updated user ids after each committed flush."""
+        self._flush_listeners.append(listener)
+
+    def add(self, user_id, column: str, delta: int = 1):
+        if column not in COUNTER_COLUMNS:
+            raise ValueError(f"unknown counter column: {column}")
+
+        user_id = user_id if isinstance(user_id, UUID) else UUID(str(user_id))
+        with self._lock:
+            self._pending[user_id][column] += delta
+
+    def pending(self, user_id, column: str) -> int:
+        """Return the unflushed delta for one counter."""
+        user_id = user_id if isinstance(user_id, UUID) else UUID(str(user_id))
+        with self._lock:
+            total = 0
+            for deltas in (self._pending.get(user_id), self._inflight.get(user_id)):
+                if deltas:
+                    total += deltas[column]
+            return total
+
+    def counts(self, user) -> dict[str, int]:
+        """Return a user's counters with unflushed deltas merged in."""
+        if user.id is None:
+            return {column: getattr(user, column) for column in COUNTER_COLUMNS}
+        return {
+            column: (getattr(user, column) or 0) + self.pending(user.id, column)
+            for column in COUNTER_COLUMNS
+        }
+
+    def flush(self) -> int:
+        """Apply all pending deltas. Returns the number of rows updated."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, defaultdict(
+                    lambda: dict.fromkeys(COUNTER_COLUMNS, 0)
+                )
+                self._inflight = batch
+
+            params = [
+                {"b_id": user_id, **{f"b_{c}": deltas[c] for c in COUNTER_COLUMNS}}
+                # Fixed row order keeps concurrent flushers from deadlocking.
+                for user_id, deltas in sorted(batch.items())
+                if any(deltas.values())
+            ]
+            if not params:
+                self._finish()
+                return 0
+
+            from src.models import User
+
+            actors = User.__table__
+            stmt = (
+                update(actors)
+                .where(actors.c.id == bindparam("b_id"))
+                .values(
+                    {
+                        column: actors.c[column] + bindparam(f"b_{column}")
+                        for column in COUNTER_COLUMNS
+                    }
+                )
+            )
+
+            db = self._session()
+            try:
+                db.execute(stmt, params)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error flushing counters, will retry: {e}")
+                self._finish(restore=True)
+                return 0
+            finally:
+                db.close()
+
+            # Before _finish, so readers see the in-flight deltas until caches
+            # holding the old stored values are gone.
+            user_ids = [row["b_id"] for row in params]
+            for listener in self._flush_listeners:
+                try:
+                    listener(user_ids)
+                except Exception as e:
+                    logger.error(f"Counter flush listener failed: {e}")
+
+            self._finish()
+            return len(params)
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._inflight = {}
+
+    def _finish(self, restore: bool = False):
+        with self._lock:
+            if restore:
+                for user_id, deltas in self._inflight.items():
+                    for column, delta in deltas.items():
+                        self._pending[user_id][column] += delta
+            self._inflight = {}
+
+    def _session(self) -> Session:
+        if self.session_factory is None:
+            from src.dependencies.db import SessionLocal
+
+            return SessionLocal()
+        return self.session_factory()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread and apply whatever is still pending."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+counter_buffer = CounterBuffer()
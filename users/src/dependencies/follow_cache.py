@@ -0,0 +1,236 @@
+import contextlib
+import logging
+import threading
+import time
+from typing import Callable, Iterable, Optional
+from uuid import uuid4
+
+import redis
+
+from src.dependencies.config import Config
+from src.dependencies.redis import redis_client
+
+logger = logging.getLogger(__name__)
+config = Config()
+
+FOLLOW_CACHE_TTL = int(config.get("FOLLOW_CACHE_TTL", "3600"))
+
+# Marks a set as fully loaded from the database. Without it an empty set would
+# be indistinguishable from a missing key. A second member records load time.
+LOADED_MARKER = "#loaded"
+LOADED_AT_PREFIX = "#loaded_at:"
+
+
+class FollowCache:
+    """
+    Follower and following id sets kept in Redis.
+
+    followers:{user_id} and following:{user_id} are built lazily from the
+    database on the first read and then kept current by add_follow and
+    remove_follow after every committed follow/unfollow. Each set expires
+    `ttl` seconds after it was loaded, which bounds how stale it can get if
+    an incremental update is lost.
+    """
+
+    def __init__(self, redis_conn: redis.Redis, ttl: int = FOLLOW_CACHE_TTL) -> None:
+        self.redis = redis_conn
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.updates = 0
+        self.errors = 0
+        self._age_samples = 0
+        self._age_total = 0.0
+        self._age_max = 0.0
+
+    @staticmethod
+    def followers_key(user_id) -> str:
+        return f"followers:{user_id}"
+
+    @staticmethod
+    def following_key(user_id) -> str:
+        return f"following:{user_id}"
+
+    def get_followers(self, user_id, loader: Callable[[], Iterable]) -> list[str]:
+        return self._get(self.followers_key(user_id), loader)
+
+    def get_following(self, user_id, loader: Callable[[], Iterable]) -> list[str]:
+        return self._get(self.following_key(user_id), loader)
+
+    def is_following(self, follower_id, target_ids: list) -> Optional[list[bool]]:
+        """
+        Membership of each target in follower_id's following set, from one
+        SMISMEMBER. Returns None when the set is not loaded.
+        """
+        key = self.following_key(follower_id)
+        try:
+            flags = self.redis.smismember(
+                key, [LOADED_MARKER, *(str(id) for id in target_ids)]
+            )
+        except redis.RedisError as e:
+            self._record_error(f"Error reading follow cache {key}: {e}")
+            return None
+
+        if not flags[0]:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return [bool(flag) for flag in flags[1:]]
+
+    def add_follow(self, follower_id, following_id):
+        self._update(follower_id, following_id, "sadd")
+
+    def remove_follow(self, follower_id, following_id):
+        self._update(follower_id, following_id, "srem")
+
+    def invalidate(self, *user_ids):
+        keys = [
+            key
+            for user_id in user_ids
+            for key in (self.followers_key(user_id), self.following_key(user_id))
+        ]
+        try:
+            self.redis.delete(*keys)
+        except redis.RedisError as e:
+            self._record_error(f"Error invalidating follow cache: {e}")
+
+    def _get(self, key: str, loader: Callable[[], Iterable]) -> list[str]:
+        try:
+            members = self.redis.smembers(key)
+        except redis.RedisError as e:
+            self._record_error(f"Error reading follow cache {key}: {e}")
+            return [str(id) for id in loader()]
+
+        if LOADED_MARKER in members:
+            ids = []
+            loaded_at = time.time()
+            for member in members:
+                if member.startswith(LOADED_AT_PREFIX):
+                    loaded_at = float(member[len(LOADED_AT_PREFIX) :])
+                elif member != LOADED_MARKER:
+                    ids.append(member)
+
+            self._record_hit(time.time() - loaded_at)
+            return ids
+
+        with self._lock:
+            self.misses += 1
+
+        return self._fill(key, loader)
+
+    def _fill(self, key: str, loader: Callable[[], Iterable]) -> list[str]:
+        """
+        Load key's set from the database and store it, unless the key was
+        written since the load began.
+
+        The key is watched from before the database read, so a follow that
+        commits during the load and reaches add_follow before the set is
+        stored aborts the fill instead of being overwritten by the older
+        snapshot; the set then stays unloaded and the next read retries. The
+        set is built under a temporary key and renamed into place, which
+        carries its expiry with it.
+        """
+        try:
+            pipe = self.redis.pipeline()
+            pipe.watch(key)
+        except redis.RedisError as e:
+            self._record_error(f"Error filling follow cache {key}: {e}")
+            return [str(id) for id in loader()]
+
+        try:
+            ids = [str(id) for id in loader()]
+            tmp_key = f"{key}:loading:{uuid4().hex}"
+            try:
+                build = self.redis.pipeline(transaction=False)
+                build.sadd(
+                    tmp_key, LOADED_MARKER, f"{LOADED_AT_PREFIX}{time.time()}", *ids
+                )
+                build.expire(tmp_key, self.ttl)
+                build.execute()
+
+                pipe.multi()
+                pipe.rename(tmp_key, key)
+                pipe.execute()
+            except redis.WatchError:
+                logger.debug(f"Follow cache {key} changed while loading, not filled")
+                # Left alone, the temporary set expires on its own.
+                with contextlib.suppress(redis.RedisError):
+                    self.redis.delete(tmp_key)
+            except redis.RedisError as e:
+                self._record_error(f"Error filling follow cache {key}: {e}")
+            return ids
+        finally:
+            pipe.reset()
+
+    def _update(self, follower_id, following_id, op: str):
+        followers_key = self.followers_key(following_id)
+        following_key = self.following_key(follower_id)
+        try:
+            pipe = self.redis.pipeline()
+            getattr(pipe, op)(followers_key, str(follower_id))
+            getattr(pipe, op)(following_key, str(following_id))
+            # A set created here has no load marker, so the next read
+            # rebuilds it; the NX expiry stops such a set from living forever
+            # without extending the lifetime of loaded sets.
+            pipe.expire(followers_key, self.ttl, nx=True)
+            pipe.expire(following_key, self.ttl, nx=True)
+            pipe.execute()
+        except redis.RedisError as e:
+            self._record_error(f"Error updating follow cache: {e}")
+            self.invalidate(follower_id, following_id)
+            return
+
+        with self._lock:
+            self.updates += 1
+
+    def _record_hit(self, age: float):
+        with self._lock:
+            self.hits += 1
+            self._age_samples += 1
+            self._age_total += age
+            self._age_max = max(self._age_max, age)
+
+    def _record_error(self, message: str):
+        logger.error(message)
+        with self._lock:
+            self.errors += 1
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.updates = 0
+            self.errors = 0
+            self._age_samples = 0
+            self._age_total = 0.0
+            self._age_max = 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "updates": self.updates,
+                "errors": self.errors,
+                # Age of the served set since it was loaded from the database.
+                "avg_age_seconds": (
+                    self._age_total / self._age_samples if self._age_samples else 0.0
+                ),
+                "max_age_seconds": self._age_max,
+                "ttl_seconds": self.ttl,
+            }
+
+
+follow_cache = FollowCache(redis_client)
+
+
+def get_follow_cache() -> FollowCache:
+    """FastAPI dependency that provides the shared follow cache."""
+    return follow_cache
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from bcrypt import checkpw, gensalt, hashpw
+
+from src.dependencies.config import Config
+
+logger = logging.getLogger(__name__)
+config = Config()
+
+BCRYPT_ROUNDS = int(config.get("BCRYPT_ROUNDS", "12"))
+HASHER_WORKERS = int(config.get("HASHER_WORKERS", str(os.cpu_count() or 1)))
+HASHER_MAX_PENDING = int(config.get("HASHER_MAX_PENDING", str(HASHER_WORKERS * 8)))
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing pool already has too many queued jobs."""
+
+
+def _hash_password(plaintext_password: str, rounds: int) -> str:
+    hashed = hashpw(plaintext_password.encode("utf-8"), gensalt(rounds=rounds))
+    return hashed.decode("utf-8")
+
+
+def _verify_password(plaintext_password: str, hashed_password: str) -> bool:
+    return checkpw(
+        plaintext_password.encode("utf-8"), hashed_password.encode("utf-8")
+    )
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a bounded process pool so hashing never blocks the event loop.
+
+    At most `max_pending` jobs may be queued or running at once; further calls
+    fail fast with HasherBusy instead of piling up behind the pool.
+    """
+
+    def __init__(
+        self,
+        workers: int = HASHER_WORKERS,
+        max_pending: int = HASHER_MAX_PENDING,
+        rounds: int = BCRYPT_ROUNDS,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.rounds = rounds
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # forkserver keeps workers independent of the gRPC and
+                    # uvicorn threads running in this process.
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("forkserver"),
+                    )
+        return self._pool
+
+    def _acquire(self):
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                raise HasherBusy("password hasher saturated")
+            self._pending += 1
+
+    def _release(self):
+        with self._pending_lock:
+            self._pending -= 1
+
+    async def _submit(self, fn, *args):
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), fn, *args)
+        finally:
+            self._release()
+
+    async def hash(self, plaintext_password: str) -> str:
+        return await self._submit(_hash_password, plaintext_password, self.rounds)
+
+    async def verify(self, plaintext_password: str, hashed_password) -> bool:
+        if isinstance(hashed_password, bytes):
+            hashed_password = hashed_password.decode("utf-8")
+        return await self._submit(
+            _verify_password, plaintext_password, str(hashed_password)
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+password_hasher = PasswordHasher()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """FastAPI dependency that provides the shared password hasher."""
+    return password_hasher
@@ -0,0 +1,289 @@
+import asyncio
+import json
+import logging
+import threading
+from typing import Awaitable, Callable, Iterable, Optional
+from uuid import UUID
+
+import redis
+
+from src.dependencies.cache import TTLCache
+from src.dependencies.config import Config
+from src.dependencies.counters import COUNTER_COLUMNS, counter_buffer
+from src.dependencies.redis import redis_client
+
+logger = logging.getLogger(__name__)
+config = Config()
+
+PROFILE_CACHE_SIZE = int(config.get("PROFILE_CACHE_SIZE", "10000"))
+# The in-process layer is only invalidated on the replica that made the
+# change, so it is kept much shorter than the shared Redis layer.
+PROFILE_CACHE_L1_TTL = float(config.get("PROFILE_CACHE_L1_TTL", "30"))
+PROFILE_CACHE_TTL = int(config.get("PROFILE_CACHE_TTL", "300"))
+
+
+def profile_dict(user) -> dict:
+    """The cached form of a user: stored columns only, without pending deltas."""
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "username": user.username,
+        "num_tweets": user.num_tweets or 0,
+        "num_followers": user.num_followers or 0,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+    }
+
+
+def with_pending_counts(profile: dict) -> dict:
+    """Merge unflushed counter deltas into a cached profile."""
+    user_id = UUID(profile["id"])
+    return {
+        **profile,
+        **{
+            column: profile[column] + counter_buffer.pending(user_id, column)
+            for column in COUNTER_COLUMNS
+        },
+    }
+
+
+class ProfileCache:
+    """
+    Two-level read-through cache of user profiles.
+
+    Lookups try an in-process TTLCache, then Redis (profile:{id}), then the
+    loader, and fill the levels they missed on the way back. Profiles hold
+    the stored counter columns; callers merge unflushed deltas with
+    with_pending_counts, and invalidate() is called after every counter flush.
+
+    A read that misses loads from the database while a flush may be
+    committing, so fills are conditional on the profile not having been
+    invalidated since the read began: invalidate() bumps a per-user
+    generation key in Redis, which the filling read watches, and a
+    process-wide generation for the in-process level.
+    """
+
+    def __init__(
+        self,
+        redis_conn: redis.Redis,
+        maxsize: int = PROFILE_CACHE_SIZE,
+        l1_ttl: float = PROFILE_CACHE_L1_TTL,
+        ttl: int = PROFILE_CACHE_TTL,
+    ) -> None:
+        self.redis = redis_conn
+        self.ttl = ttl
+        self.local = TTLCache(maxsize=maxsize, ttl=l1_ttl)
+
+        self._lock = threading.Lock()
+        # Bumped by every invalidate(); a read only fills the in-process
+        # level if it is unchanged since the read began.
+        self._generation = 0
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def key(user_id) -> str:
+        return f"profile:{user_id}"
+
+    @staticmethod
+    def generation_key(user_id) -> str:
+        return f"profile_gen:{user_id}"
+
+    def get(
+        self, user_id: UUID, loader: Callable[[list[UUID]], dict]
+    ) -> Optional[dict]:
+        return self.get_many([user_id], loader)[user_id]
+
+    def get_many(
+        self, user_ids: Iterable[UUID], loader: Callable[[list[UUID]], dict]
+    ) -> dict[UUID, Optional[dict]]:
+        """
+        Profiles for user_ids, None for unknown users. `loader` receives the
+        ids missing from both levels and returns {id: profile_dict}.
+        """
+        profiles: dict[UUID, Optional[dict]] = {}
+        generation = self._generation
+        fetched = missing = self._get_local(user_ids, profiles)
+        if missing:
+            missing = self._get_remote(missing, profiles)
+
+        if missing:
+            pipe = self._watch(missing)
+            try:
+                loaded = loader(missing)
+            except BaseException:
+                self._unwatch(pipe)
+                raise
+            self._set_remote(pipe, loaded)
+            for user_id in missing:
+                profiles[user_id] = loaded.get(user_id)
+
+        self._set_local(fetched, profiles, generation)
+        return profiles
+
+    async def aget(
+        self, user_id: UUID, loader: Callable[[list[UUID]], Awaitable[dict]]
+    ) -> Optional[dict]:
+        return (await self.aget_many([user_id], loader))[user_id]
+
+    async def aget_many(
+        self,
+        user_ids: Iterable[UUID],
+        loader: Callable[[list[UUID]], Awaitable[dict]],
+    ) -> dict[UUID, Optional[dict]]:
+        """
+        get_many for event-loop callers, with a coroutine loader. Local hits
+        never leave the loop; Redis round trips run in the default executor.
+        """
+        profiles: dict[UUID, Optional[dict]] = {}
+        generation = self._generation
+        fetched = missing = self._get_local(user_ids, profiles)
+        if missing:
+            missing = await asyncio.to_thread(self._get_remote, missing, profiles)
+
+        if missing:
+            pipe = await asyncio.to_thread(self._watch, missing)
+            try:
+                loaded = await loader(missing)
+            except BaseException:
+                self._unwatch(pipe)
+                raise
+            await asyncio.to_thread(self._set_remote, pipe, loaded)
+            for user_id in missing:
+                profiles[user_id] = loaded.get(user_id)
+
+        self._set_local(fetched, profiles, generation)
+        return profiles
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            self._generation += 1
+        for user_id in user_ids:
+            self.local.delete(user_id)
+        if not user_ids:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(*(self.key(user_id) for user_id in user_ids))
+            for user_id in user_ids:
+                # Deleting a missing profile key does not disturb a WATCH,
+                # so the fill is fenced by this key instead.
+                pipe.incr(self.generation_key(user_id))
+                pipe.expire(self.generation_key(user_id), self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            self._record_error(f"Error invalidating profile cache: {e}")
+
+    def _get_local(self, user_ids: Iterable[UUID], profiles: dict) -> list[UUID]:
+        """Fill profiles from the in-process level; return the ids it lacked."""
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            profile = self.local.get(user_id)
+            if profile is not None:
+                profiles[user_id] = profile
+            else:
+                missing.append(user_id)
+        return missing
+
+    def _set_local(self, user_ids: list[UUID], profiles: dict, generation: int):
+        # Anything read before an invalidation may predate the flush.
+        if generation != self._generation:
+            return
+        # Only entries fetched from Redis or the loader are written back;
+        # rewriting the ones that hit would push their expiry out on every read.
+        for user_id in user_ids:
+            if profiles.get(user_id) is not None:
+                self.local.set(user_id, profiles[user_id])
+
+    def _get_remote(self, user_ids: list[UUID], profiles: dict) -> list[UUID]:
+        """Fill profiles from Redis; return the ids Redis did not have."""
+        try:
+            values = self.redis.mget([self.key(user_id) for user_id in user_ids])
+        except redis.RedisError as e:
+            self._record_error(f"Error reading profile cache: {e}")
+            return user_ids
+
+        missing = []
+        for user_id, value in zip(user_ids, values):
+            if value is None:
+                missing.append(user_id)
+            else:
+                profiles[user_id] = json.loads(value)
+
+        with self._lock:
+            self.redis_hits += len(user_ids) - len(missing)
+            self.redis_misses += len(missing)
+        return missing
+
+    def _watch(self, user_ids: list[UUID]) -> Optional[redis.client.Pipeline]:
+        """
+        Watch the generation keys of user_ids ahead of loading them, or
+        return None if Redis is unavailable and the fill should be skipped.
+        """
+        try:
+            pipe = self.redis.pipeline()
+            pipe.watch(*(self.generation_key(user_id) for user_id in user_ids))
+        except redis.RedisError as e:
+            self._record_error(f"Error filling profile cache: {e}")
+            return None
+        return pipe
+
+    @staticmethod
+    def _unwatch(pipe: Optional[redis.client.Pipeline]):
+        if pipe is not None:
+            pipe.reset()
+
+    def _set_remote(self, pipe: Optional[redis.client.Pipeline], loaded: dict):
+        """Store loaded profiles unless one was invalidated since _watch."""
+        if pipe is None:
+            return
+        try:
+            if loaded:
+                pipe.multi()
+                for user_id, profile in loaded.items():
+                    pipe.set(self.key(user_id), json.dumps(profile), ex=self.ttl)
+                pipe.execute()
+        except redis.WatchError:
+            logger.debug("Profiles invalidated while loading, not cached")
+        except redis.RedisError as e:
+            self._record_error(f"Error filling profile cache: {e}")
+        finally:
+            pipe.reset()
+
+    def _record_error(self, message: str):
+        logger.error(message)
+        with self._lock:
+            self.errors += 1
+
+    def clear(self):
+        self.local.clear()
+        with self._lock:
+            self.redis_hits = 0
+            self.redis_misses = 0
+            self.errors = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.redis_hits + self.redis_misses
+            return {
+                "local": self.local.stats(),
+                "redis": {
+                    "hits": self.redis_hits,
+                    "misses": self.redis_misses,
+                    "hit_ratio": self.redis_hits / lookups if lookups else 0.0,
+                    "errors": self.errors,
+                    "ttl_seconds": self.ttl,
+                },
+            }
+
+
+profile_cache = ProfileCache(redis_client)
+
+# Stored counters change on every flush; drop the affected profiles so the
+# next read picks up the new values.
+counter_buffer.add_flush_listener(lambda user_ids: profile_cache.invalidate(*user_ids))
+
+
+def get_profile_cache() -> ProfileCache:
+    """FastAPI dependency that provides the shared profile cache."""
+    return profile_cache
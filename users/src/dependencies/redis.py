@@ -0,0 +1,24 @@
+import logging
+from typing import Generator
+
+import redis
+
+from src.dependencies.config import Config
+
+logger = logging.getLogger(__name__)
+config = Config()
+
+redis_host = config.get("REDIS_HOST", "localhost")
+redis_port = int(config.get("REDIS_PORT", "6379"))
+
+# Global Redis client - used for production
+redis_client = redis.Redis(
+    host=redis_host,
+    port=redis_port,
+    decode_responses=True,
+)
+
+
+def get_redis_client() -> Generator[redis.Redis, None, None]:
+    """FastAPI dependency that provides a Redis client."""
+    yield redis_client
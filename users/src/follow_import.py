@@ -0,0 +1,163 @@
+import logging
+from itertools import batched
+from typing import Iterable, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from src.dependencies.config import Config
+from src.dependencies.counters import counter_buffer
+from src.dependencies.follow_cache import follow_cache
+from src.dependencies.profile_cache import profile_cache
+from src.models import Follow, User
+
+logger = logging.getLogger(__name__)
+config = Config()
+
+# Edges inserted (and committed) per statement during a bulk import.
+FOLLOW_IMPORT_CHUNK_SIZE = int(config.get("FOLLOW_IMPORT_CHUNK_SIZE", "5000"))
+
+# Users whose num_followers is recomputed per UPDATE after an import.
+RECOUNT_CHUNK_SIZE = 1000
+
+
+def parse_edge(raw) -> Optional[tuple[UUID, UUID]]:
+    """
+    Parse one edge from a dict ({"follower_id", "following_id"}) or a
+    two-item sequence. Returns None for malformed edges and self-follows.
+    """
+    try:
+        if isinstance(raw, dict):
+            follower_id, following_id = raw["follower_id"], raw["following_id"]
+        else:
+            follower_id, following_id = raw
+        edge = (UUID(str(follower_id)), UUID(str(following_id)))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if edge[0] == edge[1]:
+        return None
+    return edge
+
+
+def _insert(db: Session):
+    """Return the dialect's INSERT, which provides on_conflict_do_nothing."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(Follow)
+
+
+class FollowImporter:
+    """
+    Bulk-loads follow edges.
+
+    Edges are written with one multi-row INSERT ... ON CONFLICT DO NOTHING per
+    chunk and each chunk is committed on its own, so no lock is held for the
+    whole import. num_followers is not touched while inserting; recount()
+    recomputes it for every followed user in one aggregate pass at the end.
+    """
+
+    def __init__(self, db: Session, chunk_size: int = FOLLOW_IMPORT_CHUNK_SIZE) -> None:
+        self.db = db
+        self.chunk_size = max(1, chunk_size)
+
+        self.inserted = 0
+        self.skipped = 0
+        self.invalid = 0
+        self.followed: set[UUID] = set()
+        self.followers: set[UUID] = set()
+
+    def insert_chunk(self, raw_edges: Iterable) -> int:
+        """Insert and commit one chunk. Returns the number of new edges."""
+        edges = set()
+        for raw in raw_edges:
+            edge = parse_edge(raw)
+            if edge is None:
+                self.invalid += 1
+            elif edge in edges:
+                self.skipped += 1
+            else:
+                edges.add(edge)
+
+        if not edges:
+            return 0
+
+        rows = [
+            {"id": uuid4(), "follower_id": follower_id, "following_id": following_id}
+            for follower_id, following_id in edges
+        ]
+        stmt = (
+            _insert(self.db)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["follower_id", "following_id"])
+        )
+
+        try:
+            result = self.db.execute(stmt)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        inserted = result.rowcount
+        self.inserted += inserted
+        self.skipped += len(rows) - inserted
+        for follower_id, following_id in edges:
+            self.followers.add(follower_id)
+            self.followed.add(following_id)
+        return inserted
+
+    def import_edges(self, raw_edges: Iterable) -> int:
+        """Insert edges from any iterable in chunks of chunk_size."""
+        inserted = 0
+        for chunk in batched(raw_edges, self.chunk_size):
+            inserted += self.insert_chunk(chunk)
+        return inserted
+
+    def recount(self) -> int:
+        """Recompute num_followers for every user that gained followers."""
+        follower_count = (
+            select(func.count(Follow.id))
+            .where(Follow.following_id == User.id)
+            .scalar_subquery()
+        )
+
+        updated = 0
+        for user_ids in batched(sorted(self.followed), RECOUNT_CHUNK_SIZE):
+            result = self.db.execute(
+                update(User)
+                .where(User.id.in_(user_ids))
+                .values(num_followers=follower_count)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            updated += result.rowcount
+        return updated
+
+    def finish(self) -> dict:
+        """
+        Recount followers and drop cached follow sets and profiles of every
+        touched user.
+
+        Buffered counter deltas are flushed first so follows made during the
+        import are not counted twice once the recount has included them.
+        """
+        counter_buffer.flush()
+        recounted = self.recount()
+
+        for user_ids in batched(self.followed | self.followers, RECOUNT_CHUNK_SIZE):
+            follow_cache.invalidate(*user_ids)
+        for user_ids in batched(self.followed, RECOUNT_CHUNK_SIZE):
+            profile_cache.invalidate(*user_ids)
+
+        return {**self.summary(), "recounted": recounted}
+
+    def summary(self) -> dict:
+        return {
+            "inserted": self.inserted,
+            "skipped": self.skipped,
+            "invalid": self.invalid,
+        }
@@ -0,0 +1,60 @@
+from typing import Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.dependencies.follow_cache import follow_cache
+from src.models import Follow
+
+# Upper bound on targets accepted by a single follow-state lookup.
+MAX_LOOKUP_TARGETS = 500
+
+
+def followed_among(db: Session, viewer_id: UUID, target_ids: list[UUID]) -> set[UUID]:
+    """
+    Return the subset of target_ids that viewer_id follows.
+
+    Both columns are in unique_follow (follower_id, following_id), so this is
+    answered from the index alone.
+    """
+    if not target_ids:
+        return set()
+    return set(
+        db.execute(
+            select(Follow.following_id).where(
+                Follow.follower_id == viewer_id,
+                Follow.following_id.in_(set(target_ids)),
+            )
+        ).scalars()
+    )
+
+
+def lookup_follows(
+    viewer_id: UUID,
+    target_ids: list[Optional[UUID]],
+    load: Callable[[list[UUID]], set[UUID]],
+) -> list[bool]:
+    """
+    Follow state of viewer_id for each target, in order. Served from the
+    viewer's cached following set when it is loaded, otherwise by `load`.
+    Targets that are None (malformed ids) are reported as not followed.
+    """
+    valid_ids = [target_id for target_id in target_ids if target_id is not None]
+
+    flags = follow_cache.is_following(viewer_id, valid_ids)
+    if flags is not None:
+        followed = {t for t, flag in zip(valid_ids, flags) if flag}
+    else:
+        followed = load(valid_ids)
+
+    return [target_id in followed for target_id in target_ids]
+
+
+def to_bitmap(flags: list[bool]) -> bytes:
+    """Pack flags LSB-first: flag i is bit (i % 8) of byte i // 8."""
+    bitmap = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            bitmap[i // 8] |= 1 << (i % 8)
+    return bytes(bitmap)
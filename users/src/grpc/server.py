@@ -1,18 +1,67 @@
+import asyncio
 import logging
+import threading
 from contextlib import contextmanager
 from concurrent import futures
 from uuid import UUID
 from typing import Generator
 
 import grpc
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
 
 import src.grpc.user_service_pb2 as pb2
 import src.grpc.user_service_pb2_grpc as pb2_grpc
-from src.dependencies.db import SessionLocal
+from src.dependencies.cache import TTLCache
+from src.dependencies.config import Config
+from src.dependencies.counters import counter_buffer
+from src.dependencies.db import SessionLocal, create_async_db_engine
+from src.dependencies.follow_cache import follow_cache
+from src.dependencies.profile_cache import (
+    profile_cache,
+    profile_dict,
+    with_pending_counts,
+)
+from src.follow_lookup import (
+    MAX_LOOKUP_TARGETS,
+    followed_among,
+    lookup_follows,
+    to_bitmap,
+)
+from src.grpc.ids import ID_SIZE, pack_ids, unpack_ids
 from src.models import User, Follow
 
 logger = logging.getLogger(__name__)
+config = Config()
+
+GRPC_ADDRESS = "[::]:50051"
+
+# "thread" serves RPCs on a thread pool; "aio" runs the asyncio servicer on an
+# event loop, with GRPC_MAX_WORKERS threads left for the sync handlers.
+GRPC_SERVER_MODE = config.get("GRPC_SERVER_MODE", "thread")
+GRPC_MAX_WORKERS = int(config.get("GRPC_MAX_WORKERS", "10"))
+# RPCs in flight before new ones fail with RESOURCE_EXHAUSTED; 0 for no limit.
+GRPC_MAX_CONCURRENT_RPCS = int(config.get("GRPC_MAX_CONCURRENT_RPCS", "0")) or None
+# Clients keep idle channels alive with pings this often; accept them
+# instead of answering with GOAWAY (too_many_pings).
+GRPC_KEEPALIVE_TIME_MS = int(config.get("GRPC_KEEPALIVE_TIME_MS", "30000"))
+GRPC_SERVER_OPTIONS = [
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.min_ping_interval_without_data_ms", GRPC_KEEPALIVE_TIME_MS // 2),
+]
+
+# Upper bound on ids accepted by a single GetUsers call.
+MAX_BATCH_SIZE = 1000
+
+# Batch ids of recently applied ApplyCounterDeltas calls, so a client retry
+# after a lost response is not applied twice by this replica.
+applied_batches = TTLCache(maxsize=100000, ttl=600)
+applied_batches_lock = threading.Lock()
+
+# Chunk sizes for the streaming follower/following RPCs.
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 10000
 
 
 @contextmanager
@@ -25,92 +74,485 @@ def get_session() -> Generator[Session, None, None]:
         session.close()
 
 
+def user_struct(profile: dict, packed: bool = False) -> pb2.UserStruct:
+    if packed:
+        ids = {"id_bytes": UUID(profile["id"]).bytes}
+    else:
+        ids = {"id": profile["id"]}
+
+    profile = with_pending_counts(profile)
+
+    return pb2.UserStruct(
+        **ids,
+        email=profile["email"],
+        username=profile["username"],
+        numTweets=profile["num_tweets"],
+        numFollowers=profile["num_followers"],
+        created_at=0,
+    )
+
+
+def load_profiles(user_ids: list[UUID]) -> dict[UUID, dict]:
+    """Profile loader for the profile cache: one IN query for all ids."""
+    with get_session() as db:
+        users = db.query(User).filter(User.id.in_(user_ids)).all()
+        return {user.id: profile_dict(user) for user in users}
+
+
+def load_follow_ids(key_column, id_column, user_id: UUID) -> list[UUID]:
+    """Load the ids in id_column for every row where key_column == user_id."""
+    with get_session() as db:
+        query = select(id_column).where(key_column == user_id)
+        return db.execute(query).scalars().all()
+
+
+def known_user_ids(profiles: dict) -> set[UUID]:
+    """The ids of a profile cache lookup that belong to existing users."""
+    return {user_id for user_id, profile in profiles.items() if profile}
+
+
+def parse_counter_deltas(num_tweets) -> tuple[dict[UUID, int], list[str]]:
+    """Split an ApplyCounterDeltas map into {id: delta} and malformed ids."""
+    deltas, rejected = {}, []
+    for raw_id, delta in num_tweets.items():
+        if not delta:
+            continue
+        try:
+            deltas[UUID(raw_id)] = delta
+        except ValueError:
+            rejected.append(raw_id)
+    return deltas, rejected
+
+
+def claim_batch(batch_id: str) -> bool:
+    """
+    Record an ApplyCounterDeltas batch id; False if it was already applied.
+    The batch is claimed before it is applied, as a retry can arrive while
+    the original call is still running; a call that fails releases it.
+    """
+    if not batch_id:
+        return True
+    with applied_batches_lock:
+        if applied_batches.get(batch_id):
+            return False
+        applied_batches.set(batch_id, True)
+    return True
+
+
+def release_batch(batch_id: str) -> None:
+    """Forget a claimed batch id whose deltas were not applied."""
+    if batch_id:
+        with applied_batches_lock:
+            applied_batches.delete(batch_id)
+
+
+def parse_user_ids(raw_ids) -> list[UUID | None]:
+    """Parse request ids, mapping malformed ones to None."""
+    user_ids = []
+    for raw_id in raw_ids:
+        try:
+            user_ids.append(UUID(raw_id))
+        except ValueError:
+            user_ids.append(None)
+    return user_ids
+
+
+def requested_user_ids(request) -> list[UUID | None]:
+    """
+    The ids of a GetUsers request in order, None for malformed string ids.
+    Raises ValueError for oversized batches and truncated packed ids.
+    """
+    requested = len(request.packed_user_ids) // ID_SIZE or len(request.user_ids)
+    if requested > MAX_BATCH_SIZE:
+        raise ValueError(f"at most {MAX_BATCH_SIZE} user ids per call")
+
+    if request.packed_user_ids:
+        return unpack_ids(request.packed_user_ids)
+    return parse_user_ids(request.user_ids)
+
+
+def stream_follows_args(request) -> tuple[UUID, UUID | None, int]:
+    """
+    The user id, resume cursor and chunk size of a StreamFollowers or
+    StreamFollowing request. Raises ValueError for malformed ids.
+    """
+    user_id = UUID(request.user_id)
+    after_id = UUID(request.after_id) if request.after_id else None
+    chunk_size = min(request.chunk_size or DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE)
+    return user_id, after_id, chunk_size
+
+
+def follow_ids_page(key_column, id_column, user_id: UUID, after_id, chunk_size: int):
+    """
+    The next page of ids in id_column for rows where key_column == user_id,
+    after after_id. A keyset cursor on id_column keeps every page a bounded
+    index range scan.
+    """
+    query = select(id_column).where(key_column == user_id)
+    if after_id is not None:
+        query = query.where(id_column > after_id)
+    return query.order_by(id_column).limit(chunk_size)
+
+
+def follow_ids_chunk(ids: list, packed: bool) -> pb2.FollowIdsChunk:
+    if packed:
+        return pb2.FollowIdsChunk(packed_ids=pack_ids(ids))
+    return pb2.FollowIdsChunk(user_ids=[str(id) for id in ids])
+
+
+def get_users_res(user_ids: list, profiles: dict, packed: bool) -> pb2.GetUsersRes:
+    """Build a GetUsers response in request order from {id: profile}."""
+    structs = {
+        user_id: user_struct(profile, packed)
+        for user_id, profile in profiles.items()
+        if profile is not None
+    }
+
+    return pb2.GetUsersRes(
+        users=[
+            (
+                pb2.GetUserRes(valid=True, user=structs[user_id])
+                if user_id in structs
+                else pb2.GetUserRes(valid=False)
+            )
+            for user_id in user_ids
+        ]
+    )
+
+
 class UserService(pb2_grpc.UserServicer):
     def GetUser(self, request, context):
-        with get_session() as db:
-            userID = UUID(request.user_id, version=4)
+        try:
+            userID = UUID(request.user_id)
+        except ValueError:
+            return pb2.GetUserRes(valid=False, user=None)
 
-            user = db.query(User).filter_by(id=userID).first()
+        profile = profile_cache.get(userID, load_profiles)
 
-            if not user:
-                return pb2.GetUserRes(valid=False, user=None)
+        if not profile:
+            return pb2.GetUserRes(valid=False, user=None)
 
-            user_struct = pb2.UserStruct(
-                id=str(user.id),
-                email=user.email,
-                username=user.username,
-                numTweets=user.num_tweets,
-                numFollowers=user.num_followers,
-                created_at=0,
-            )
-            return pb2.GetUserRes(valid=True, user=user_struct)
+        return pb2.GetUserRes(
+            valid=True, user=user_struct(profile, packed=request.packed)
+        )
 
-    def IncrementsTweets(self, request, context):
-        with get_session() as db:
-            userID = request.user_id
+    def GetUsers(self, request, context):
+        try:
+            user_ids = requested_user_ids(request)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            return
 
-            user: User = db.query(User).filter_by(id=userID).first()
+        lookup_ids = {user_id for user_id in user_ids if user_id is not None}
+        profiles = (
+            profile_cache.get_many(lookup_ids, load_profiles) if lookup_ids else {}
+        )
+        return get_users_res(user_ids, profiles, request.packed)
 
-            if not user:
-                return pb2.IncrementTweetsRes(success=False)
+    def add_tweets(self, raw_id: str, delta: int) -> bool:
+        """Buffer a num_tweets delta if raw_id names an existing user."""
+        try:
+            user_id = UUID(raw_id)
+        except ValueError:
+            return False
+        # Checked through the profile cache, as deltas for unknown users
+        # would be buffered and then update nothing.
+        if not profile_cache.get(user_id, load_profiles):
+            return False
+        counter_buffer.add(user_id, "num_tweets", delta)
+        return True
 
-            user.increment_tweets()
+    def IncrementsTweets(self, request, context):
+        return pb2.IncrementTweetsRes(success=self.add_tweets(request.user_id, 1))
+
+    def DecrementTweets(self, request, context):
+        return pb2.DecrementTweetsRes(success=self.add_tweets(request.user_id, -1))
+
+    def ApplyCounterDeltas(self, request, context):
+        if not claim_batch(request.batch_id):
+            return pb2.ApplyCounterDeltasRes()
 
-            try:
-                db.commit()
-            except Exception as e:
-                db.rollback()
-                logger.error(f"Error incrementing tweets: {e}")
-                return pb2.IncrementTweetsRes(success=False)
+        deltas, rejected = parse_counter_deltas(request.num_tweets)
+        try:
+            profiles = profile_cache.get_many(deltas, load_profiles)
+        except BaseException:
+            release_batch(request.batch_id)
+            raise
+        known = known_user_ids(profiles)
+        return pb2.ApplyCounterDeltasRes(
+            rejected_ids=rejected + self.apply_deltas(deltas, known)
+        )
 
-            return pb2.IncrementTweetsRes(success=True)
+    @staticmethod
+    def apply_deltas(deltas: dict[UUID, int], known: set[UUID]) -> list[str]:
+        """Buffer the deltas of known users; return the other ids."""
+        rejected = []
+        for user_id, delta in deltas.items():
+            if user_id in known:
+                counter_buffer.add(user_id, "num_tweets", delta)
+            else:
+                rejected.append(str(user_id))
+        return rejected
 
     def GetFollowers(self, request, context):
-        with get_session() as db:
-            userID = request.user_id
-
-            followers = db.query(Follow).filter_by(following_id=userID).all()
-
-            if not followers:
-                return pb2.GetFollowersRes(followers=None)
-
-            followerRes = [
-                pb2.FollowStruct(
-                    id=str(follower.id),
-                    follower_id=str(follower.follower_id),
-                    following_id=str(follower.following_id),
-                    created_at=0,
-                )
-                for follower in followers
-            ]
+        userID = UUID(request.user_id)
+        follower_ids = follow_cache.get_followers(
+            userID,
+            lambda: load_follow_ids(Follow.following_id, Follow.follower_id, userID),
+        )
+
+        if request.packed:
+            return pb2.GetFollowersRes(packed_follower_ids=pack_ids(follower_ids))
 
-            return pb2.GetFollowersRes(followers=followerRes)
+        return pb2.GetFollowersRes(
+            followers=[
+                pb2.FollowStruct(follower_id=follower_id, following_id=str(userID))
+                for follower_id in follower_ids
+            ]
+        )
 
     def GetFollowing(self, request, context):
-        with get_session() as db:
-            userID = request.user_id
-
-            followers = db.query(Follow).filter_by(follower_id=userID).all()
-
-            if not followers:
-                return pb2.GetFollowersRes(followers=None)
-
-            followerRes = [
-                pb2.FollowStruct(
-                    id=str(follower.id),
-                    follower_id=str(follower.follower_id),
-                    following_id=str(follower.following_id),
-                    created_at=0,
-                )
-                for follower in followers
+        userID = UUID(request.user_id)
+        following_ids = follow_cache.get_following(
+            userID,
+            lambda: load_follow_ids(Follow.follower_id, Follow.following_id, userID),
+        )
+
+        if request.packed:
+            return pb2.GetFollowingRes(packed_following_ids=pack_ids(following_ids))
+
+        return pb2.GetFollowingRes(
+            follwing=[
+                pb2.FollowStruct(follower_id=str(userID), following_id=following_id)
+                for following_id in following_ids
             ]
+        )
+
+    def CheckFollows(self, request, context):
+        # Each abort is followed by a return: on the grpc.aio server this
+        # handler runs on the migration thread pool, where abort() does not
+        # raise.
+        requested = len(request.packed_target_ids) // ID_SIZE or len(request.target_ids)
+        if requested > MAX_LOOKUP_TARGETS:
+            context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"at most {MAX_LOOKUP_TARGETS} target ids per call",
+            )
+            return
+
+        try:
+            viewer_id = UUID(request.viewer_id)
+            if request.packed_target_ids:
+                target_ids = unpack_ids(request.packed_target_ids)
+            else:
+                target_ids = parse_user_ids(request.target_ids)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            return
+
+        def load(ids):
+            with get_session() as db:
+                return followed_among(db, viewer_id, ids)
+
+        flags = lookup_follows(viewer_id, target_ids, load)
+        return pb2.CheckFollowsRes(bitmap=to_bitmap(flags), count=len(flags))
+
+    def StreamFollowers(self, request, context):
+        # Pages through ix_follows_following_follower (following_id, follower_id).
+        yield from self._stream_follow_ids(
+            request, context, Follow.following_id, Follow.follower_id
+        )
+
+    def StreamFollowing(self, request, context):
+        # Pages through unique_follow (follower_id, following_id).
+        yield from self._stream_follow_ids(
+            request, context, Follow.follower_id, Follow.following_id
+        )
+
+    def _stream_follow_ids(self, request, context, key_column, id_column):
+        """
+        Stream the ids in id_column for rows where key_column == user_id.
+
+        Opens a fresh session per page so a slow consumer never pins a
+        pooled connection.
+        """
+        try:
+            user_id, after_id, chunk_size = stream_follows_args(request)
+        except ValueError:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "invalid id")
+            return
+
+        while context.is_active():
+            query = follow_ids_page(
+                key_column, id_column, user_id, after_id, chunk_size
+            )
+            with get_session() as db:
+                ids = db.execute(query).scalars().all()
+
+            if not ids:
+                return
+            yield follow_ids_chunk(ids, request.packed)
+
+            if len(ids) < chunk_size:
+                return
+            after_id = ids[-1]
+
+
+class AsyncUserService(UserService):
+    """
+    asyncio servicer for the grpc.aio server.
+
+    The hot unary RPCs are coroutines: profile misses are loaded through an
+    async session, which the counter RPCs also use to check the user exists.
+    The follow streams are async generators over the same session factory.
+    Handlers inherited from UserService run on the server's migration thread
+    pool, where the context has no is_active() and abort() does not raise.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+
+    async def load_profiles(self, user_ids: list[UUID]) -> dict[UUID, dict]:
+        async with self.session_factory() as db:
+            result = await db.execute(select(User).where(User.id.in_(user_ids)))
+            return {user.id: profile_dict(user) for user in result.scalars()}
+
+    async def GetUser(self, request, context):
+        try:
+            userID = UUID(request.user_id)
+        except ValueError:
+            return pb2.GetUserRes(valid=False, user=None)
 
-            return pb2.GetFollowersRes(followers=followerRes)
+        profile = await profile_cache.aget(userID, self.load_profiles)
+
+        if not profile:
+            return pb2.GetUserRes(valid=False, user=None)
+
+        return pb2.GetUserRes(
+            valid=True, user=user_struct(profile, packed=request.packed)
+        )
+
+    async def GetUsers(self, request, context):
+        try:
+            user_ids = requested_user_ids(request)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            return
+
+        lookup_ids = {user_id for user_id in user_ids if user_id is not None}
+        profiles = (
+            await profile_cache.aget_many(lookup_ids, self.load_profiles)
+            if lookup_ids
+            else {}
+        )
+        return get_users_res(user_ids, profiles, request.packed)
+
+    async def aadd_tweets(self, raw_id: str, delta: int) -> bool:
+        """add_tweets with the existence check on the event loop."""
+        try:
+            user_id = UUID(raw_id)
+        except ValueError:
+            return False
+        if not await profile_cache.aget(user_id, self.load_profiles):
+            return False
+        counter_buffer.add(user_id, "num_tweets", delta)
+        return True
+
+    async def IncrementsTweets(self, request, context):
+        success = await self.aadd_tweets(request.user_id, 1)
+        return pb2.IncrementTweetsRes(success=success)
+
+    async def DecrementTweets(self, request, context):
+        success = await self.aadd_tweets(request.user_id, -1)
+        return pb2.DecrementTweetsRes(success=success)
+
+    async def ApplyCounterDeltas(self, request, context):
+        if not claim_batch(request.batch_id):
+            return pb2.ApplyCounterDeltasRes()
+
+        deltas, rejected = parse_counter_deltas(request.num_tweets)
+        try:
+            profiles = await profile_cache.aget_many(deltas, self.load_profiles)
+        except BaseException:
+            release_batch(request.batch_id)
+            raise
+        return pb2.ApplyCounterDeltasRes(
+            rejected_ids=rejected + self.apply_deltas(deltas, known_user_ids(profiles))
+        )
+
+    async def StreamFollowers(self, request, context):
+        async for chunk in self._astream_follow_ids(
+            request, context, Follow.following_id, Follow.follower_id
+        ):
+            yield chunk
+
+    async def StreamFollowing(self, request, context):
+        async for chunk in self._astream_follow_ids(
+            request, context, Follow.follower_id, Follow.following_id
+        ):
+            yield chunk
+
+    async def _astream_follow_ids(self, request, context, key_column, id_column):
+        """
+        _stream_follow_ids on the event loop. A client that goes away cancels
+        the handler task, which ends the stream at its next await.
+        """
+        try:
+            user_id, after_id, chunk_size = stream_follows_args(request)
+        except ValueError:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "invalid id")
+            return
+
+        while True:
+            query = follow_ids_page(
+                key_column, id_column, user_id, after_id, chunk_size
+            )
+            async with self.session_factory() as db:
+                ids = (await db.execute(query)).scalars().all()
+
+            if not ids:
+                return
+            yield follow_ids_chunk(ids, request.packed)
+
+            if len(ids) < chunk_size:
+                return
+            after_id = ids[-1]
 
 
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    if GRPC_SERVER_MODE == "aio":
+        asyncio.run(serve_aio())
+        return
+    if GRPC_SERVER_MODE != "thread":
+        raise ValueError(f"unknown GRPC_SERVER_MODE: {GRPC_SERVER_MODE}")
+
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=GRPC_MAX_WORKERS),
+        maximum_concurrent_rpcs=GRPC_MAX_CONCURRENT_RPCS,
+        options=GRPC_SERVER_OPTIONS,
+    )
     pb2_grpc.add_UserServicer_to_server(UserService(), server)
-    server.add_insecure_port("[::]:50051")
+    server.add_insecure_port(GRPC_ADDRESS)
     server.start()
     server.wait_for_termination()
+
+
+async def serve_aio():
+    # Runs on its own event loop (and thread), so it cannot share the
+    # async engine that FastAPI's loop uses.
+    engine = create_async_db_engine()
+    server = grpc.aio.server(
+        migration_thread_pool=futures.ThreadPoolExecutor(max_workers=GRPC_MAX_WORKERS),
+        maximum_concurrent_rpcs=GRPC_MAX_CONCURRENT_RPCS,
+        options=GRPC_SERVER_OPTIONS,
+    )
+    service = AsyncUserService(
+        async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    )
+    pb2_grpc.add_UserServicer_to_server(service, server)
+    server.add_insecure_port(GRPC_ADDRESS)
+    await server.start()
+    try:
+        await server.wait_for_termination()
+    finally:
+        await engine.dispose()
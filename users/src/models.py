@@ -11,7 +11,9 @@ from sqlalchemy import (
 )
 
 from bcrypt import hashpw, checkpw, gensalt
+from src.dependencies.counters import counter_buffer
 from src.dependencies.db import Base
+from src.dependencies.hashing import BCRYPT_ROUNDS
 
 from uuid import uuid4
 
@@ -31,9 +33,13 @@ class User(Base):
         Index("ix_users_created_at", "created_at"),
     )
 
-    def __init__(self, email, plaintext_password, username) -> None:
+    def __init__(
+        self, email, plaintext_password, username, password_hash=None
+    ) -> None:
         self.email = email
-        self.password = self._generate_password_hash(plaintext_password)
+        if password_hash is None:
+            password_hash = self._generate_password_hash(plaintext_password)
+        self.password = password_hash
         self.username = username
 
     def to_dict(self):
@@ -41,8 +47,7 @@ class User(Base):
             "id": str(self.id),
             "email": self.email,
             "username": self.username,
-            "num_tweets": self.num_tweets,
-            "num_followers": self.num_followers,
+            **counter_buffer.counts(self),
             "created_at": self.created_at,
         }
 
@@ -58,7 +63,7 @@ class User(Base):
     @staticmethod
     def _generate_password_hash(plaintext_password: str):
         provided_password = plaintext_password.encode("utf-8")
-        return hashpw(provided_password, gensalt())
+        return hashpw(provided_password, gensalt(rounds=BCRYPT_ROUNDS))
 
     def increment_tweets(self, count=1):
         self.num_tweets += count
@@ -75,9 +80,11 @@ class Follow(Base):
 
     __table_args__ = (
         UniqueConstraint("follower_id", "following_id", name="unique_follow"),
-        Index("ix_follows_following_id", "following_id"),
-        Index("ix_follows_follower_id", "follower_id"),
+        Index("ix_follows_following_follower", "following_id", "follower_id"),
         Index("ix_follows_created_at", "created_at"),
+        # Keyset pagination of GET /follow and GET /following.
+        Index("ix_follows_following_created", "following_id", "created_at", "id"),
+        Index("ix_follows_follower_created", "follower_id", "created_at", "id"),
     )
 
     def __init__(self, follower_id, following_id) -> None:
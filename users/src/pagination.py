@@ -0,0 +1,59 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Opaque token for the position just after (created_at, id)."""
+    raw = json.dumps([created_at.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of encode_cursor. Raises ValueError for malformed tokens."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("invalid cursor") from e
+
+
+def keyset_page(
+    query: Query, created_at_column, id_column, limit: int, cursor: Optional[str]
+) -> tuple[list, Optional[str]]:
+    """
+    Return one page of `query`, newest first, and the cursor for the next page.
+
+    Ordering by (created_at, id) and seeking past the cursor with a row-value
+    comparison lets the database start the scan at the cursor position, so a
+    deep page costs the same as the first one.
+    """
+    if cursor is not None:
+        after_created_at, after_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(created_at_column, id_column) < tuple_(after_created_at, after_id)
+        )
+
+    rows = (
+        query.order_by(created_at_column.desc(), id_column.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(
+        getattr(last, created_at_column.key), getattr(last, id_column.key)
+    )
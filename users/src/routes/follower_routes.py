@@ -1,69 +1,186 @@
+import json
 import logging
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import and_
+from uuid import UUID
 
-from src.dependencies.auth import VerifyToken, UserToken
-from src.dependencies.db import get_db
+from src.dependencies.auth import VerifyAdminToken, VerifyToken, UserToken
+from src.dependencies.counters import counter_buffer
+from src.dependencies.db import get_async_db, get_db
+from src.dependencies.follow_cache import follow_cache
+from src.follow_import import FollowImporter
 from src.models import User, Follow
-from src.schemas import CreateFollowerRequset
+from src.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
+from src.follow_lookup import MAX_LOOKUP_TARGETS, followed_among, lookup_follows
+from src.schemas import CreateFollowerRequset, FollowLookupRequest
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
 @router.post("/follow")
-def CreateFollow(
+async def CreateFollow(
     follow: CreateFollowerRequset,
     user: UserToken = Depends(VerifyToken),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     if follow.following_id == user.id:
         raise HTTPException(status_code=400, detail="can not follow self")
 
-    new_follow = Follow(user.id, follow.following_id)
+    try:
+        follower_id = UUID(user.id)
+        following_id = UUID(follow.following_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid id")
 
-    userFollowing: User = db.query(User).filter_by(id=new_follow.following_id).first()
+    userFollowing = await db.get(User, following_id)
 
     if not userFollowing:
         raise HTTPException(status_code=404, detail="user not found")
-    userFollowing.increment_followers()
 
     try:
-        db.add(new_follow)
-        db.commit()
+        db.add(Follow(follower_id, following_id))
+        await db.commit()
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Database error creating follow: {e}")
         raise HTTPException(status_code=500, detail="database error")
 
+    counter_buffer.add(following_id, "num_followers", 1)
+    await run_in_threadpool(follow_cache.add_follow, follower_id, following_id)
+
     return {"message": "User Followed"}
 
 
+@router.post("/follow/lookup")
+def LookupFollows(
+    req: FollowLookupRequest,
+    user: UserToken = Depends(VerifyToken),
+    db: Session = Depends(get_db),
+):
+    """Follow state of the current user for each target id, in request order."""
+    if len(req.target_ids) > MAX_LOOKUP_TARGETS:
+        raise HTTPException(
+            status_code=400, detail=f"at most {MAX_LOOKUP_TARGETS} target ids"
+        )
+
+    viewer_id = UUID(user.id)
+    target_ids = []
+    for target_id in req.target_ids:
+        try:
+            target_ids.append(UUID(target_id))
+        except ValueError:
+            target_ids.append(None)
+
+    flags = lookup_follows(
+        viewer_id, target_ids, lambda ids: followed_among(db, viewer_id, ids)
+    )
+    return {"result": flags}
+
+
+async def iter_ndjson(request: Request) -> AsyncIterator:
+    """Yield one parsed object per line of a streamed NDJSON body."""
+    buffer = b""
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _parse_line(line)
+    if buffer.strip():
+        yield _parse_line(buffer)
+
+
+def _parse_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+@router.post("/follow/bulk", dependencies=[Depends(VerifyAdminToken)])
+async def BulkCreateFollows(request: Request, db: Session = Depends(get_db)):
+    """
+    Import follow edges in bulk.
+
+    Accepts a JSON list of {"follower_id", "following_id"} objects (optionally
+    wrapped as {"edges": [...]}) or, with Content-Type application/x-ndjson,
+    one such object per line streamed in chunks.
+    """
+    importer = FollowImporter(db)
+
+    try:
+        if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+            chunk = []
+            async for edge in iter_ndjson(request):
+                chunk.append(edge)
+                if len(chunk) >= importer.chunk_size:
+                    await run_in_threadpool(importer.insert_chunk, chunk)
+                    chunk = []
+            await run_in_threadpool(importer.insert_chunk, chunk)
+        else:
+            try:
+                body = await request.json()
+            except ValueError:
+                raise HTTPException(status_code=400, detail="invalid json")
+
+            edges = body.get("edges") if isinstance(body, dict) else body
+            if not isinstance(edges, list):
+                raise HTTPException(status_code=400, detail="expected a list of edges")
+
+            await run_in_threadpool(importer.import_edges, edges)
+
+        result = await run_in_threadpool(importer.finish)
+    except SQLAlchemyError as e:
+        logger.error(f"Database error importing follows: {e}")
+        # Committed chunks stay; re-running the import skips them.
+        raise HTTPException(status_code=500, detail="database error")
+
+    return {"result": result}
+
+
+def follow_page(db: Session, condition, limit: int, cursor: Optional[str]) -> dict:
+    try:
+        follows, next_cursor = keyset_page(
+            db.query(Follow).filter(condition),
+            Follow.created_at,
+            Follow.id,
+            limit,
+            cursor,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+    return {
+        "result": [follow.to_dict() for follow in follows],
+        "next_cursor": next_cursor,
+    }
+
+
 @router.get("/follow")
 def GetUsersFollowers(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     user: UserToken = Depends(VerifyToken),
     db: Session = Depends(get_db),
 ):
-    followers = db.query(Follow).filter_by(following_id=user.id).all()
-
-    if not followers:
-        return {"result": []}
-    return {"result": [follower.to_dict() for follower in followers]}
+    return follow_page(db, Follow.following_id == UUID(user.id), limit, cursor)
 
 
 @router.get("/following")
 def GetUsersFollowing(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     user: UserToken = Depends(VerifyToken),
     db: Session = Depends(get_db),
 ):
-    following = db.query(Follow).filter_by(follower_id=user.id).all()
-
-    if not following:
-        return {"result": []}
-    return {"result": [f.to_dict() for f in following]}
+    return follow_page(db, Follow.follower_id == UUID(user.id), limit, cursor)
 
 
 @router.get("/follow/{id}")
@@ -91,6 +208,7 @@ def DeleteFollow(
 
     if not follow:
         raise HTTPException(status_code=404, detail="follow not found")
+    unfollowed_id = follow.following_id
 
     try:
         db.delete(follow)
@@ -100,4 +218,7 @@ def DeleteFollow(
         logger.error(f"Database error deleting follow: {e}")
         raise HTTPException(status_code=500, detail="database error")
 
+    counter_buffer.add(unfollowed_id, "num_followers", -1)
+    follow_cache.remove_follow(user.id, unfollowed_id)
+
     return Response(status_code=204)
@@ -1,11 +1,27 @@
 import logging
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
 
-from src.dependencies.auth import UserToken, VerifyToken, sign_jwt
-from src.dependencies.db import get_db
+from src.dependencies.auth import UserToken, VerifyToken, sign_jwt, token_cache
+from src.dependencies.availability import (
+    AvailabilityIndex,
+    availability,
+    get_availability,
+)
+from src.dependencies.db import get_async_db, get_db
+from src.dependencies.follow_cache import FollowCache, get_follow_cache
+from src.dependencies.hashing import HasherBusy, PasswordHasher, get_password_hasher
+from src.dependencies.profile_cache import (
+    ProfileCache,
+    get_profile_cache,
+    profile_dict,
+    with_pending_counts,
+)
 from src.models import User
 from src.schemas import CreateUserRequest, LoginUserRequest
 
@@ -19,27 +35,74 @@ def health_check():
     return {"status": "healthy", "service": "users-service"}
 
 
+@router.get("/metrics/cache")
+def cache_metrics(
+    follows: FollowCache = Depends(get_follow_cache),
+    profiles: ProfileCache = Depends(get_profile_cache),
+):
+    """Hit ratio and staleness of the service's caches."""
+    return {
+        "follow_cache": follows.stats(),
+        "profile_cache": profiles.stats(),
+        "availability_filter": availability.stats(),
+        "token_cache": token_cache.stats(),
+    }
+
+
 @router.get("/hello")
 async def hello(user: UserToken = Depends(VerifyToken)):
     return {"message": f"Hello, {user.username}"}
 
 
+def hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="service busy, try again",
+        headers={"Retry-After": "1"},
+    )
+
+
+def already_taken(fields: list[str]) -> HTTPException:
+    return HTTPException(
+        status_code=409, detail=f"{' and '.join(fields)} already taken"
+    )
+
+
 @router.post("/users/register")
 async def register(
     req: CreateUserRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    hasher: PasswordHasher = Depends(get_password_hasher),
+    index: AvailabilityIndex = Depends(get_availability),
 ):
-    user = User(req.email, req.password, req.username)
+    # Uniqueness first: a duplicate should not cost a bcrypt hash.
+    taken = await index.taken(db, username=req.username, email=req.email)
+    conflicts = [field for field, is_taken in taken.items() if is_taken]
+    if conflicts:
+        raise already_taken(conflicts)
+
+    try:
+        password_hash = await hasher.hash(req.password)
+    except HasherBusy:
+        raise hasher_busy()
+
+    user = User(req.email, None, req.username, password_hash=password_hash)
 
     try:
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
+    except IntegrityError:
+        # Lost a race with a concurrent registration of the same name.
+        await db.rollback()
+        raise already_taken(["username or email"])
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Registration error: {e}")
         raise HTTPException(status_code=500, detail="internal server error")
 
+    index.add(user.username, user.email)
+
     try:
         token = sign_jwt(str(user.id), str(user.username))
         return {"user": user.to_dict(), "token": token}
@@ -51,14 +114,21 @@ async def register(
 @router.post("/users/login")
 async def login(
     req: LoginUserRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    hasher: PasswordHasher = Depends(get_password_hasher),
 ):
-    user: User = db.query(User).filter_by(email=req.email).first()
+    result = await db.execute(select(User).filter_by(email=req.email))
+    user: User = result.scalars().first()
 
     if not user:
         raise HTTPException(status_code=400, detail="Invalid Login")
 
-    if not user.verify_password(req.password):
+    try:
+        valid = await hasher.verify(req.password, user.password)
+    except HasherBusy:
+        raise hasher_busy()
+
+    if not valid:
         raise HTTPException(status_code=400, detail="Incorrect Password")
 
     try:
@@ -67,3 +137,42 @@ async def login(
     except Exception as e:
         logger.error(f"Token generation error: {e}")
         raise HTTPException(status_code=500, detail="internal server error")
+
+
+# Declared before /users/{id}, which would otherwise match "available".
+@router.get("/users/available")
+async def CheckAvailability(
+    username: str | None = None,
+    email: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    index: AvailabilityIndex = Depends(get_availability),
+):
+    if username is None and email is None:
+        raise HTTPException(status_code=400, detail="username or email is required")
+
+    taken = await index.taken(db, username=username, email=email)
+    return {"result": {field: not is_taken for field, is_taken in taken.items()}}
+
+
+@router.get("/users/{id}")
+def GetUserProfile(
+    id: str,
+    db: Session = Depends(get_db),
+    profiles: ProfileCache = Depends(get_profile_cache),
+):
+    try:
+        user_id = UUID(id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="user not found")
+
+    def load(user_ids):
+        users = db.query(User).filter(User.id.in_(user_ids)).all()
+        return {user.id: profile_dict(user) for user in users}
+
+    profile = profiles.get(user_id, load)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="user not found")
+
+    profile = with_pending_counts(profile)
+    profile.pop("email")
+    return {"user": profile}
@@ -16,3 +16,7 @@ class LoginUserRequest(BaseModel):
 # Follower Schemas
 class CreateFollowerRequset(BaseModel):
     following_id: str
+
+
+class FollowLookupRequest(BaseModel):
+    target_ids: list[str]
@@ -1,13 +1,16 @@
 import os
+import tempfile
 import pytest
+import redis
 from typing import Generator
 from unittest.mock import MagicMock
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from src.dependencies.db import Base, get_db
+from src.dependencies.db import Base, get_async_db, get_db
 from src.dependencies.auth import VerifyToken, UserToken
 
 
@@ -21,14 +24,30 @@ os.environ.setdefault("JWT_SECRET", "test_secret_key_for_testing_only")
 os.environ.setdefault("JAEGER", "localhost:4317")
 
 
-# Test database setup - SQLite in-memory for fast tests
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
+# Test database setup - a temporary SQLite file, so the sync engine and the
+# aiosqlite engine used by async routes see the same data.
+_test_db_fd, TEST_DATABASE_PATH = tempfile.mkstemp(suffix=".db")
+os.close(_test_db_fd)
+SQLALCHEMY_TEST_DATABASE_URL = f"sqlite:///{TEST_DATABASE_PATH}"
 
 test_engine = create_engine(
     SQLALCHEMY_TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+# NullPool: each TestClient portal runs its own event loop, so connections
+# must not outlive a session.
+test_async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{TEST_DATABASE_PATH}", poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    test_async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if os.path.exists(TEST_DATABASE_PATH):
+        os.remove(TEST_DATABASE_PATH)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
 
@@ -47,6 +66,158 @@ def test_db() -> Generator[Session, None, None]:
         Base.metadata.drop_all(bind=test_engine)
 
 
+@pytest.fixture(autouse=True)
+def counters():
+    """Flush counter deltas to the test database and reset them per test."""
+    from src.dependencies.counters import counter_buffer
+
+    counter_buffer.session_factory = TestingSessionLocal
+    counter_buffer.clear()
+    yield counter_buffer
+    counter_buffer.clear()
+
+
+@pytest.fixture(autouse=True)
+def availability_index(monkeypatch):
+    """
+    Point the availability filter at the test database, unloaded. Tests call
+    load() themselves instead of running the background refresh thread.
+    """
+    from src.dependencies.availability import availability
+
+    availability.session_factory = TestingSessionLocal
+    availability.clear()
+    monkeypatch.setattr(availability, "start", lambda: None)
+    yield availability
+    availability.clear()
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used by the services."""
+
+    def __init__(self):
+        self.sets = {}
+        self.values = {}
+        self.ttls = {}
+        # Bumped on every write, for WATCH.
+        self.versions = {}
+
+    def _touch(self, key):
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        self._touch(key)
+        if ex is not None:
+            self.ttls[key] = ex
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key) or 0) + 1
+        self._touch(key)
+        return self.values[key]
+
+    def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    def smismember(self, key, members):
+        values = self.sets.get(key, set())
+        return [int(member in values) for member in members]
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        self._touch(key)
+
+    def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+        self._touch(key)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.sets.pop(key, None)
+            self.values.pop(key, None)
+            self.ttls.pop(key, None)
+            self._touch(key)
+
+    def rename(self, src, dst):
+        self.delete(dst)
+        for store in (self.sets, self.values, self.ttls):
+            if src in store:
+                store[dst] = store.pop(src)
+        self._touch(src)
+        self._touch(dst)
+
+    def expire(self, key, ttl, nx=False):
+        if (key in self.sets or key in self.values) and not (nx and key in self.ttls):
+            self.ttls[key] = ttl
+            self._touch(key)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """
+    Queues commands until execute(). After watch() and before multi()
+    commands run immediately, and execute() raises WatchError if a watched
+    key was written since it was watched.
+    """
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+        self.watched = None
+        self.queueing = True
+
+    def watch(self, *keys):
+        self.watched = {key: self.redis.versions.get(key, 0) for key in keys}
+        self.queueing = False
+
+    def multi(self):
+        self.queueing = True
+
+    def reset(self):
+        self.calls = []
+        self.watched = None
+        self.queueing = True
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            if not self.queueing:
+                return getattr(self.redis, name)(*args, **kwargs)
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    def execute(self):
+        watched = self.watched or {}
+        calls = self.calls
+        self.reset()
+        if any(self.redis.versions.get(k, 0) != v for k, v in watched.items()):
+            raise redis.WatchError("Watched variable changed.")
+        return [getattr(self.redis, name)(*a, **kw) for name, a, kw in calls]
+
+
+@pytest.fixture(autouse=True)
+def fake_redis():
+    """Back the follow and profile caches with an in-memory Redis per test."""
+    from src.dependencies.follow_cache import follow_cache
+    from src.dependencies.profile_cache import profile_cache
+
+    redis = FakeRedis()
+    originals = follow_cache.redis, profile_cache.redis
+    follow_cache.redis = redis
+    profile_cache.redis = redis
+    follow_cache.reset_stats()
+    profile_cache.clear()
+    yield redis
+    follow_cache.redis, profile_cache.redis = originals
+
+
 @pytest.fixture
 def override_get_db(test_db):
     """Override get_db dependency for testing."""
@@ -58,6 +229,15 @@ def override_get_db(test_db):
     return _override_get_db
 
 
+@pytest.fixture
+def override_get_async_db(test_db):
+    """Override get_async_db dependency for testing."""
+    async def _override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+    return _override_get_async_db
+
+
 @pytest.fixture
 def mock_user_token():
     """Create a mock user token for authenticated requests."""
@@ -76,7 +256,9 @@ def override_verify_token(mock_user_token):
 
 
 @pytest.fixture
-def test_client(override_get_db, override_verify_token) -> Generator[TestClient, None, None]:
+def test_client(
+    override_get_db, override_get_async_db, override_verify_token
+) -> Generator[TestClient, None, None]:
     """
     Create a test client with overridden dependencies.
 
@@ -89,6 +271,7 @@ def test_client(override_get_db, override_verify_token) -> Generator[TestClient,
 
     app = App()
     app.api.dependency_overrides[get_db] = override_get_db
+    app.api.dependency_overrides[get_async_db] = override_get_async_db
     app.api.dependency_overrides[VerifyToken] = override_verify_token
 
     with TestClient(app.api) as client:
@@ -99,7 +282,9 @@ def test_client(override_get_db, override_verify_token) -> Generator[TestClient,
 
 
 @pytest.fixture
-def test_client_no_auth(override_get_db) -> Generator[TestClient, None, None]:
+def test_client_no_auth(
+    override_get_db, override_get_async_db
+) -> Generator[TestClient, None, None]:
     """
     Create a test client without auth override (for testing auth failures).
     """
@@ -107,6 +292,7 @@ def test_client_no_auth(override_get_db) -> Generator[TestClient, None, None]:
 
     app = App()
     app.api.dependency_overrides[get_db] = override_get_db
+    app.api.dependency_overrides[get_async_db] = override_get_async_db
 
     with TestClient(app.api) as client:
         yield client
@@ -161,3 +347,22 @@ def mock_jwt_token():
 def auth_headers(mock_jwt_token):
     """Authorization headers with Bearer token."""
     return {"Authorization": f"Bearer {mock_jwt_token}"}
+
+
+@pytest.fixture
+def grpc_db(test_db):
+    """Route gRPC servicer sessions to the test database."""
+    from unittest.mock import patch
+
+    with patch("src.grpc.server.SessionLocal", return_value=test_db):
+        yield test_db
+
+
+@pytest.fixture
+def grpc_context():
+    """Mock gRPC servicer context."""
+    import grpc
+
+    context = MagicMock()
+    context.abort.side_effect = grpc.RpcError()
+    return context
@@ -107,3 +107,86 @@ class TestUserToken:
 
         assert user_token.id == "user-123"
         assert user_token.username == "testuser"
+
+
+class TestTokenCache:
+    """Tests for the verified-token cache used by VerifyToken."""
+
+    def test_repeat_verification_hits_cache(self):
+        """Test that the second verification of a token is a cache hit."""
+        from src.dependencies import auth as auth_module
+
+        auth_module.token_cache.clear()
+        token = auth_module.sign_jwt("user-123", "testuser")
+
+        with patch.object(
+            auth_module, "decode_jwt", wraps=auth_module.decode_jwt
+        ) as mock_decode:
+            first = auth_module.verify_token(token)
+            second = auth_module.verify_token(token)
+
+        assert first == second
+        assert mock_decode.call_count == 1
+        assert auth_module.token_cache.hits == 1
+        assert auth_module.token_cache.misses == 1
+
+    def test_entry_expires_at_token_exp(self):
+        """Test that cached entries never outlive the token's exp claim."""
+        import time
+
+        from src.dependencies import auth as auth_module
+
+        auth_module.token_cache.clear()
+        exp = int(time.time()) + 30
+        token = jwt.encode(
+            {"user_id": "user-123", "username": "testuser", "exp": exp},
+            auth_module.JWT_SECRET,
+            algorithm=auth_module.JWT_ALGO,
+        )
+
+        auth_module.verify_token(token)
+
+        (_, expires_at), = auth_module.token_cache._data.values()
+        assert expires_at <= exp
+
+    def test_invalid_token_not_cached(self):
+        """Test that failed verifications are not cached."""
+        from src.dependencies import auth as auth_module
+
+        auth_module.token_cache.clear()
+
+        with pytest.raises(jwt.InvalidTokenError):
+            auth_module.verify_token("invalid.token.here")
+
+        assert len(auth_module.token_cache) == 0
+
+
+class TestTTLCache:
+    """Tests for the bounded TTL cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused entry is evicted at capacity."""
+        from src.dependencies.cache import TTLCache
+
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_expired_entry_is_a_miss(self):
+        """Test that expired entries are dropped on read."""
+        import time
+
+        from src.dependencies.cache import TTLCache
+
+        cache = TTLCache()
+        cache.set("a", 1, expires_at=time.time() - 1)
+
+        assert cache.get("a") is None
+        assert cache.stats()["misses"] == 1
+        assert len(cache) == 0
@@ -0,0 +1,147 @@
+import asyncio
+from unittest.mock import patch
+
+from src.dependencies.bloom import BloomFilter
+
+from tests.conftest import TestingAsyncSessionLocal
+from tests.test_grpc import make_user
+
+
+def taken(index, **values):
+    async def check():
+        async with TestingAsyncSessionLocal() as db:
+            return await index.taken(db, **values)
+
+    return asyncio.run(check())
+
+
+class TestBloomFilter:
+    """Tests for the Bloom filter behind the availability index."""
+
+    def test_no_false_negatives(self):
+        """Test that every added value is reported present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        values = [f"user{i}" for i in range(1000)]
+        for value in values:
+            bloom.add(value)
+
+        assert all(value in bloom for value in values)
+        assert len(bloom) == 1000
+
+    def test_false_positive_rate(self):
+        """Test that the observed error rate stays near the configured one."""
+        bloom = BloomFilter(capacity=5000, error_rate=0.01)
+        for i in range(5000):
+            bloom.add(f"taken{i}")
+
+        false_positives = sum(f"free{i}" in bloom for i in range(10000))
+
+        assert false_positives / 10000 < 0.02
+
+
+class TestAvailabilityIndex:
+    """Tests for the taken username/email index."""
+
+    def test_unloaded_index_checks_database(self, test_db, availability_index):
+        """Test that every check goes to the database before the first load."""
+        make_user(test_db, "alice")
+
+        assert taken(availability_index, username="alice", email="bob@example.com") == {
+            "username": True,
+            "email": False,
+        }
+        assert availability_index.stats()["filtered"] == 0
+
+    def test_loaded_index_skips_database_for_free_names(
+        self, test_db, availability_index
+    ):
+        """Test that filter misses are answered without a query."""
+        make_user(test_db, "alice")
+        assert availability_index.load() == 1
+
+        with patch.object(TestingAsyncSessionLocal.class_, "execute") as execute:
+            result = taken(availability_index, username="somebody-new")
+
+        execute.assert_not_called()
+        assert result == {"username": False}
+        assert taken(availability_index, email="alice@example.com") == {"email": True}
+
+    def test_add_during_load_is_kept(self, test_db, availability_index):
+        """Test that a registration racing a rebuild is not dropped."""
+        original_fill = availability_index._fill
+
+        def fill_then_register(*args):
+            watermark = original_fill(*args)
+            availability_index.add("late", "late@example.com")
+            return watermark
+
+        with patch.object(availability_index, "_fill", fill_then_register):
+            availability_index.load()
+
+        assert availability_index.might_be_taken("username", "late")
+
+    def test_refresh_picks_up_other_replicas(self, test_db, availability_index):
+        """Test that refresh adds users registered elsewhere."""
+        make_user(test_db, "alice")
+        availability_index.load()
+        make_user(test_db, "bob")
+
+        assert availability_index.refresh() >= 2
+        assert availability_index.might_be_taken("username", "bob")
+
+
+class TestAvailabilityEndpoint:
+    """Tests for GET /users/available and registration conflicts."""
+
+    def test_available(self, test_client, test_db, availability_index):
+        """Test that taken and free values are reported per field."""
+        make_user(test_db, "alice")
+        availability_index.load()
+
+        response = test_client.get(
+            "/users/available",
+            params={"username": "alice", "email": "new@example.com"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["result"] == {"username": False, "email": True}
+
+    def test_requires_a_field(self, test_client):
+        """Test that a request without username or email is rejected."""
+        assert test_client.get("/users/available").status_code == 400
+
+    def test_register_conflict_skips_hashing(self, test_client_no_auth, test_db):
+        """Test that a duplicate registration returns 409 before bcrypt runs."""
+        make_user(test_db, "alice")
+
+        with patch("src.dependencies.hashing.PasswordHasher.hash") as hash_password:
+            response = test_client_no_auth.post(
+                "/users/register",
+                json={
+                    "email": "other@example.com",
+                    "password": "password123",
+                    "username": "alice",
+                },
+            )
+
+        assert response.status_code == 409
+        assert "username" in response.json()["detail"]
+        hash_password.assert_not_called()
+
+    def test_register_adds_to_filter(
+        self, test_client_no_auth, test_db, availability_index
+    ):
+        """Test that a new registration is immediately reported taken."""
+        availability_index.load()
+
+        test_client_no_auth.post(
+            "/users/register",
+            json={
+                "email": "new@example.com",
+                "password": "password123",
+                "username": "new",
+            },
+        )
+
+        assert availability_index.might_be_taken("username", "new")
+        assert availability_index.might_be_taken("email", "new@example.com")
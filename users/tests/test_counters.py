@@ -0,0 +1,125 @@
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from src.dependencies.counters import CounterBuffer
+
+
+def make_user(db, username):
+    from src.models import User
+
+    with patch("src.models.hashpw", return_value=b"hashed"), \
+         patch("src.models.gensalt"):
+        user = User(f"{username}@example.com", "password123", username)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+class TestCounterBuffer:
+    """Tests for the write-behind counter buffer."""
+
+    def test_flush_applies_deltas(self, test_db, counters):
+        """Test that pending deltas are added to the stored counters."""
+        user = make_user(test_db, "alice")
+        user.num_tweets = 5
+        test_db.commit()
+
+        counters.add(user.id, "num_tweets", 1)
+        counters.add(user.id, "num_tweets", 1)
+        counters.add(str(user.id), "num_followers", 3)
+        counters.add(user.id, "num_followers", -1)
+
+        assert counters.flush() == 1
+
+        test_db.refresh(user)
+        assert user.num_tweets == 7
+        assert user.num_followers == 2
+        assert counters.pending(user.id, "num_tweets") == 0
+
+    def test_reads_merge_pending_deltas(self, test_db, counters):
+        """Test that to_dict includes deltas that have not been flushed."""
+        user = make_user(test_db, "alice")
+
+        counters.add(user.id, "num_followers", 2)
+
+        assert user.to_dict()["num_followers"] == 2
+        assert user.num_followers == 0
+
+    def test_flush_batches_users_into_one_statement(self, test_db, counters):
+        """Test that one flush issues a single UPDATE for all users."""
+        from sqlalchemy import event
+
+        users = [make_user(test_db, f"user{i}") for i in range(3)]
+        for user in users:
+            counters.add(user.id, "num_tweets", 1)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = test_db.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            assert counters.flush() == 3
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert len([s for s in statements if s.startswith("UPDATE")]) == 1
+
+    def test_failed_flush_keeps_deltas(self):
+        """Test that deltas survive a failed flush and are retried."""
+        session = MagicMock()
+        session.execute.side_effect = Exception("db down")
+        counters = CounterBuffer(session_factory=lambda: session)
+        user_id = uuid4()
+
+        counters.add(user_id, "num_tweets", 4)
+
+        assert counters.flush() == 0
+        assert counters.pending(user_id, "num_tweets") == 4
+        session.rollback.assert_called_once()
+
+    def test_rejects_unknown_column(self, counters):
+        """Test that only counter columns can be buffered."""
+        with pytest.raises(ValueError):
+            counters.add(uuid4(), "password", 1)
+
+
+class TestCounterRPCs:
+    """Tests for the tweet counter RPCs."""
+
+    def test_increment_and_decrement_tweets_rpc(self, grpc_db, counters):
+        """Test the tweet counter RPCs buffer their deltas."""
+        import src.grpc.user_service_pb2 as pb2
+        from src.grpc.server import UserService
+
+        user_id = str(make_user(grpc_db, "alice").id)
+        service = UserService()
+
+        service.IncrementsTweets(pb2.IncrementTweetsReq(user_id=user_id), None)
+        service.IncrementsTweets(pb2.IncrementTweetsReq(user_id=user_id), None)
+        res = service.DecrementTweets(pb2.DecrementTweetsReq(user_id=user_id), None)
+
+        assert res.success
+        assert counters.pending(user_id, "num_tweets") == 1
+        assert not service.IncrementsTweets(
+            pb2.IncrementTweetsReq(user_id="not-a-uuid"), None
+        ).success
+
+    def test_unknown_user_is_not_buffered(self, grpc_db, counters):
+        """Test that counter RPCs for a user that does not exist fail."""
+        import src.grpc.user_service_pb2 as pb2
+        from src.grpc.server import UserService
+
+        user_id = str(uuid4())
+        service = UserService()
+
+        assert not service.IncrementsTweets(
+            pb2.IncrementTweetsReq(user_id=user_id), None
+        ).success
+        assert not service.DecrementTweets(
+            pb2.DecrementTweetsReq(user_id=user_id), None
+        ).success
+        assert counters.pending(user_id, "num_tweets") == 0
@@ -0,0 +1,113 @@
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import redis
+import src.grpc.user_service_pb2 as pb2
+from src.dependencies.follow_cache import FollowCache, follow_cache
+from src.grpc.server import UserService
+
+
+class TestFollowCache:
+    """Tests for the Redis follower/following set cache."""
+
+    def test_miss_loads_then_hits(self, fake_redis):
+        """Test that the first read loads from the loader and later reads hit."""
+        cache = FollowCache(fake_redis)
+        loader = MagicMock(return_value=["a", "b"])
+
+        assert sorted(cache.get_followers("u1", loader)) == ["a", "b"]
+        assert sorted(cache.get_followers("u1", loader)) == ["a", "b"]
+
+        loader.assert_called_once()
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_empty_set_is_cached(self, fake_redis):
+        """Test that a user with no followers is not reloaded every time."""
+        cache = FollowCache(fake_redis)
+        loader = MagicMock(return_value=[])
+
+        assert cache.get_followers("u1", loader) == []
+        assert cache.get_followers("u1", loader) == []
+
+        loader.assert_called_once()
+
+    def test_follow_updates_loaded_sets(self, fake_redis):
+        """Test that add/remove keep both directions of a loaded set current."""
+        cache = FollowCache(fake_redis)
+        cache.get_followers("target", lambda: ["a"])
+        cache.get_following("b", lambda: [])
+
+        cache.add_follow("b", "target")
+        assert sorted(cache.get_followers("target", list)) == ["a", "b"]
+        assert cache.get_following("b", list) == ["target"]
+
+        cache.remove_follow("a", "target")
+        assert cache.get_followers("target", list) == ["b"]
+
+    def test_update_on_unloaded_set_forces_rebuild(self, fake_redis):
+        """Test that an update to an unloaded key does not count as loaded."""
+        cache = FollowCache(fake_redis)
+
+        cache.add_follow("b", "target")
+
+        assert sorted(cache.get_followers("target", lambda: ["a", "b"])) == ["a", "b"]
+        assert cache.stats()["misses"] == 1
+        assert fake_redis.ttls["followers:target"] == cache.ttl
+
+    def test_follow_during_rebuild_is_not_lost(self, fake_redis):
+        """Test that a follow landing mid-load is not overwritten by the snapshot."""
+        cache = FollowCache(fake_redis)
+
+        def loader():
+            # "b" follows after the database read but before the fill.
+            cache.add_follow("b", "target")
+            return ["a"]
+
+        assert cache.get_followers("target", loader) == ["a"]
+        assert "#loaded" not in fake_redis.smembers("followers:target")
+        assert fake_redis.sets.keys() == {"followers:target", "following:b"}
+
+        assert sorted(cache.get_followers("target", lambda: ["a", "b"])) == ["a", "b"]
+        assert sorted(cache.get_followers("target", list)) == ["a", "b"]
+
+    def test_redis_errors_fall_back_to_loader(self):
+        """Test that reads still work when Redis is unavailable."""
+        broken = MagicMock()
+        broken.smembers.side_effect = redis.ConnectionError()
+        cache = FollowCache(broken)
+
+        assert cache.get_followers("u1", lambda: ["a"]) == ["a"]
+        assert cache.stats()["errors"] == 1
+
+
+class TestFollowCacheServing:
+    """Tests for serving GetFollowers from the cache."""
+
+    def test_get_followers_served_from_cache(self, grpc_db, grpc_context):
+        """Test that repeat GetFollowers calls do not reload from the database."""
+        from src.models import Follow
+
+        target = uuid4()
+        follower = uuid4()
+        grpc_db.add(Follow(follower, target))
+        grpc_db.commit()
+        request = pb2.GetFollowersReq(user_id=str(target))
+
+        UserService().GetFollowers(request, grpc_context)
+        grpc_db.query(Follow).delete()
+        grpc_db.commit()
+        response = UserService().GetFollowers(request, grpc_context)
+
+        assert [f.follower_id for f in response.followers] == [str(follower)]
+        assert follow_cache.stats()["hits"] == 1
+
+    def test_cache_metrics_route(self, test_client):
+        """Test that cache stats are exposed over HTTP."""
+        response = test_client.get("/metrics/cache")
+
+        assert response.status_code == 200
+        assert "hit_ratio" in response.json()["follow_cache"]
+        assert "max_age_seconds" in response.json()["follow_cache"]
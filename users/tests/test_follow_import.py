@@ -0,0 +1,118 @@
+import json
+from unittest.mock import patch
+from uuid import uuid4
+
+from src.follow_import import FollowImporter, parse_edge
+
+
+def make_user(db, username):
+    from src.models import User
+
+    with patch("src.models.hashpw", return_value=b"hashed"), \
+         patch("src.models.gensalt"):
+        user = User(f"{username}@example.com", "password123", username)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+class TestFollowImporter:
+    """Tests for bulk follow imports."""
+
+    def test_parse_edge(self):
+        """Test edge parsing from dicts and pairs."""
+        a, b = uuid4(), uuid4()
+
+        assert parse_edge({"follower_id": str(a), "following_id": str(b)}) == (a, b)
+        assert parse_edge([str(a), str(b)]) == (a, b)
+        assert parse_edge([str(a), str(a)]) is None
+        assert parse_edge({"follower_id": "nope", "following_id": str(b)}) is None
+        assert parse_edge(None) is None
+
+    def test_import_skips_duplicates_and_recounts(self, test_db):
+        """Test that existing and repeated edges are skipped and counts rebuilt."""
+        from src.models import Follow
+
+        target = make_user(test_db, "target")
+        existing = uuid4()
+        test_db.add(Follow(existing, target.id))
+        test_db.commit()
+        new_followers = [uuid4() for _ in range(5)]
+        edges = [(f, target.id) for f in [existing, *new_followers, new_followers[0]]]
+
+        importer = FollowImporter(test_db, chunk_size=3)
+        importer.import_edges(edges)
+        result = importer.finish()
+
+        assert result["inserted"] == 5
+        assert result["skipped"] == 2
+        assert result["recounted"] == 1
+        assert test_db.query(Follow).count() == 6
+        test_db.refresh(target)
+        assert target.num_followers == 6
+
+    def test_import_invalidates_follow_cache(self, test_db, fake_redis):
+        """Test that cached sets of imported users are dropped."""
+        target = make_user(test_db, "target")
+        fake_redis.sadd(f"followers:{target.id}", "#loaded")
+
+        importer = FollowImporter(test_db)
+        importer.import_edges([(uuid4(), target.id)])
+        importer.finish()
+
+        assert f"followers:{target.id}" not in fake_redis.sets
+
+
+class TestBulkFollowEndpoint:
+    """Tests for POST /follow/bulk."""
+
+    def test_requires_admin_token(self, test_client):
+        """Test that the endpoint is closed without the admin token."""
+        with patch("src.dependencies.auth.ADMIN_TOKEN", "secret"):
+            response = test_client.post("/follow/bulk", json=[])
+
+        assert response.status_code == 403
+
+    def test_json_import(self, test_client, test_db):
+        """Test importing a JSON edge list."""
+        target = make_user(test_db, "target")
+        edges = [
+            {"follower_id": str(uuid4()), "following_id": str(target.id)}
+            for _ in range(3)
+        ]
+
+        with patch("src.dependencies.auth.ADMIN_TOKEN", "secret"):
+            response = test_client.post(
+                "/follow/bulk",
+                json={"edges": edges + [{"follower_id": "bad"}]},
+                headers={"X-Admin-Token": "secret"},
+            )
+
+        assert response.status_code == 200
+        assert response.json()["result"]["inserted"] == 3
+        assert response.json()["result"]["invalid"] == 1
+        test_db.refresh(target)
+        assert target.num_followers == 3
+
+    def test_ndjson_import(self, test_client, test_db):
+        """Test importing a streamed NDJSON body."""
+        target = make_user(test_db, "target")
+        lines = [
+            json.dumps({"follower_id": str(uuid4()), "following_id": str(target.id)})
+            for _ in range(4)
+        ]
+
+        with patch("src.dependencies.auth.ADMIN_TOKEN", "secret"):
+            response = test_client.post(
+                "/follow/bulk",
+                content="\n".join(lines + ["{not json"]) + "\n",
+                headers={
+                    "X-Admin-Token": "secret",
+                    "Content-Type": "application/x-ndjson",
+                },
+            )
+
+        assert response.status_code == 200
+        assert response.json()["result"]["inserted"] == 4
+        assert response.json()["result"]["invalid"] == 1
@@ -0,0 +1,583 @@
+import asyncio
+import logging
+from concurrent import futures
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import grpc
+import pytest
+import src.grpc.user_service_pb2 as pb2
+import src.grpc.user_service_pb2_grpc as pb2_grpc
+from src.grpc.server import UserService
+
+
+def make_user(db, username):
+    from src.models import User
+
+    with patch("src.models.hashpw", return_value=b"hashed"), \
+         patch("src.models.gensalt"):
+        user = User(f"{username}@example.com", "password123", username)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+class TestGetUsers:
+    """Tests for the batched GetUsers RPC."""
+
+    def test_returns_users_in_request_order(self, grpc_db, grpc_context):
+        """Test that results follow request order and mark missing ids."""
+        alice = make_user(grpc_db, "alice")
+        bob = make_user(grpc_db, "bob")
+        missing = str(uuid4())
+
+        response = UserService().GetUsers(
+            pb2.GetUsersReq(user_ids=[str(bob.id), missing, str(alice.id)]),
+            grpc_context,
+        )
+
+        assert [res.valid for res in response.users] == [True, False, True]
+        assert response.users[0].user.username == "bob"
+        assert response.users[2].user.username == "alice"
+
+    def test_malformed_ids_are_marked_missing(self, grpc_db, grpc_context):
+        """Test that ids that are not UUIDs are reported as missing."""
+        alice = make_user(grpc_db, "alice")
+
+        response = UserService().GetUsers(
+            pb2.GetUsersReq(user_ids=["not-a-uuid", str(alice.id)]),
+            grpc_context,
+        )
+
+        assert [res.valid for res in response.users] == [False, True]
+
+    def test_uses_single_query(self, grpc_db, grpc_context):
+        """Test that a batch is answered by one SELECT."""
+        from sqlalchemy import event
+
+        user_ids = [str(make_user(grpc_db, f"user{i}").id) for i in range(5)]
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = grpc_db.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            UserService().GetUsers(
+                pb2.GetUsersReq(user_ids=user_ids),
+                grpc_context,
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert len([s for s in statements if s.startswith("SELECT")]) == 1
+
+    def test_rejects_oversized_batch(self, grpc_db, grpc_context):
+        """Test that batches above the limit are rejected."""
+        from src.grpc.server import MAX_BATCH_SIZE
+
+        with pytest.raises(grpc.RpcError):
+            UserService().GetUsers(
+                pb2.GetUsersReq(user_ids=[str(uuid4())] * (MAX_BATCH_SIZE + 1)),
+                grpc_context,
+            )
+
+        grpc_context.abort.assert_called_once()
+
+
+class TestStreamFollowers:
+    """Tests for the keyset-paginated follower streams."""
+
+    def follow_many(self, db, following_id, count):
+        from src.models import Follow
+
+        follower_ids = sorted(uuid4() for _ in range(count))
+        db.add_all(Follow(follower_id, following_id) for follower_id in follower_ids)
+        db.commit()
+        return follower_ids
+
+    def test_streams_all_followers_in_chunks(self, grpc_db, grpc_context):
+        """Test that every follower is streamed once, in id order."""
+        target = uuid4()
+        follower_ids = self.follow_many(grpc_db, target, 25)
+
+        chunks = list(UserService().StreamFollowers(
+            pb2.StreamFollowsReq(user_id=str(target), chunk_size=10),
+            grpc_context,
+        ))
+
+        assert [len(chunk.user_ids) for chunk in chunks] == [10, 10, 5]
+        streamed = [user_id for chunk in chunks for user_id in chunk.user_ids]
+        assert streamed == [str(follower_id) for follower_id in follower_ids]
+
+    def test_resumes_after_cursor(self, grpc_db, grpc_context):
+        """Test that after_id resumes the stream past the given id."""
+        target = uuid4()
+        follower_ids = self.follow_many(grpc_db, target, 5)
+
+        chunks = list(UserService().StreamFollowers(
+            pb2.StreamFollowsReq(
+                user_id=str(target), after_id=str(follower_ids[1])
+            ),
+            grpc_context,
+        ))
+
+        streamed = [user_id for chunk in chunks for user_id in chunk.user_ids]
+        assert streamed == [str(follower_id) for follower_id in follower_ids[2:]]
+
+    def test_stream_following(self, grpc_db, grpc_context):
+        """Test streaming the accounts a user follows."""
+        from src.models import Follow
+
+        follower = uuid4()
+        following_ids = sorted(uuid4() for _ in range(3))
+        grpc_db.add_all(Follow(follower, followed) for followed in following_ids)
+        grpc_db.commit()
+
+        chunks = list(UserService().StreamFollowing(
+            pb2.StreamFollowsReq(user_id=str(follower)), grpc_context
+        ))
+
+        assert list(chunks[0].user_ids) == [str(i) for i in following_ids]
+
+    def test_stops_when_client_cancels(self, grpc_db, grpc_context):
+        """Test that the stream stops once the client goes away."""
+        target = uuid4()
+        self.follow_many(grpc_db, target, 5)
+        grpc_context.is_active.return_value = False
+
+        chunks = list(UserService().StreamFollowers(
+            pb2.StreamFollowsReq(user_id=str(target), chunk_size=2),
+            grpc_context,
+        ))
+
+        assert chunks == []
+
+
+class TestPackedIds:
+    """Tests for the 16-byte packed id encoding."""
+
+    def test_pack_round_trip(self):
+        """Test that packed ids unpack to the same UUIDs."""
+        from src.grpc.ids import pack_ids, unpack_ids
+
+        ids = [uuid4() for _ in range(3)]
+
+        packed = pack_ids(ids)
+
+        assert len(packed) == 48
+        assert unpack_ids(packed) == ids
+        assert pack_ids(str(i) for i in ids) == packed
+
+    def test_get_users_packed(self, grpc_db, grpc_context):
+        """Test that packed requests get packed ids back."""
+        from src.grpc.ids import pack_ids
+
+        alice = make_user(grpc_db, "alice")
+        missing = uuid4()
+
+        response = UserService().GetUsers(
+            pb2.GetUsersReq(packed_user_ids=pack_ids([missing, alice.id]), packed=True),
+            grpc_context,
+        )
+
+        assert [res.valid for res in response.users] == [False, True]
+        assert response.users[1].user.id == ""
+        assert response.users[1].user.id_bytes == alice.id.bytes
+
+    def test_get_users_rejects_truncated_ids(self, grpc_db, grpc_context):
+        """Test that packed ids of the wrong length are rejected."""
+        with pytest.raises(grpc.RpcError):
+            UserService().GetUsers(
+                pb2.GetUsersReq(packed_user_ids=b"\x00" * 17, packed=True),
+                grpc_context,
+            )
+
+    def test_get_followers_packed(self, grpc_db, grpc_context):
+        """Test that packed GetFollowers returns one concatenated id field."""
+        from src.grpc.ids import unpack_ids
+        from src.models import Follow
+
+        target = uuid4()
+        follower_ids = [uuid4() for _ in range(3)]
+        grpc_db.add_all(Follow(follower_id, target) for follower_id in follower_ids)
+        grpc_db.commit()
+
+        response = UserService().GetFollowers(
+            pb2.GetFollowersReq(user_id=str(target), packed=True), grpc_context
+        )
+
+        assert len(response.followers) == 0
+        assert sorted(unpack_ids(response.packed_follower_ids)) == sorted(follower_ids)
+
+    def test_get_following_unpacked(self, grpc_db, grpc_context):
+        """Test that GetFollowing answers with GetFollowingRes."""
+        from src.models import Follow
+
+        follower = uuid4()
+        following = uuid4()
+        grpc_db.add(Follow(follower, following))
+        grpc_db.commit()
+
+        response = UserService().GetFollowing(
+            pb2.GetFollowingReq(user_id=str(follower)), grpc_context
+        )
+
+        assert isinstance(response, pb2.GetFollowingRes)
+        assert response.follwing[0].following_id == str(following)
+
+    def test_stream_packed(self, grpc_db, grpc_context):
+        """Test that packed streams carry ids in packed_ids."""
+        from src.grpc.ids import unpack_ids
+        from src.models import Follow
+
+        target = uuid4()
+        follower_ids = sorted(uuid4() for _ in range(5))
+        grpc_db.add_all(Follow(follower_id, target) for follower_id in follower_ids)
+        grpc_db.commit()
+
+        chunks = list(UserService().StreamFollowers(
+            pb2.StreamFollowsReq(user_id=str(target), chunk_size=2, packed=True),
+            grpc_context,
+        ))
+
+        assert all(not chunk.user_ids for chunk in chunks)
+        streamed = [i for chunk in chunks for i in unpack_ids(chunk.packed_ids)]
+        assert streamed == follower_ids
+
+
+class TestCheckFollows:
+    """Tests for the follow-state bitmap RPC."""
+
+    def test_bitmap_from_database(self, grpc_db, grpc_context):
+        """Test the bitmap when the viewer's following set is not cached."""
+        from src.models import Follow
+
+        viewer = uuid4()
+        targets = [uuid4() for _ in range(10)]
+        grpc_db.add_all(Follow(viewer, targets[i]) for i in (0, 3, 9))
+        grpc_db.commit()
+
+        response = UserService().CheckFollows(
+            pb2.CheckFollowsReq(
+                viewer_id=str(viewer),
+                target_ids=[str(t) for t in targets] + ["not-a-uuid"],
+            ),
+            grpc_context,
+        )
+
+        assert response.count == 11
+        assert response.bitmap == bytes([0b00001001, 0b00000010])
+
+    def test_bitmap_from_cache(self, grpc_db, grpc_context, fake_redis):
+        """Test that a loaded following set answers without the database."""
+        from src.grpc.ids import pack_ids
+
+        viewer, followed, other = uuid4(), uuid4(), uuid4()
+        fake_redis.sadd(f"following:{viewer}", "#loaded", str(followed))
+
+        with patch("src.grpc.server.followed_among") as followed_among:
+            response = UserService().CheckFollows(
+                pb2.CheckFollowsReq(
+                    viewer_id=str(viewer), packed_target_ids=pack_ids([other, followed])
+                ),
+                grpc_context,
+            )
+
+        followed_among.assert_not_called()
+        assert response.bitmap == bytes([0b10])
+
+    def test_rejects_too_many_targets(self, grpc_db, grpc_context):
+        """Test that lookups above the target limit are rejected."""
+        from src.follow_lookup import MAX_LOOKUP_TARGETS
+
+        with pytest.raises(grpc.RpcError):
+            UserService().CheckFollows(
+                pb2.CheckFollowsReq(
+                    viewer_id=str(uuid4()),
+                    target_ids=[str(uuid4())] * (MAX_LOOKUP_TARGETS + 1),
+                ),
+                grpc_context,
+            )
+
+
+class TestAsyncUserService:
+    """Tests for the asyncio servicer used by the grpc.aio server."""
+
+    def service(self):
+        from src.grpc.server import AsyncUserService
+
+        from tests.conftest import TestingAsyncSessionLocal
+
+        return AsyncUserService(TestingAsyncSessionLocal)
+
+    def test_get_users_in_request_order(self, test_db, grpc_context):
+        """Test that GetUsers loads misses through the async session."""
+        alice = make_user(test_db, "alice")
+        bob = make_user(test_db, "bob")
+        missing = str(uuid4())
+
+        response = asyncio.run(
+            self.service().GetUsers(
+                pb2.GetUsersReq(user_ids=[str(bob.id), missing, str(alice.id)]),
+                grpc_context,
+            )
+        )
+
+        assert [u.valid for u in response.users] == [True, False, True]
+        assert response.users[0].user.username == "bob"
+        assert response.users[2].user.username == "alice"
+
+    def test_get_user(self, test_db, grpc_context):
+        """Test that GetUser resolves known ids and rejects unknown ones."""
+        alice = make_user(test_db, "alice")
+        service = self.service()
+
+        found = asyncio.run(
+            service.GetUser(pb2.GetUserReq(user_id=str(alice.id)), grpc_context)
+        )
+        unknown = asyncio.run(
+            service.GetUser(pb2.GetUserReq(user_id=str(uuid4())), grpc_context)
+        )
+
+        assert found.valid and found.user.username == "alice"
+        assert not unknown.valid
+
+    def test_rejects_oversized_batch(self, test_db):
+        """Test that the async abort is awaited for oversized batches."""
+        from src.grpc.server import MAX_BATCH_SIZE
+
+        context = AsyncMock()
+        context.abort.side_effect = grpc.RpcError()
+
+        with pytest.raises(grpc.RpcError):
+            asyncio.run(
+                self.service().GetUsers(
+                    pb2.GetUsersReq(user_ids=[str(uuid4())] * (MAX_BATCH_SIZE + 1)),
+                    context,
+                )
+            )
+
+        context.abort.assert_awaited_once()
+
+    def test_increments_tweets(self, test_db, grpc_context):
+        """Test that the counter RPCs buffer deltas without a thread hop."""
+        from src.dependencies.counters import counter_buffer
+
+        user_id = str(make_user(test_db, "alice").id)
+        unknown = str(uuid4())
+
+        def increment(user_id):
+            return asyncio.run(
+                self.service().IncrementsTweets(
+                    pb2.IncrementTweetsReq(user_id=user_id), grpc_context
+                )
+            )
+
+        assert increment(user_id).success
+        assert not increment(unknown).success
+        assert counter_buffer.pending(user_id, "num_tweets") == 1
+        assert counter_buffer.pending(unknown, "num_tweets") == 0
+
+
+class TestAioServer:
+    """Tests that call AsyncUserService through a real grpc.aio server."""
+
+    def call(self, rpc):
+        """Run `await rpc(stub)` against AsyncUserService on a local port."""
+        from src.grpc.server import AsyncUserService
+
+        from tests.conftest import TestingAsyncSessionLocal
+
+        async def run():
+            server = grpc.aio.server(
+                migration_thread_pool=futures.ThreadPoolExecutor(max_workers=2)
+            )
+            pb2_grpc.add_UserServicer_to_server(
+                AsyncUserService(TestingAsyncSessionLocal), server
+            )
+            port = server.add_insecure_port("localhost:0")
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+                    return await rpc(pb2_grpc.UserStub(channel))
+            finally:
+                await server.stop(None)
+
+        return asyncio.run(run())
+
+    @staticmethod
+    def servicer_errors(caplog) -> list[str]:
+        """Exceptions the server logged from handlers, e.g. after an abort."""
+        return [
+            record.getMessage()
+            for record in caplog.records
+            if record.name.startswith("grpc") and record.levelno >= logging.ERROR
+        ]
+
+    def stream(self, method, request):
+        async def rpc(stub):
+            return [chunk async for chunk in getattr(stub, method)(request)]
+
+        return self.call(rpc)
+
+    def test_streams_followers_and_following(self, grpc_db):
+        """Test that the async streams page through the async session."""
+        from src.models import Follow
+
+        target = uuid4()
+        follower_ids = sorted(uuid4() for _ in range(5))
+        grpc_db.add_all(Follow(follower_id, target) for follower_id in follower_ids)
+        grpc_db.commit()
+
+        followers = self.stream(
+            "StreamFollowers",
+            pb2.StreamFollowsReq(
+                user_id=str(target), after_id=str(follower_ids[0]), chunk_size=2
+            ),
+        )
+        following = self.stream(
+            "StreamFollowing",
+            pb2.StreamFollowsReq(user_id=str(follower_ids[0]), packed=True),
+        )
+
+        assert [len(chunk.user_ids) for chunk in followers] == [2, 2]
+        streamed = [user_id for chunk in followers for user_id in chunk.user_ids]
+        assert streamed == [str(follower_id) for follower_id in follower_ids[1:]]
+        assert [chunk.packed_ids for chunk in following] == [target.bytes]
+
+    def test_stream_rejects_malformed_id(self, grpc_db, caplog):
+        """Test that a bad stream request fails with INVALID_ARGUMENT."""
+        with pytest.raises(grpc.aio.AioRpcError) as error:
+            self.stream("StreamFollowers", pb2.StreamFollowsReq(user_id="nope"))
+
+        assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+        assert self.servicer_errors(caplog) == []
+
+    def test_inherited_check_follows(self, grpc_db, caplog):
+        """Test the sync CheckFollows on the migration thread pool."""
+        from src.follow_lookup import MAX_LOOKUP_TARGETS
+        from src.models import Follow
+
+        viewer, followed, other = uuid4(), uuid4(), uuid4()
+        grpc_db.add(Follow(viewer, followed))
+        grpc_db.commit()
+
+        def check(viewer_id, target_ids):
+            return self.call(
+                lambda stub: stub.CheckFollows(
+                    pb2.CheckFollowsReq(viewer_id=viewer_id, target_ids=target_ids)
+                )
+            )
+
+        response = check(str(viewer), [str(other), str(followed)])
+        assert (response.bitmap, response.count) == (bytes([0b10]), 2)
+
+        too_many = [str(other)] * (MAX_LOOKUP_TARGETS + 1)
+        for viewer_id, target_ids in (("nope", [str(other)]), (str(viewer), too_many)):
+            with pytest.raises(grpc.aio.AioRpcError) as error:
+                check(viewer_id, target_ids)
+            assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+        assert self.servicer_errors(caplog) == []
+
+    def test_get_users_rejects_oversized_batch(self, test_db, caplog):
+        """Test that GetUsers aborts with INVALID_ARGUMENT, not UNKNOWN."""
+        from src.grpc.server import MAX_BATCH_SIZE
+
+        request = pb2.GetUsersReq(user_ids=[str(uuid4())] * (MAX_BATCH_SIZE + 1))
+
+        with pytest.raises(grpc.aio.AioRpcError) as error:
+            self.call(lambda stub: stub.GetUsers(request))
+
+        assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+        assert self.servicer_errors(caplog) == []
+
+
+class TestApplyCounterDeltas:
+    """Tests for the coalesced num_tweets delta RPC."""
+
+    def test_applies_net_deltas(self, grpc_db, grpc_context):
+        """Test that each user's delta lands in the counter buffer."""
+        from src.dependencies.counters import counter_buffer
+
+        alice = str(make_user(grpc_db, "alice").id)
+        bob = str(make_user(grpc_db, "bob").id)
+        unknown = str(uuid4())
+
+        response = UserService().ApplyCounterDeltas(
+            pb2.ApplyCounterDeltasReq(
+                num_tweets={alice: 3, bob: -1, "not-a-uuid": 2, unknown: 1},
+                batch_id="b1",
+            ),
+            grpc_context,
+        )
+
+        assert sorted(response.rejected_ids) == sorted(["not-a-uuid", unknown])
+        assert counter_buffer.pending(alice, "num_tweets") == 3
+        assert counter_buffer.pending(bob, "num_tweets") == -1
+        assert counter_buffer.pending(unknown, "num_tweets") == 0
+
+    def test_retried_batch_is_applied_once(self, grpc_db, grpc_context):
+        """Test that a retry with the same batch id is ignored."""
+        from src.dependencies.counters import counter_buffer
+
+        user_id = str(make_user(grpc_db, "alice").id)
+        request = pb2.ApplyCounterDeltasReq(
+            num_tweets={user_id: 1}, batch_id=str(uuid4())
+        )
+
+        UserService().ApplyCounterDeltas(request, grpc_context)
+        UserService().ApplyCounterDeltas(request, grpc_context)
+
+        assert counter_buffer.pending(user_id, "num_tweets") == 1
+
+    def test_retry_after_failed_apply_is_applied_once(self, grpc_db, grpc_context):
+        """Test that a batch whose load failed is applied by its retry."""
+        from src.dependencies.counters import counter_buffer
+
+        user_id = str(make_user(grpc_db, "alice").id)
+        request = pb2.ApplyCounterDeltasReq(
+            num_tweets={user_id: 1}, batch_id=str(uuid4())
+        )
+
+        with patch(
+            "src.grpc.server.load_profiles", side_effect=RuntimeError("db down")
+        ):
+            with pytest.raises(RuntimeError):
+                UserService().ApplyCounterDeltas(request, grpc_context)
+        assert counter_buffer.pending(user_id, "num_tweets") == 0
+
+        response = UserService().ApplyCounterDeltas(request, grpc_context)
+        UserService().ApplyCounterDeltas(request, grpc_context)
+
+        assert list(response.rejected_ids) == []
+        assert counter_buffer.pending(user_id, "num_tweets") == 1
+
+    def test_async_retry_after_failed_apply_is_applied_once(
+        self, test_db, grpc_context
+    ):
+        """Test the same on the asyncio servicer."""
+        from src.dependencies.counters import counter_buffer
+        from src.grpc.server import AsyncUserService
+
+        from tests.conftest import TestingAsyncSessionLocal
+
+        user_id = str(make_user(test_db, "alice").id)
+        request = pb2.ApplyCounterDeltasReq(
+            num_tweets={user_id: 1}, batch_id=str(uuid4())
+        )
+        service = AsyncUserService(TestingAsyncSessionLocal)
+
+        with patch.object(
+            service, "load_profiles", AsyncMock(side_effect=RuntimeError("db down"))
+        ):
+            with pytest.raises(RuntimeError):
+                asyncio.run(service.ApplyCounterDeltas(request, grpc_context))
+        assert counter_buffer.pending(user_id, "num_tweets") == 0
+
+        asyncio.run(service.ApplyCounterDeltas(request, grpc_context))
+        asyncio.run(service.ApplyCounterDeltas(request, grpc_context))
+
+        assert counter_buffer.pending(user_id, "num_tweets") == 1
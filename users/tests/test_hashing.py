@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from src.dependencies.hashing import HasherBusy, PasswordHasher, get_password_hasher
+
+
+class TestPasswordHasher:
+    """Tests for the off-loop password hashing engine."""
+
+    def test_hash_and_verify_roundtrip(self):
+        """Test that a hashed password verifies and a wrong one does not."""
+        hasher = PasswordHasher(workers=1, max_pending=4, rounds=4)
+        try:
+            hashed = asyncio.run(hasher.hash("password123"))
+
+            assert isinstance(hashed, str)
+            assert hashed.startswith("$2b$04$")
+            assert asyncio.run(hasher.verify("password123", hashed)) is True
+            assert asyncio.run(hasher.verify("wrongpassword", hashed)) is False
+        finally:
+            hasher.shutdown()
+
+    def test_verify_accepts_bytes_hash(self):
+        """Test that hashes stored as bytes are still verified."""
+        hasher = PasswordHasher(workers=1, max_pending=4, rounds=4)
+        try:
+            hashed = asyncio.run(hasher.hash("password123"))
+
+            assert asyncio.run(hasher.verify("password123", hashed.encode())) is True
+        finally:
+            hasher.shutdown()
+
+    def test_saturated_hasher_rejects(self):
+        """Test that a full queue fails fast instead of waiting."""
+        hasher = PasswordHasher(workers=1, max_pending=1, rounds=4)
+        hasher._pending = 1
+
+        with pytest.raises(HasherBusy):
+            asyncio.run(hasher.hash("password123"))
+
+        assert hasher.pending == 1
+
+
+class BusyHasher:
+    async def hash(self, plaintext_password):
+        raise HasherBusy()
+
+    async def verify(self, plaintext_password, hashed_password):
+        raise HasherBusy()
+
+
+class TestHasherBackpressure:
+    """Tests for 503 responses when the hasher is saturated."""
+
+    def test_register_returns_503_when_busy(self, test_client_no_auth):
+        """Test registration is rejected with 503 when hashing is saturated."""
+        test_client_no_auth.app.dependency_overrides[get_password_hasher] = (
+            lambda: BusyHasher()
+        )
+
+        response = test_client_no_auth.post("/users/register", json={
+            "email": "busy@example.com",
+            "password": "password123",
+            "username": "busyuser"
+        })
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
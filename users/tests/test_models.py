@@ -154,3 +154,35 @@ class TestFollowModel:
         assert "id" in result
         assert result["follower_id"] == "550e8400-e29b-41d4-a716-446655440001"
         assert result["following_id"] == "550e8400-e29b-41d4-a716-446655440002"
+
+    def test_ensure_indexes_migrates_existing_follows_table(self):
+        """Test that a table created with the old indexes gets the new ones."""
+        from sqlalchemy import create_engine, inspect, text
+        from src.dependencies.db import Base, ensure_indexes
+
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE follows (id CHAR(32) PRIMARY KEY, "
+                    "follower_id CHAR(32), following_id CHAR(32), "
+                    "created_at DATETIME)"
+                )
+            )
+            for column in ("following_id", "follower_id"):
+                conn.execute(
+                    text(f"CREATE INDEX ix_follows_{column} ON follows ({column})")
+                )
+        Base.metadata.create_all(engine)
+
+        ensure_indexes(engine)
+        ensure_indexes(engine)
+
+        names = {index["name"] for index in inspect(engine).get_indexes("follows")}
+        assert {
+            "ix_follows_following_follower",
+            "ix_follows_following_created",
+            "ix_follows_follower_created",
+            "ix_follows_created_at",
+        } <= names
+        assert not names & {"ix_follows_following_id", "ix_follows_follower_id"}
@@ -0,0 +1,160 @@
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import redis
+import src.grpc.user_service_pb2 as pb2
+from src.dependencies.counters import counter_buffer
+from src.dependencies.profile_cache import ProfileCache, profile_cache
+from src.grpc.server import UserService
+
+from tests.test_grpc import make_user
+
+
+def profile(user_id, username="alice", num_followers=0):
+    return {
+        "id": str(user_id),
+        "email": f"{username}@example.com",
+        "username": username,
+        "num_tweets": 0,
+        "num_followers": num_followers,
+        "created_at": None,
+    }
+
+
+class TestProfileCache:
+    """Tests for the two-level profile cache."""
+
+    def test_miss_loads_then_serves_from_local(self, fake_redis):
+        """Test that a loaded profile fills Redis and the in-process layer."""
+        cache = ProfileCache(fake_redis)
+        user_id = uuid4()
+        loader = MagicMock(return_value={user_id: profile(user_id)})
+
+        assert cache.get(user_id, loader)["username"] == "alice"
+        assert cache.get(user_id, loader)["username"] == "alice"
+
+        loader.assert_called_once_with([user_id])
+        assert cache.key(user_id) in fake_redis.values
+        assert cache.stats()["local"]["hits"] == 1
+
+    def test_redis_hit_skips_loader(self, fake_redis):
+        """Test that another replica's fill is used before the database."""
+        user_id = uuid4()
+        ProfileCache(fake_redis).get(user_id, lambda ids: {user_id: profile(user_id)})
+
+        cache = ProfileCache(fake_redis)
+        loader = MagicMock(return_value={})
+
+        assert cache.get(user_id, loader)["username"] == "alice"
+        loader.assert_not_called()
+        assert cache.stats()["redis"]["hits"] == 1
+
+    def test_get_many_loads_misses_once(self, fake_redis):
+        """Test that all missing ids go to a single loader call."""
+        cache = ProfileCache(fake_redis)
+        cached, unknown, missing = uuid4(), uuid4(), uuid4()
+        cache.get(cached, lambda ids: {cached: profile(cached)})
+        loader = MagicMock(return_value={missing: profile(missing, "bob")})
+
+        result = cache.get_many([cached, unknown, missing], loader)
+
+        loader.assert_called_once_with([unknown, missing])
+        assert result[cached]["username"] == "alice"
+        assert result[unknown] is None
+        assert result[missing]["username"] == "bob"
+
+    def test_invalidate_drops_both_levels(self, fake_redis):
+        """Test that invalidate forces the next read back to the loader."""
+        cache = ProfileCache(fake_redis)
+        user_id = uuid4()
+        cache.get(user_id, lambda ids: {user_id: profile(user_id)})
+
+        cache.invalidate(user_id)
+        loader = MagicMock(return_value={user_id: profile(user_id, "renamed")})
+
+        assert cache.get(user_id, loader)["username"] == "renamed"
+        loader.assert_called_once()
+
+    def test_invalidate_during_load_skips_fill(self, fake_redis):
+        """Test that a profile flushed mid-load is not cached with old counts."""
+        cache = ProfileCache(fake_redis)
+        user_id = uuid4()
+
+        def loader(ids):
+            # A counter flush commits and invalidates after the read.
+            cache.invalidate(user_id)
+            return {user_id: profile(user_id, num_followers=0)}
+
+        assert cache.get(user_id, loader)["num_followers"] == 0
+        assert cache.key(user_id) not in fake_redis.values
+        assert cache.local.get(user_id) is None
+
+        fresh = MagicMock(return_value={user_id: profile(user_id, num_followers=2)})
+        assert cache.get(user_id, fresh)["num_followers"] == 2
+        assert cache.get(user_id, fresh)["num_followers"] == 2
+        fresh.assert_called_once()
+
+    def test_redis_errors_fall_back_to_loader(self):
+        """Test that reads still work when Redis is unavailable."""
+        broken = MagicMock()
+        broken.mget.side_effect = redis.ConnectionError()
+        broken.pipeline.side_effect = redis.ConnectionError()
+        cache = ProfileCache(broken)
+        user_id = uuid4()
+
+        assert cache.get(user_id, lambda ids: {user_id: profile(user_id)})
+        assert cache.stats()["redis"]["errors"] == 2
+
+
+class TestProfileCacheServing:
+    """Tests for GetUser, GetUsers and GET /users/{id} behind the cache."""
+
+    def test_get_user_cached_after_first_read(self, grpc_db, grpc_context):
+        """Test that repeat GetUser calls do not query the database."""
+        alice = make_user(grpc_db, "alice")
+        request = pb2.GetUserReq(user_id=str(alice.id))
+
+        assert UserService().GetUser(request, grpc_context).valid
+        grpc_db.delete(alice)
+        grpc_db.commit()
+        response = UserService().GetUser(request, grpc_context)
+
+        assert response.valid
+        assert response.user.username == "alice"
+
+    def test_get_user_unknown_id(self, grpc_db, grpc_context):
+        """Test that unknown and malformed ids are reported invalid."""
+        for user_id in (str(uuid4()), "not-a-uuid"):
+            response = UserService().GetUser(
+                pb2.GetUserReq(user_id=user_id), grpc_context
+            )
+            assert not response.valid
+
+    def test_counter_flush_invalidates_profile(self, grpc_db, grpc_context):
+        """Test that flushed counter deltas are not hidden by a stale profile."""
+        alice = make_user(grpc_db, "alice")
+        request = pb2.GetUserReq(user_id=str(alice.id))
+        UserService().GetUser(request, grpc_context)
+
+        counter_buffer.add(alice.id, "num_followers", 2)
+        assert UserService().GetUser(request, grpc_context).user.numFollowers == 2
+
+        counter_buffer.flush()
+        assert profile_cache.key(alice.id) not in profile_cache.redis.values
+        assert UserService().GetUser(request, grpc_context).user.numFollowers == 2
+
+    def test_profile_route(self, test_client, test_db):
+        """Test that GET /users/{id} returns the public profile."""
+        alice = make_user(test_db, "alice")
+
+        response = test_client.get(f"/users/{alice.id}")
+
+        assert response.status_code == 200
+        user = response.json()["user"]
+        assert user["username"] == "alice"
+        assert "email" not in user
+
+    def test_profile_route_not_found(self, test_client, test_db):
+        """Test that unknown and malformed ids return 404."""
+        assert test_client.get(f"/users/{uuid4()}").status_code == 404
+        assert test_client.get("/users/not-a-uuid").status_code == 404
@@ -244,3 +244,102 @@ class TestFollowByIdEndpoint:
 
         assert response.status_code == 404
         assert "could not find follow" in response.json()["detail"]
+
+
+class TestFollowPagination:
+    """Tests for keyset pagination of follower/following listings."""
+
+    def add_followers(self, db, following_id, count):
+        from datetime import datetime, timedelta
+        from uuid import UUID, uuid4
+
+        from src.models import Follow
+
+        base = datetime(2024, 1, 1)
+        follows = []
+        for i in range(count):
+            follow = Follow(uuid4(), UUID(following_id))
+            follow.created_at = base + timedelta(minutes=i)
+            follows.append(follow)
+        db.add_all(follows)
+        db.commit()
+        return [str(f.id) for f in reversed(follows)]
+
+    def test_pages_newest_first_without_gaps(
+        self, test_client, test_db, mock_user_token
+    ):
+        """Test that following next_cursor visits every follow exactly once."""
+        expected = self.add_followers(test_db, mock_user_token.id, 5)
+
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            body = test_client.get("/follow", params=params).json()
+            seen += [f["id"] for f in body["result"]]
+            pages += 1
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == expected
+        assert pages == 3
+
+    def test_last_page_has_no_cursor(self, test_client, test_db, mock_user_token):
+        """Test that a page holding the remaining rows ends the listing."""
+        self.add_followers(test_db, mock_user_token.id, 2)
+
+        body = test_client.get("/follow", params={"limit": 2}).json()
+
+        assert len(body["result"]) == 2
+        assert body["next_cursor"] is None
+
+    def test_rejects_bad_cursor(self, test_client):
+        """Test that a malformed cursor is a 400."""
+        response = test_client.get("/following", params={"cursor": "garbage"})
+
+        assert response.status_code == 400
+
+    def test_limit_is_capped(self, test_client):
+        """Test that page sizes above the cap are rejected."""
+        from src.pagination import MAX_PAGE_SIZE
+
+        response = test_client.get("/follow", params={"limit": MAX_PAGE_SIZE + 1})
+
+        assert response.status_code == 422
+
+
+class TestFollowLookup:
+    """Tests for POST /follow/lookup."""
+
+    def test_returns_flags_in_order(self, test_client, test_db, mock_user_token):
+        """Test that follow state is reported per target, in request order."""
+        from uuid import UUID, uuid4
+
+        from src.models import Follow
+
+        followed, other = uuid4(), uuid4()
+        test_db.add(Follow(UUID(mock_user_token.id), followed))
+        test_db.commit()
+
+        response = test_client.post("/follow/lookup", json={
+            "target_ids": [str(other), str(followed), "bad-id"]
+        })
+
+        assert response.status_code == 200
+        assert response.json()["result"] == [False, True, False]
+
+    def test_rejects_too_many_targets(self, test_client):
+        """Test that the target list is capped."""
+        from uuid import uuid4
+
+        from src.follow_lookup import MAX_LOOKUP_TARGETS
+
+        response = test_client.post("/follow/lookup", json={
+            "target_ids": [str(uuid4()) for _ in range(MAX_LOOKUP_TARGETS + 1)]
+        })
+
+        assert response.status_code == 400